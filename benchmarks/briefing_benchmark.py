@@ -0,0 +1,45 @@
+"""
+Session-start pre-analysis (src/ticket_briefing.py): wall time of briefing every ticket with concurrent
+comment fetches vs one ticket at a time, and the due_date_check LLM round trips it lets the session skip.
+Jira is the offline fake from benchmarks/fakes.py with a fixed latency per request.
+    python3 benchmarks/briefing_benchmark.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+from fakes import install_fakes
+
+os.environ.setdefault("SCRUM_HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.sqlite3"))
+
+from jira_service import JiraService
+from ticket_briefing import RECENT_COMMENTS, brief_ticket, brief_tickets, due_date_needs_discussion
+
+JIRA_LATENCY_S = 0.15
+
+
+def run(n: int):
+    tickets = install_fakes(n_tickets=n, jira_latency_s=JIRA_LATENCY_S)
+    service = JiraService.get_instance()
+
+    start = time.perf_counter()
+    for ticket in tickets:
+        brief_ticket(ticket, service.fetch_ticket_comments(ticket["id"], RECENT_COMMENTS))
+    sequential_s = time.perf_counter() - start
+
+    service.account = None
+    start = time.perf_counter()
+    briefings = brief_tickets(tickets)
+    concurrent_s = time.perf_counter() - start
+
+    flagged = sum(bool(b["flags"]) for b in briefings.values())
+    skipped = sum(not due_date_needs_discussion(t) for t in tickets)
+    print(f"{n:>8}{sequential_s:>14.2f}{concurrent_s:>14.2f}{flagged:>10}{skipped:>22}")
+
+
+if __name__ == "__main__":
+    print(f"Jira latency {JIRA_LATENCY_S * 1000:.0f} ms per request")
+    print(f"{'tickets':>8}{'one by one s':>14}{'concurrent s':>14}{'flagged':>10}{'due_date_check skips':>22}")
+    for n in (5, 20, 50):
+        run(n)
@@ -0,0 +1,45 @@
+"""
+Compare LLM latency and cost per stage between two recorded sessions.
+
+Record a baseline with every stage on the default model, then a routed session:
+    SCRUM_LLM_ROUTING=off JIRA_TRACE_FILE=before.jsonl python3 src/main_v2.py
+    JIRA_TRACE_FILE=after.jsonl python3 src/main_v2.py
+    python3 benchmarks/compare_llm_traces.py before.jsonl after.jsonl
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from llm_config import stage_report
+
+
+def load_spans(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(before_path: str, after_path: str):
+    before = stage_report(load_spans(before_path))
+    after = stage_report(load_spans(after_path))
+    print(f"{'stage':<24}{'avg ms before':>15}{'avg ms after':>14}{'$ before':>11}{'$ after':>11}{'escal.':>8}")
+    totals = [0.0, 0.0]
+    for stage in sorted(set(before) | set(after)):
+        b = before.get(stage)
+        a = after.get(stage)
+        b_ms = b["latency_ms"] / b["calls"] if b else float("nan")
+        a_ms = a["latency_ms"] / a["calls"] if a else float("nan")
+        b_cost = b["cost_usd"] if b else 0.0
+        a_cost = a["cost_usd"] if a else 0.0
+        totals[0] += b_cost
+        totals[1] += a_cost
+        print(f"{stage:<24}{b_ms:>15.0f}{a_ms:>14.0f}{b_cost:>11.4f}{a_cost:>11.4f}{(a or {}).get('escalations', 0):>8}")
+    print(f"{'total':<24}{'':>15}{'':>14}{totals[0]:>11.4f}{totals[1]:>11.4f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,223 @@
+"""
+Offline stand-ins for Jira and the LLMs, so whole standup sessions can run without network access.
+
+    from fakes import install_fakes, session_answers
+    install_fakes(llm_latency_s=0.05)   # must run before main_v2 is imported
+    import main_v2
+
+Latencies are a fixed number of seconds or a sampler such as lognormal_latency(median_s, p99_s).
+Outcome records, transcripts and standup history go to a temporary directory, never to the real stores.
+Time spent waiting on the fakes is attributed to "jira" and "llm" inside measure_components().
+"""
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from langchain_core.messages import AIMessage
+from synthetic_data import make_tickets
+
+STAGES = ["basic_info", "previous_progress_made", "plan_for_the_day", "blocker_check", "due_date_check", "confirm_summary", "additional_help"]
+NEXT_STAGE = dict(zip(STAGES, STAGES[1:] + ["ticket_processing_end_node"]))
+END_WORD = "bye"
+TICKET_ID = re.compile(r"[A-Z][A-Z0-9]*-\d+")
+
+Latency = Union[float, Callable[[], float]]
+
+# (thread, component -> seconds) of the innermost measure_components() block
+_components: ContextVar[Optional[Tuple[int, Dict[str, float]]]] = ContextVar("fake_components", default=None)
+
+
+def lognormal_latency(median_s: float, p99_s: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Latency sampler with a long right tail, like real API latencies.
+    """
+    rng = random.Random(seed)
+    sigma = math.log(p99_s / median_s) / 2.326  # z-score of the 99th percentile
+    return lambda: rng.lognormvariate(math.log(median_s), sigma)
+
+
+@contextmanager
+def measure_components():
+    """
+    Collect the seconds this thread spends waiting on each fake. Work the graph moves to background
+    threads (e.g. rolling summary updates) is not on the turn's critical path and is not counted.
+    """
+    components: Dict[str, float] = {}
+    token = _components.set((threading.get_ident(), components))
+    try:
+        yield components
+    finally:
+        _components.reset(token)
+
+
+def record_component(name: str, seconds: float):
+    current = _components.get()
+    if current is not None and current[0] == threading.get_ident():
+        current[1][name] = current[1].get(name, 0.0) + seconds
+
+
+def simulate_latency(latency: Latency, component: str, rate_limit: Optional[Tuple[str, float]] = None, name: str = "fake"):
+    """
+    Sleep for one latency sample. rate_limit is a (backend, cost) to take from the Scheduler first,
+    as the real Jira and LLM clients do; time spent waiting for it counts toward the component.
+    The wait is also a profiler frame, named like the real client's.
+    """
+    from profiler import profiled
+    start = time.perf_counter()
+    with profiled(component, name):
+        if rate_limit:
+            from scheduler import Scheduler
+            Scheduler.get_instance().acquire(*rate_limit)
+        delay = latency() if callable(latency) else latency
+        if delay:
+            time.sleep(delay)
+    if rate_limit or delay:
+        record_component(component, time.perf_counter() - start)
+
+
+class FakeJira:
+    """
+    Serves synthetic tickets; writes are accepted and dropped.
+    """
+
+    def __init__(self, tickets, latency_s: Latency = 0.0, rate_limited: bool = False):
+        self.tickets = {t["id"]: t for t in tickets}
+        self.latency_s = latency_s
+        self.rate_limited = rate_limited
+        self.account = None
+
+    def validate_credentials(self):
+        self._wait("validate_credentials")
+        self.account = {"accountId": "benchmark-user", "displayName": "Benchmark User"}
+        return self.account
+
+    def _wait(self, operation: str):
+        simulate_latency(self.latency_s, "jira", ("jira", 1.0) if self.rate_limited else None, operation)
+
+    def fetch_user_tickets(self, email, project_key):
+        self._wait("fetch_user_tickets")
+        return [dict(t) for t in self.tickets.values()]
+
+    def fetch_ticket_by_id(self, issue_key):
+        self._wait("fetch_ticket_by_id")
+        if issue_key not in self.tickets:
+            raise requests.HTTPError(f"404 Client Error: Issue Does Not Exist: {issue_key}")
+        return dict(self.tickets[issue_key])
+
+    def fetch_ticket_comments(self, issue_key, limit=None, since=None):
+        self._wait("fetch_ticket_comments")
+        return []
+
+    def degraded_note(self):
+        return ""
+
+
+class ScriptedLLM:
+    """
+    Plays a stage like a well-behaved model: asks one question, then proceeds on the user's answer.
+    main_bot picks the ticket id the user types and ends on END_WORD.
+    """
+
+    def __init__(self, stage: str, latency_s: Latency = 0.0, rate_limited: bool = False):
+        self.stage = stage
+        self.latency_s = latency_s
+        self.rate_limited = rate_limited
+
+    def invoke(self, messages):
+        rate_limit = None
+        if self.rate_limited:
+            from token_counter import count_tokens
+            rate_limit = ("openai", sum(count_tokens(str(m.content)) for m in messages) + 500)
+        simulate_latency(self.latency_s, "llm", rate_limit, self.stage)
+        last = messages[-1]
+        if self.stage == "main_bot":
+            if last.type == "human" and last.content == END_WORD:
+                return AIMessage(content=json.dumps({"command": "end_conversation"}))
+            if last.type == "human" and TICKET_ID.fullmatch(last.content):
+                return AIMessage(content=json.dumps({"command": "ticket_chosen", "args": {"ticket_id": last.content}}))
+            if last.type == "human":
+                # Answers left over when a stage was skipped (e.g. due_date_check with a distant due date)
+                return AIMessage(content="Which ticket would you like to discuss next?")
+            return AIMessage(content="Good morning! Which ticket would you like to start with?")
+        if self.stage == "standup_brief":
+            return AIMessage(content=json.dumps({"digest": "", "questions": ["What is left before this can be closed?"]}))
+        if self.stage == "summarize_conversation":
+            return AIMessage(content="Progress was made; no blockers; due date unchanged.")
+        if last.type == "system":
+            return AIMessage(content=f"Let's talk about {self.stage.replace('_', ' ')}. Anything to add?")
+        return AIMessage(content=json.dumps({"command": "proceed_to_next_stage", "args": {"next_stage_id": NEXT_STAGE[self.stage]}}))
+
+
+def isolate_stores() -> str:
+    """
+    Point SCRUM_OUTCOME_DIR, SCRUM_TRANSCRIPT_DIR and SCRUM_HISTORY_DB at a new temporary directory. Returns it.
+    """
+    directory = tempfile.mkdtemp(prefix="scrum_fakes_")
+    os.environ["SCRUM_OUTCOME_DIR"] = os.path.join(directory, "outcomes")
+    os.environ["SCRUM_TRANSCRIPT_DIR"] = os.path.join(directory, "transcripts")
+    os.environ["SCRUM_HISTORY_DB"] = os.path.join(directory, "history.sqlite3")
+    return directory
+
+
+def install_fakes(n_tickets: int = 10, llm_latency_s: Latency = 0.0, jira_latency_s: Latency = 0.0,
+                  rate_limited: bool = False):
+    """
+    Route JiraService and stage_llm to the fakes. Returns the tickets being served.
+    With rate_limited, the fakes also wait for the Scheduler's jira and openai limits.
+    Simulated sessions write to the stores from isolate_stores().
+    """
+    isolate_stores()
+    import jira_service
+    import llm_config
+
+    tickets = make_tickets(n_tickets)
+    jira = FakeJira(tickets, jira_latency_s, rate_limited)
+    jira_service.JiraService.get_instance = staticmethod(lambda: jira)
+    llm_config.stage_llm = lambda stage: ScriptedLLM(stage, llm_latency_s, rate_limited)
+    return tickets
+
+
+def session_answers(ticket_ids: List[str]) -> List[str]:
+    """
+    What a user types to walk through the given tickets and end the standup.
+    """
+    answers = []
+    for ticket_id in ticket_ids:
+        answers.append(ticket_id)
+        answers.extend(["Worked on it yesterday, nothing blocking."] * len(STAGES))
+    return answers + [END_WORD]
+
+
+STAGE_ANSWERS = [
+    "Worked on it yesterday, nothing blocking.",
+    "Finished the API part, tests are still failing on CI.",
+    "No blockers, should be done by Friday.",
+    "I paired with the backend team on the schema change.",
+    "Nothing else for now.",
+]
+
+
+def random_session_answers(ticket_ids: List[str], rng: random.Random) -> List[str]:
+    """
+    Like session_answers, with varied wording and the occasional request to see the ticket list again.
+    """
+    answers = []
+    for ticket_id in ticket_ids:
+        if rng.random() < 0.2:
+            answers.append("Can you show me my tickets again?")
+        answers.append(ticket_id)
+        answers.extend(rng.choice(STAGE_ANSWERS) for _ in STAGES)
+    return answers + [END_WORD]
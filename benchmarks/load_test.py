@@ -0,0 +1,262 @@
+"""
+Load test: hundreds of concurrent simulated standups against main_graph_app.
+
+Each simulated user walks through one to three tickets with scripted (or --random-answers) replies and a think
+time between messages; every turn is submitted to a shared worker pool running resume_session, as a server would.
+Jira and the LLMs are the offline fakes from benchmarks/fakes.py with lognormal latencies, rate limited by the
+same Scheduler limits as the real clients (JIRA_REQUESTS_PER_SECOND, OPENAI_TOKENS_PER_MINUTE).
+--scale shrinks latencies and think times and raises the rate limits by the same factor, for quicker runs.
+
+Concurrency is ramped level by level. For each level the report shows throughput, p50/p99 turn latency, errors,
+checkpoint bytes and RSS growth per session, CPU use, and where the time of an average turn goes:
+  queue    waiting for a worker
+  llm      fake LLM latency plus rate-limit waits
+  summary  waiting for the background rolling-summary updates (LLM calls on their own small pool)
+  jira     fake Jira latency plus rate-limit waits, including main_bot's concurrent comment fetches
+  serde    checkpoint (de)serialization
+  graph    everything else: LangGraph, node code and waiting for the GIL
+The component whose share grows the most by the first level that degrades is reported as saturating first.
+The sessions' outcome records, transcripts and standup history go to a temporary directory (see install_fakes).
+    python3 benchmarks/load_test.py [--levels 25,50,100,200] [--workers 64] [--random-answers] [--scale 0.25]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fakes import install_fakes, lognormal_latency, measure_components, random_session_answers, record_component, session_answers
+
+COMPONENTS = ["queue", "llm", "summary", "jira", "serde", "graph"]
+
+
+class SerdeTimer:
+    """
+    Times the checkpointer's serializer. Per-turn time is recorded through measure_components;
+    the total includes checkpoints written from LangGraph's background threads.
+    """
+
+    def __init__(self, serde):
+        self.total_s = 0.0
+        self._lock = threading.Lock()
+        for name in ("dumps_typed", "loads_typed"):
+            setattr(serde, name, self._timed(getattr(serde, name)))
+
+    def _timed(self, fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                record_component("serde", elapsed)
+                with self._lock:
+                    self.total_s += elapsed
+        return wrapper
+
+
+def time_component(module, name: str, component: str):
+    """
+    Attribute calls of module.name to a component. For fan-outs whose fakes run on other threads.
+    """
+    fn = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record_component(component, time.perf_counter() - start)
+    setattr(module, name, wrapper)
+
+
+def scale_rate_limits(scale: float):
+    from config import load_config
+    load_config()
+    for name, default in (("JIRA_REQUESTS_PER_SECOND", "10"), ("OPENAI_TOKENS_PER_MINUTE", "200000")):
+        os.environ[name] = str(float(os.getenv(name, default)) / scale)
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Peak, in KB on Linux
+
+
+def checkpoint_bytes(saver, thread_id: str) -> int:
+    """
+    Bytes the in-memory checkpointer holds for one session: checkpoints, channel blobs and pending writes.
+    """
+    total = 0
+    for checkpoints in saver.storage.get(thread_id, {}).values():
+        for checkpoint, metadata, _ in checkpoints.values():
+            total += len(checkpoint[1]) + len(metadata[1])
+    total += sum(len(blob[1]) for key, blob in saver.blobs.items() if key[0] == thread_id)
+    for key, writes in saver.writes.items():
+        if key[0] == thread_id:
+            total += sum(len(write[2][1]) for write in writes.values())
+    return total
+
+
+def percentile(sorted_values, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def run_level(app, tickets, users: int, pool: ThreadPoolExecutor, args, serde_timer: SerdeTimer):
+    from session_runner import start_session, resume_session
+    turns = []  # (latency_s, components)
+    errors = []
+    session_ids = []
+    lock = threading.Lock()
+
+    def run_turn(submitted: float, fn, *fn_args):
+        queued = time.perf_counter() - submitted
+        with measure_components() as components:
+            result = fn(*fn_args)
+        components["queue"] = queued
+        return result, components
+
+    def submit(fn, *fn_args):
+        submitted = time.perf_counter()
+        try:
+            prompt, components = pool.submit(run_turn, submitted, fn, *fn_args).result()
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+            raise
+        with lock:
+            turns.append((time.perf_counter() - submitted, components))
+        return prompt
+
+    def user(index: int):
+        rng = random.Random(index)
+        time.sleep(rng.uniform(0, args.think_max * args.scale))  # Users do not all join in the same instant
+        session_id = str(uuid.uuid4())
+        with lock:
+            session_ids.append(session_id)
+        ticket_ids = [t["id"] for t in rng.sample(tickets, rng.randint(1, args.max_tickets))]
+        answers = iter(random_session_answers(ticket_ids, rng) if args.random_answers else session_answers(ticket_ids))
+        try:
+            prompt = submit(start_session, app, session_id, initial_state())
+            while prompt is not None:
+                time.sleep(rng.uniform(args.think_min, args.think_max) * args.scale)
+                prompt = submit(resume_session, app, session_id, next(answers))
+        except StopIteration:
+            with lock:
+                errors.append("Session did not end after its scripted answers")
+        except Exception:
+            pass  # Counted in submit
+
+    from main_v2 import initial_state
+    rss_before, cpu_before, serde_before = rss_mb(), time.process_time(), serde_timer.total_s
+    start = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_s = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in turns)
+    per_turn_ms = {}
+    for component in COMPONENTS[:-1]:
+        per_turn_ms[component] = 1000 * sum(c.get(component, 0.0) for _, c in turns) / max(1, len(turns))
+    per_turn_ms["graph"] = max(0.0, 1000 * statistics.fmean(latencies) - sum(per_turn_ms.values())) if latencies else 0.0
+    checkpoint_kb = statistics.fmean(checkpoint_bytes(app.checkpointer, s) for s in session_ids) / 1024
+    return {
+        "users": users,
+        "turns": len(turns),
+        "throughput": len(turns) / wall_s,
+        "p50_ms": 1000 * percentile(latencies, 50) if latencies else 0.0,
+        "p99_ms": 1000 * percentile(latencies, 99) if latencies else 0.0,
+        "error_rate": len(errors) / max(1, len(turns) + len(errors)),
+        "errors": errors,
+        "checkpoint_kb": checkpoint_kb,
+        "rss_mb_per_session": max(0.0, rss_mb() - rss_before) / users,
+        "cpu": (time.process_time() - cpu_before) / wall_s,
+        "serde_cpu": (serde_timer.total_s - serde_before) / wall_s,
+        "per_turn_ms": per_turn_ms,
+    }
+
+
+def saturation(results) -> str:
+    """
+    First level whose p99 is more than twice the lowest level's, or that has errors,
+    and the component whose per-turn time grew the most by then.
+    """
+    baseline = results[0]
+    for level in results[1:]:
+        if level["p99_ms"] > 2 * baseline["p99_ms"] or level["error_rate"] > 0.01:
+            growth = {c: level["per_turn_ms"][c] - baseline["per_turn_ms"][c] for c in COMPONENTS}
+            component = max(growth, key=growth.get)
+            return (f"degrades at {level['users']} users (p99 {level['p99_ms']:.0f} ms vs {baseline['p99_ms']:.0f} ms, "
+                    f"errors {level['error_rate']:.1%}); saturating first: {component} (+{growth[component]:.0f} ms per turn)")
+    return f"no level degraded up to {results[-1]['users']} users"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--levels", default="25,50,100,200", help="comma-separated concurrent users per level")
+    parser.add_argument("--workers", type=int, default=64, help="worker pool size running the turns")
+    parser.add_argument("--tickets", type=int, default=20, help="tickets assigned to each simulated user")
+    parser.add_argument("--max-tickets", type=int, default=3, help="tickets discussed per session, 1 to this")
+    parser.add_argument("--random-answers", action="store_true", help="vary the answers instead of the fixed script")
+    parser.add_argument("--llm-median", type=float, default=0.8)
+    parser.add_argument("--llm-p99", type=float, default=4.0)
+    parser.add_argument("--jira-median", type=float, default=0.15)
+    parser.add_argument("--jira-p99", type=float, default=0.8)
+    parser.add_argument("--think-min", type=float, default=1.0)
+    parser.add_argument("--think-max", type=float, default=4.0)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply all latencies and think times, e.g. 0.25 for a quick run")
+    args = parser.parse_args()
+
+    scale_rate_limits(args.scale)
+    tickets = install_fakes(
+        n_tickets=args.tickets,
+        llm_latency_s=lognormal_latency(args.llm_median * args.scale, args.llm_p99 * args.scale, seed=1),
+        jira_latency_s=lognormal_latency(args.jira_median * args.scale, args.jira_p99 * args.scale, seed=2),
+        rate_limited=True,
+    )
+    import builtins
+    builtins.print = lambda *a, **k: None  # Keep the bot's chat output out of the report
+    import main_v2
+    app = main_v2.main_graph_app
+    serde_timer = SerdeTimer(app.checkpointer.serde)
+    import main_bot_v2
+    time_component(main_bot_v2, "brief_tickets", "jira")
+    import rolling_summary
+    time_component(rolling_summary, "current_summary", "summary")
+
+    out = sys.stdout.write
+    out(f"Rate limits: Jira {os.environ['JIRA_REQUESTS_PER_SECOND']} req/s, OpenAI {os.environ['OPENAI_TOKENS_PER_MINUTE']} tokens/min\n")
+    out(f"Outcome records, transcripts and standup history: {os.path.dirname(os.environ['SCRUM_HISTORY_DB'])}\n")
+    out(f"LLM latency median {args.llm_median * args.scale:.2f} s / p99 {args.llm_p99 * args.scale:.2f} s, "
+        f"Jira median {args.jira_median * args.scale:.2f} s / p99 {args.jira_p99 * args.scale:.2f} s, "
+        f"think time {args.think_min * args.scale:.1f}-{args.think_max * args.scale:.1f} s, {args.workers} workers\n")
+    out(f"{'users':>6}{'turns/s':>9}{'p50 ms':>8}{'p99 ms':>8}{'errors':>8}{'ckpt KB':>9}{'RSS MB':>8}{'cpu':>6}"
+        + "".join(f"{c:>8}" for c in COMPONENTS) + "   (ms per turn)\n")
+    results = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for users in [int(level) for level in args.levels.split(",")]:
+            level = run_level(app, tickets, users, pool, args, serde_timer)
+            results.append(level)
+            out(f"{users:>6}{level['throughput']:>9.1f}{level['p50_ms']:>8.0f}{level['p99_ms']:>8.0f}{level['error_rate']:>8.1%}"
+                f"{level['checkpoint_kb']:>9.0f}{level['rss_mb_per_session']:>8.2f}{level['cpu']:>6.2f}"
+                + "".join(f"{level['per_turn_ms'][c]:>8.0f}" for c in COMPONENTS) + "\n")
+            for error in sorted(set(level["errors"]))[:3]:
+                out(f"        {error}\n")
+    out(f"serialization CPU at the highest level: {results[-1]['serde_cpu']:.2f} cores\n")
+    out(saturation(results) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-turn graph overhead as the conversation grows: full-state returns merged with add_messages (before)
+vs append-only deltas merged with append_messages / merge_stages (after).
+
+Each turn runs one LangGraph step with no LLM call, so the time is pure state-update overhead.
+    python3 benchmarks/message_accumulation_benchmark.py
+"""
+import os
+import sys
+import time
+from typing import Annotated, Sequence, TypedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
+from models import append_messages, merge_stages
+
+TURNS = 20
+
+
+class BeforeState(TypedDict):
+    turns: int
+    main_bot_messages: Annotated[Sequence, add_messages]
+    ticket_processing_stages: dict
+
+
+class AfterState(TypedDict):
+    turns: int
+    main_bot_messages: Annotated[Sequence, append_messages]
+    ticket_processing_stages: Annotated[dict, merge_stages]
+
+
+def before_turn(state):
+    # Previous pattern: mutate in place, then return the whole state
+    state["ticket_processing_stages"]["basic_info"]["messages"].append(HumanMessage(content="user reply"))
+    state["ticket_processing_stages"]["basic_info"]["messages"].append(AIMessage(content="bot reply"))
+    state["turns"] -= 1
+    return state
+
+
+def after_turn(state):
+    return {
+        "turns": state["turns"] - 1,
+        "ticket_processing_stages": {"basic_info": {"messages": [HumanMessage(content="user reply"), AIMessage(content="bot reply")]}},
+    }
+
+
+def build(state_type, node):
+    graph = StateGraph(state_type)
+    graph.add_node("turn", node)
+    graph.set_entry_point("turn")
+    graph.add_conditional_edges("turn", lambda state: "turn" if state["turns"] > 0 else END)
+    return graph.compile()
+
+
+def history(n: int):
+    return [HumanMessage(content=f"message {i}", id=str(i)) if i % 2 else AIMessage(content=f"message {i}", id=str(i)) for i in range(n)]
+
+
+def run_ms(app, n: int, turns: int) -> float:
+    state = {
+        "turns": turns,
+        "main_bot_messages": history(n),
+        "ticket_processing_stages": {"basic_info": {"phase": "in_progress", "messages": history(n)}},
+    }
+    start = time.perf_counter()
+    app.invoke(state, {"recursion_limit": turns + 10})
+    return (time.perf_counter() - start) * 1000
+
+
+def per_turn_ms(app, n: int) -> float:
+    # Subtract a one-turn run so loading the initial history is not counted
+    return (run_ms(app, n, TURNS + 1) - run_ms(app, n, 1)) / TURNS
+
+
+if __name__ == "__main__":
+    before_app = build(BeforeState, before_turn)
+    after_app = build(AfterState, after_turn)
+    print(f"{'messages':>9}{'before ms/turn':>16}{'after ms/turn':>15}{'speedup':>9}")
+    for n in (50, 500, 5000):
+        before = min(per_turn_ms(before_app, n) for _ in range(3))
+        after = min(per_turn_ms(after_app, n) for _ in range(3))
+        print(f"{n:>9}{before:>16.3f}{after:>15.3f}{before / max(after, 1e-6):>8.1f}x")
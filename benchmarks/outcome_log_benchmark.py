@@ -0,0 +1,78 @@
+"""
+Query latency of the standup outcome log (src/outcome_log.py) over months of synthetic outcomes.
+
+Writes six months of records for 40 teams into a temporary directory and times the CLI reports.
+    python3 benchmarks/outcome_log_benchmark.py [records]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pyarrow as pa
+import outcome_log
+from outcome_log import OUTCOME_STAGES, OutcomeLog, report
+
+TEAMS = [f"TEAM{i}" for i in range(40)]
+DAYS = 182
+
+
+def synthetic_outcomes(n: int, seed: int = 7) -> pa.Table:
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=DAYS)
+    rows = []
+    for _ in range(n):
+        day = first_day + timedelta(days=rng.randrange(DAYS))
+        team = rng.choice(TEAMS)
+        due_changed = rng.random() < 0.1
+        rows.append({
+            "outcome_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "session_id": None,
+            "team": team,
+            "user": f"user{rng.randrange(400)}@example.com",
+            "ticket_id": f"{team}-{rng.randrange(2000)}",
+            "date": day.isoformat(),
+            "recorded_at": datetime(day.year, day.month, day.day, 9, 30, tzinfo=timezone.utc),
+            "status": rng.choice(["To Do", "In Progress", "In Review", "Blocked"]),
+            "status_transition_ids": ["31"] if rng.random() < 0.2 else [],
+            "has_blocker": rng.random() < 0.15,
+            "previous_progress": "Finished the migration script and opened a PR.",
+            "plan_for_the_day": "Address review comments and deploy to staging.",
+            "blocker_answer": "No blockers.",
+            "start_date_before": None,
+            "start_date_after": None,
+            "due_date_before": "2026-01-31",
+            "due_date_after": "2026-02-07" if due_changed else "2026-01-31",
+            "due_date_changed": due_changed,
+            "duration_s": rng.uniform(60, 600),
+            "stage_durations_s": {stage: rng.uniform(5, 90) for stage in OUTCOME_STAGES},
+            "user_turns": rng.randint(5, 15),
+            "summary": "Progress made; deploying to staging today.",
+            "completed": True,
+        })
+    return pa.Table.from_pylist(rows, schema=outcome_log._schema())
+
+
+def timed(label: str, fn):
+    fn()  # Warm the OS file cache, as a repeated CLI call would
+    start = time.perf_counter()
+    result = fn()
+    print(f"   {label:<48}{(time.perf_counter() - start) * 1000:>8.0f} ms  ({result.num_rows} groups)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as directory:
+        OutcomeLog._instance = OutcomeLog(directory)
+        start = time.perf_counter()
+        OutcomeLog.get_instance().write_table(synthetic_outcomes(n))
+        print(f"{n} outcomes over {DAYS} days written in {time.perf_counter() - start:.1f} s")
+        since = (date.today() - timedelta(days=30)).isoformat()
+        timed("blockers per team and month (all data)", lambda: report(["team", "month"]))
+        timed("one team, last 30 days, per day", lambda: report(["date"], since=since, team="TEAM7"))
+        timed("per user, last 30 days", lambda: report(["user"], since=since))
@@ -0,0 +1,42 @@
+"""
+Prompt tokens main_bot sends when the standup returns to ticket selection after a ticket is done.
+
+Before: a new system prompt with the full ticket index. After: the first system prompt is reused unchanged
+(so the provider can serve it from its prompt cache) and only a delta message with the changed tickets is new.
+The old prompt differs from the first one from its opening line on, so none of it can be served from the cache.
+    python3 benchmarks/restart_prompt_benchmark.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from synthetic_data import make_tickets
+from main_bot_v2 import main_bot_prompt, restart_delta_prompt
+from ticket_renderer import sort_tickets, ticket_delta, ticket_index, ticket_snapshot
+from token_counter import count_tokens
+
+
+def run(n: int, changed: int):
+    tickets = sort_tickets(make_tickets(n))
+    base_prompt = main_bot_prompt(False, [], ticket_index(tickets), "")
+    snapshot = ticket_snapshot(tickets)
+
+    recent = [tickets[0]["id"]]
+    current = [dict(t) for t in tickets]
+    for ticket in current[1:1 + changed]:
+        ticket["status"] = "Blocked"
+    current = sort_tickets(current, recent)
+
+    before = count_tokens(main_bot_prompt(True, recent, ticket_index(current, recent), ""))
+    delta = count_tokens(restart_delta_prompt(recent, ticket_delta(snapshot, current), ""))
+    base = count_tokens(base_prompt)
+    print(f"{n:>8}{changed:>9}{before:>14}{delta:>14}{base + delta:>14}{base:>18}")
+
+
+if __name__ == "__main__":
+    print(f"{'tickets':>8}{'changed':>9}{'before':>14}{'after delta':>14}{'after total':>14}{'cached prefix':>18}")
+    for n in (10, 50, 200):
+        for changed in (0, 2):
+            run(n, changed)
@@ -0,0 +1,79 @@
+"""
+Memory per standup session as the number of discussed tickets grows, with the plain MemorySaver (before)
+and the CompactMemorySaver from src/message_store.py (after). Each configuration runs in a fresh process:
+a few sessions are kept alive in one checkpointer and the RSS growth is divided by their number.
+Jira and the LLMs are the offline fakes from benchmarks/fakes.py.
+    python3 benchmarks/session_memory_benchmark.py [sessions]
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+SAVERS = ["before", "after"]
+TICKET_COUNTS = [1, 5, 10, 20, 30]
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def measure(saver_name: str, n_tickets: int, sessions: int) -> dict:
+    from fakes import install_fakes, session_answers
+    tickets = install_fakes(n_tickets=n_tickets)
+    import builtins
+    builtins.print = lambda *a, **k: None
+    import main_v2
+    from langgraph.checkpoint.memory import MemorySaver
+    from message_store import CompactMemorySaver
+    from session_runner import start_session, resume_session
+
+    saver_class = MemorySaver if saver_name == "before" else CompactMemorySaver
+    app = main_v2.main_graph.compile(checkpointer=saver_class(serde=main_v2.checkpoint_serde))
+
+    def run_session():
+        session_id = str(uuid.uuid4())
+        answers = iter(session_answers([t["id"] for t in tickets]))
+        prompt = start_session(app, session_id, main_v2.initial_state())
+        while prompt is not None:
+            prompt = resume_session(app, session_id, next(answers))
+        return session_id
+
+    saver = app.checkpointer
+    saver.delete_thread(run_session())  # Loads everything that is imported lazily
+    gc.collect()
+    before = rss_kb()
+    session_ids = [run_session() for _ in range(sessions)]
+    gc.collect()
+    stored = sum(len(blob[1]) for blob in saver.blobs.values())
+    stored += sum(len(c[0][1]) + len(c[1][1]) for threads in saver.storage.values() for checkpoints in threads.values() for c in checkpoints.values())
+    stored += sum(len(w[2][1]) for writes in saver.writes.values() for w in writes.values())
+    return {
+        "rss_kb": (rss_kb() - before) / sessions,
+        "stored_kb": stored / 1024 / len(session_ids),
+        "checkpoints": sum(len(c) for threads in saver.storage.values() for c in threads.values()) / len(session_ids),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--one":
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+        sys.exit()
+
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    env = dict(os.environ, SCRUM_TRANSCRIPT_DIR=tempfile.mkdtemp(), SCRUM_OUTCOME_DIR=tempfile.mkdtemp(),
+               SCRUM_HISTORY_DB=os.path.join(tempfile.mkdtemp(), "history.sqlite3"))
+    print(f"{sessions} sessions kept in one checkpointer; per session:")
+    print(f"{'tickets':>8}" + "".join(f"{name + ' ' + column:>20}" for name in SAVERS for column in ("RSS KB", "stored KB", "checkpoints")))
+    for n in TICKET_COUNTS:
+        row = f"{n:>8}"
+        for name in SAVERS:
+            out = subprocess.run([sys.executable, __file__, "--one", name, str(n), str(sessions)], env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            row += f"{result['rss_kb']:>20.0f}{result['stored_kb']:>20.0f}{result['checkpoints']:>20.0f}"
+        print(row)
@@ -0,0 +1,75 @@
+"""
+Nightly standup briefs (src/standup_briefs.py): time to the first greeting with and without a stored brief,
+the nightly build with the LLM digests in one process vs a process pool, and rebuilds that skip unchanged tickets.
+Jira and the LLMs are the offline fakes from benchmarks/fakes.py with fixed latencies; the pool processes
+inherit the fakes by forking, so run it on Linux.
+    python3 benchmarks/standup_brief_benchmark.py [tickets] [users]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from fakes import install_fakes
+
+os.environ["SCRUM_BRIEF_DIR"] = tempfile.mkdtemp()
+os.environ["SCRUM_HISTORY_DB"] = os.path.join(tempfile.mkdtemp(), "history.sqlite3")
+os.environ["SCRUM_TRANSCRIPT_DIR"] = tempfile.mkdtemp()
+os.environ["SCRUM_OUTCOME_DIR"] = tempfile.mkdtemp()
+os.environ["CURRENT_USER_EMAIL"] = "user0@example.com"
+
+LLM_LATENCY_S = 0.3
+JIRA_LATENCY_S = 0.15
+WORKERS = 4
+
+
+def first_greeting_s(app, initial_state) -> float:
+    from session_runner import start_session
+    start = time.perf_counter()
+    start_session(app, str(uuid.uuid4()), initial_state())
+    return time.perf_counter() - start
+
+
+def timed_build(users, workers: int):
+    from standup_briefs import build_briefs
+    start = time.perf_counter()
+    reports = build_briefs(users, workers=workers)
+    return time.perf_counter() - start, reports
+
+
+if __name__ == "__main__":
+    n_tickets = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    n_users = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    users = [f"user{i}@example.com" for i in range(n_users)]
+    tickets = install_fakes(n_tickets=n_tickets, llm_latency_s=LLM_LATENCY_S, jira_latency_s=JIRA_LATENCY_S)
+    from jira_service import JiraService
+    from standup_briefs import brief_path
+
+    print(f"{n_users} users with {n_tickets} tickets each; LLM {LLM_LATENCY_S * 1000:.0f} ms, Jira {JIRA_LATENCY_S * 1000:.0f} ms per call")
+    print(f"{'nightly build':<44}{'seconds':>8}{'unchanged':>11}{'digested':>10}")
+    for label, workers in (("digests in one process", 1), (f"digests in a pool of {WORKERS}", WORKERS)):
+        for user in users:
+            if os.path.exists(brief_path(user)):
+                os.remove(brief_path(user))
+        seconds, reports = timed_build(users, workers)
+        print(f"{label:<44}{seconds:>8.2f}{sum(r['reused'] for r in reports):>11}{sum(r['digested'] for r in reports):>10}")
+
+    seconds, reports = timed_build(users, WORKERS)
+    print(f"{'rebuild, nothing changed':<44}{seconds:>8.2f}{sum(r['reused'] for r in reports):>11}{sum(r['digested'] for r in reports):>10}")
+    jira = JiraService.get_instance()
+    for ticket in tickets[:3]:
+        jira.tickets[ticket["id"]]["updated"] = "2099-01-01T09:00:00.000+0000"
+    seconds, reports = timed_build(users, WORKERS)
+    print(f"{'rebuild, 3 tickets updated':<44}{seconds:>8.2f}{sum(r['reused'] for r in reports):>11}{sum(r['digested'] for r in reports):>10}")
+
+    import builtins
+    quiet_print, builtins.print = builtins.print, lambda *a, **k: None
+    import main_v2
+    with_brief = first_greeting_s(main_v2.main_graph_app, main_v2.initial_state)
+    os.remove(brief_path(os.environ["CURRENT_USER_EMAIL"]))
+    without_brief = first_greeting_s(main_v2.main_graph_app, main_v2.initial_state)
+    builtins.print = quiet_print
+    print(f"\n{'time to first greeting':<44}{'seconds':>8}")
+    print(f"{'live ticket search and comment fetches':<44}{without_brief:>8.2f}")
+    print(f"{'from the nightly brief':<44}{with_brief:>8.2f}")
@@ -0,0 +1,120 @@
+"""
+Time to first greeting: from launching src/main_v2.py until the bot's greeting is printed.
+
+Jira and the OpenAI API are served by a local HTTP server that charges a setup delay for every new
+connection (standing in for DNS, TCP and TLS to a remote endpoint) and a latency for every request.
+Each run starts the bot in a fresh process, once with SCRUM_WARMUP=off and once with the warm-up.
+    python3 benchmarks/startup_benchmark.py [runs] [src_dir]
+Pass the src directory of another checkout as src_dir to compare against an older version of the bot.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+CONNECT_S = 0.3
+JIRA_LATENCY_S = 0.2
+LLM_LATENCY_S = 0.8
+GREETING = "Good morning! Which ticket would you like to discuss first?"
+
+FIELDS = [
+    {"id": "summary", "name": "Summary", "schema": {"type": "string"}},
+    {"id": "customfield_10015", "name": "Start date", "schema": {"type": "date", "custom": "com.atlassian.jira.plugin.system.customfieldtypes:datepicker"}},
+    {"id": "customfield_10020", "name": "Sprint", "schema": {"type": "array", "custom": "com.pyxis.greenhopper.jira:gh-sprint"}},
+]
+ISSUES = [
+    {"key": f"APP-{i}", "fields": {"summary": f"Ticket {i}", "description": "", "status": {"name": "In Progress"},
+                                   "priority": {"name": "Medium"}, "duedate": "2026-11-30"}}
+    for i in range(1, 9)
+]
+
+
+class FakeBackend(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so only new connections pay CONNECT_S
+
+    def setup(self):
+        time.sleep(CONNECT_S)
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/v1/models/"):
+            time.sleep(LLM_LATENCY_S / 8)
+            return self._reply({"id": path.rsplit("/", 1)[-1], "object": "model", "created": 0, "owned_by": "benchmark"})
+        time.sleep(JIRA_LATENCY_S)
+        if path == "/rest/api/2/myself":
+            return self._reply({"accountId": "1", "displayName": "Benchmark User", "emailAddress": "user@example.com"})
+        if path == "/rest/api/2/field":
+            return self._reply(FIELDS)
+        if path == "/rest/api/2/search":
+            return self._reply({"issues": ISSUES, "total": len(ISSUES)})
+        self.send_error(404)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(LLM_LATENCY_S)
+        self._reply({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "benchmark",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": GREETING}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 500, "completion_tokens": 15, "total_tokens": 515},
+        })
+
+
+def time_to_greeting(src_dir: str, base_url: str, warmup: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            PYTHONUNBUFFERED="1",
+            SCRUM_WARMUP="on" if warmup else "off",
+            JIRA_URL=base_url, JIRA_EMAIL="user@example.com", JIRA_API_TOKEN="token",
+            CURRENT_USER_EMAIL="user@example.com",
+            OPENAI_API_KEY="sk-benchmark", OPENAI_BASE_URL=f"{base_url}/v1", OPENAI_API_BASE=f"{base_url}/v1",
+            JIRA_FIELD_SCHEMA_CACHE=os.path.join(directory, "fields.json"),
+            SCRUM_HISTORY_DB=os.path.join(directory, "history.sqlite3"),
+            SCRUM_OUTCOME_DIR=os.path.join(directory, "outcomes"),
+        )
+        env.pop("JIRA_TRACE_FILE", None)
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, os.path.join(src_dir, "main_v2.py")], cwd=directory, env=env,
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        try:
+            for line in process.stdout:
+                if GREETING in line:
+                    return time.perf_counter() - start
+            raise RuntimeError("The bot exited before greeting")
+        finally:
+            process.kill()
+            process.wait()
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    src_dir = os.path.abspath(sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(__file__), "..", "src"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    time_to_greeting(src_dir, base_url, warmup=False)  # Warm the OS file cache and .pyc files
+    print(f"connection setup {CONNECT_S * 1000:.0f} ms, Jira {JIRA_LATENCY_S * 1000:.0f} ms, LLM {LLM_LATENCY_S * 1000:.0f} ms per request")
+    print(f"{'':<12}{'median s':>10}{'min s':>10}{'max s':>10}")
+    for label, warmup in (("no warm-up", False), ("warm-up", True)):
+        times = [time_to_greeting(src_dir, base_url, warmup) for _ in range(runs)]
+        print(f"{label:<12}{statistics.median(times):>10.2f}{min(times):>10.2f}{max(times):>10.2f}")
+    server.shutdown()
@@ -0,0 +1,37 @@
+"""
+Synthetic Jira data with realistic field sizes for benchmarks.
+"""
+import random
+from datetime import date, timedelta
+
+WORDS = (
+    "login flow api endpoint database migration oauth token refresh cache layer dashboard report export "
+    "validation error handling retry timeout user profile settings page mobile layout payment webhook "
+    "notification email template search index pagination audit log permissions role admin staging deploy"
+).split()
+STATUSES = ["In Progress", "To Do", "To Do", "In Review", "Blocked"]
+PRIORITIES = ["Highest", "High", "Medium", "Medium", "Low"]
+
+
+def sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize()
+
+
+def make_tickets(n: int, seed: int = 7, project_key: str = "APP") -> list:
+    rng = random.Random(seed)
+    today = date.today()
+    tickets = []
+    for i in range(1, n + 1):
+        start = today - timedelta(days=rng.randint(0, 30))
+        tickets.append({
+            "id": f"{project_key}-{i}",
+            "title": sentence(rng, 4, 9),
+            "description": ". ".join(sentence(rng, 8, 20) for _ in range(rng.randint(1, 6))) + ".",
+            "priority": rng.choice(PRIORITIES),
+            "status": rng.choice(STATUSES),
+            "start_date": start.isoformat() if rng.random() < 0.7 else None,
+            "due_date": (start + timedelta(days=rng.randint(2, 40))).isoformat() if rng.random() < 0.8 else None,
+            "updated": f"{start.isoformat()}T09:00:00.000+0000",
+        })
+    return tickets
@@ -0,0 +1,37 @@
+"""
+Prompt tokens for ticket lists and single tickets: indented JSON (previous default) vs compact JSON vs the table encoding.
+    python3 benchmarks/ticket_encoding_benchmark.py
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from synthetic_data import make_tickets
+from ticket_encoding import encode_tickets, encode_ticket
+from token_counter import count_tokens, is_exact
+
+ENCODINGS = {
+    "json indent=2": lambda tickets: json.dumps(tickets, indent=2),
+    "json compact": lambda tickets: json.dumps(tickets, separators=(",", ":")),
+    "table": encode_tickets,
+}
+
+
+def main():
+    print(f"Token counts ({'tiktoken' if is_exact() else 'estimated, tiktoken unavailable'})\n")
+    print(f"{'tickets':>8}" + "".join(f"{name:>16}" for name in ENCODINGS) + f"{'saved':>8}")
+    for n in (10, 100, 1000):
+        tickets = make_tickets(n)
+        counts = [count_tokens(encode(tickets)) for encode in ENCODINGS.values()]
+        print(f"{n:>8}" + "".join(f"{c:>16}" for c in counts) + f"{1 - counts[-1] / counts[0]:>8.0%}")
+
+    ticket = make_tickets(1)[0]
+    before = count_tokens(json.dumps(ticket, indent=2))
+    after = count_tokens(encode_ticket(ticket))
+    print(f"\nSingle ticket: {before} tokens as indented JSON, {after} encoded ({1 - after / before:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
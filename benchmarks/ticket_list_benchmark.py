@@ -0,0 +1,49 @@
+"""
+Output tokens and latency of the main_bot ticket list: LLM-generated (before) vs rendered locally (after).
+
+Latency is modelled from token counts with typical gpt-4.1-mini throughput; local rendering is measured.
+    python3 benchmarks/ticket_list_benchmark.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from synthetic_data import make_tickets
+from ticket_renderer import sort_tickets, render_ticket_list, ticket_index
+from token_counter import count_tokens
+
+OUTPUT_TOKENS_PER_SECOND = 80
+PREFILL_TOKENS_PER_SECOND = 5000
+GREETING_TOKENS = 60
+
+def modelled_latency_s(input_tokens: int, output_tokens: int) -> float:
+    return input_tokens / PREFILL_TOKENS_PER_SECOND + output_tokens / OUTPUT_TOKENS_PER_SECOND
+
+
+def run(n: int):
+    tickets = make_tickets(n)
+
+    start = time.perf_counter()
+    rendered = render_ticket_list(sort_tickets(tickets))
+    render_ms = (time.perf_counter() - start) * 1000
+
+    before_in = count_tokens(json.dumps(tickets, indent=2))
+    before_out = GREETING_TOKENS + count_tokens(rendered)
+    after_in = count_tokens(ticket_index(sort_tickets(tickets)))
+    after_out = GREETING_TOKENS
+
+    before_s = modelled_latency_s(before_in, before_out)
+    after_s = modelled_latency_s(after_in, after_out) + render_ms / 1000
+    print(
+        f"{n:>8}{before_in:>12}{after_in:>11}{before_out:>13}{after_out:>12}"
+        f"{before_s:>12.2f}{after_s:>11.2f}{render_ms:>12.2f}"
+    )
+
+
+if __name__ == "__main__":
+    print(f"{'tickets':>8}{'in before':>12}{'in after':>11}{'out before':>13}{'out after':>12}{'s before':>12}{'s after':>11}{'render ms':>12}")
+    for n in (10, 100):
+        run(n)
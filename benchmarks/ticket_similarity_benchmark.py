@@ -0,0 +1,83 @@
+"""
+Related-ticket lookup (src/ticket_similarity.py) on large synthetic backlogs.
+
+Each backlog contains planted near-duplicates (a ticket rewritten with ~20% of its words changed).
+Reports index build time, query latency, recall of the planted duplicate in the top 5,
+and the latency of a brute-force Jaccard scan over every ticket for comparison.
+    python3 benchmarks/ticket_similarity_benchmark.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from ticket_similarity import TicketSimilarityIndex, shingles, ticket_text
+
+VOCABULARY_SIZE = 8000
+DUPLICATES = 200
+
+
+def make_backlog(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice('bcdfghjklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfghklmnprst')}{i}" for i in range(VOCABULARY_SIZE)]
+    # Zipf-like word frequencies, as in real ticket text
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    tickets = [
+        {"id": f"APP-{i}", "title": " ".join(rng.choices(vocabulary, weights, k=rng.randint(5, 10))),
+         "description": " ".join(rng.choices(vocabulary, weights, k=rng.randint(20, 80))), "status": "To Do"}
+        for i in range(n - DUPLICATES)
+    ]
+    pairs = []
+    for i in range(DUPLICATES):
+        original = rng.choice(tickets)
+        words = ticket_text(original).split()
+        rewritten = [rng.choice(vocabulary) if rng.random() < 0.2 else word for word in words]
+        duplicate_id = f"APP-{n - DUPLICATES + i}"
+        tickets.append({"id": duplicate_id, "title": " ".join(rewritten[:8]), "description": " ".join(rewritten[8:]), "status": "To Do"})
+        pairs.append((duplicate_id, original["id"]))
+    return tickets, pairs
+
+
+def brute_force(tickets, ticket_id: str, top_k: int = 5):
+    query = shingles(ticket_text(next(t for t in tickets if t["id"] == ticket_id)))
+    scored = []
+    for t in tickets:
+        if t["id"] != ticket_id:
+            other = shingles(ticket_text(t))
+            scored.append((len(query & other) / len(query | other), t["id"]))
+    return sorted(scored, reverse=True)[:top_k]
+
+
+def run(n: int):
+    tickets, pairs = make_backlog(n)
+    index = TicketSimilarityIndex()
+    start = time.perf_counter()
+    index.sync(tickets)
+    build_s = time.perf_counter() - start
+
+    latencies, hits = [], 0
+    for duplicate_id, original_id in pairs:
+        start = time.perf_counter()
+        results = index.similar(ticket_id=duplicate_id, top_k=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += any(t["id"] == original_id for _, t in results)
+    latencies.sort()
+
+    start = time.perf_counter()
+    for duplicate_id, _ in pairs[:3]:
+        brute_force(tickets, duplicate_id)
+    brute_ms = (time.perf_counter() - start) * 1000 / 3
+
+    print(
+        f"{n:>8}{build_s:>10.2f}{statistics.median(latencies):>10.2f}{latencies[int(0.95 * (len(latencies) - 1))]:>10.2f}"
+        f"{hits / len(pairs):>10.0%}{brute_ms:>14.0f}"
+    )
+
+
+if __name__ == "__main__":
+    print(f"{'tickets':>8}{'build s':>10}{'p50 ms':>10}{'p95 ms':>10}{'recall@5':>10}{'brute ms':>14}")
+    for n in (1_000, 10_000, 50_000):
+        run(n)
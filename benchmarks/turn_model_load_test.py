@@ -0,0 +1,96 @@
+"""
+Workers needed per concurrent standup session with the interrupt/resume turn model.
+
+Simulated users think between messages; each turn is submitted to a shared worker pool that runs
+resume_session against the shared checkpointer. With the previous model, every session held a
+worker (a process blocked in input()) from the first message to the last, i.e. one worker per session.
+Jira and the LLMs are offline fakes (benchmarks/fakes.py) with a fixed latency.
+    python3 benchmarks/turn_model_load_test.py [sessions] [workers]
+"""
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fakes import install_fakes, session_answers
+
+THINK_TIME_S = (0.2, 0.6)  # Scaled down from the tens of seconds a real user takes
+LLM_LATENCY_S = 0.03
+TICKETS_PER_SESSION = 1
+
+
+class BusyCounter:
+    def __init__(self):
+        self.busy = 0
+        self.peak = 0
+        self.busy_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def run(self, fn, *args):
+        start = time.perf_counter()
+        with self.lock:
+            self.busy += 1
+            self.peak = max(self.peak, self.busy)
+        try:
+            return fn(*args)
+        finally:
+            with self.lock:
+                self.busy -= 1
+                self.busy_seconds += time.perf_counter() - start
+
+
+def main(sessions: int, workers: int):
+    tickets = install_fakes(n_tickets=10, llm_latency_s=LLM_LATENCY_S)
+    import builtins
+    builtins.print = lambda *args, **kwargs: None  # Keep the bot's chat output out of the report
+    import main_v2
+    from session_runner import start_session, resume_session
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    counter = BusyCounter()
+    turn_latencies_ms = []
+
+    def user(index: int):
+        rng = random.Random(index)
+        session_id = str(uuid.uuid4())
+        ticket_ids = [t["id"] for t in rng.sample(tickets, TICKETS_PER_SESSION)]
+        answers = iter(session_answers(ticket_ids))
+        submitted = time.perf_counter()
+        prompt = pool.submit(counter.run, start_session, main_v2.main_graph_app, session_id, main_v2.initial_state()).result()
+        turn_latencies_ms.append((time.perf_counter() - submitted) * 1000)
+        while prompt is not None:
+            time.sleep(rng.uniform(*THINK_TIME_S))
+            submitted = time.perf_counter()
+            prompt = pool.submit(counter.run, resume_session, main_v2.main_graph_app, session_id, next(answers)).result()
+            turn_latencies_ms.append((time.perf_counter() - submitted) * 1000)
+
+    start = time.perf_counter()
+    users = [threading.Thread(target=user, args=(i,)) for i in range(sessions)]
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+    wall_s = time.perf_counter() - start
+
+    latencies = sorted(turn_latencies_ms)
+    mean_busy = counter.busy_seconds / wall_s
+    sys.stdout.write(
+        f"{sessions} concurrent sessions, {len(latencies)} turns in {wall_s:.1f} s\n"
+        f"before (input() in nodes): {sessions} workers, 1.00 per session, blocked for the whole session\n"
+        f"after (interrupt/resume):  pool of {workers}, peak busy {counter.peak}, mean busy {mean_busy:.2f} "
+        f"-> {workers / sessions:.2f} per session provisioned, {mean_busy / sessions:.3f} per session used\n"
+        f"turn latency incl. queueing: p50 {statistics.median(latencies):.0f} ms, "
+        f"p95 {latencies[int(0.95 * (len(latencies) - 1))]:.0f} ms, max {latencies[-1]:.0f} ms\n"
+    )
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, sessions // 4)
+    main(sessions, workers)
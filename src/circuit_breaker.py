@@ -0,0 +1,70 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+    After `failure_threshold` consecutive failures the circuit opens and requests are refused
+    until `reset_timeout` seconds have passed. Then a single probe request is let through (half open);
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, on_close: Optional[Callable[[], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_close = on_close
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            recovered = self.state != CircuitState.CLOSED
+            self.state = CircuitState.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+        if recovered and self.on_close:
+            self.on_close()
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """
+        End the half-open probe without an outcome (the request failed for a reason other than Jira being down),
+        so the next request probes again.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        return self.state != CircuitState.CLOSED
@@ -0,0 +1,107 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from jira_service import Comment
+from ticket_encoding import cap
+from token_counter import count_tokens
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "i", "in", "is", "it", "its",
+    "of", "on", "or", "that", "the", "this", "to", "was", "we", "were", "will", "with", "what", "did", "do", "you",
+}
+MAX_COMMENT_CHARS = 600
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+def comment_date(comment: Comment) -> str:
+    # Jira timestamps look like 2025-10-12T10:22:33.000+0000; the date prefix is enough for range filters
+    return (comment.get("created") or "")[:10]
+
+
+class CommentIndex:
+    """
+    BM25 index over the comments of a single ticket.
+    """
+
+    def __init__(self, comments: List[Comment], k1: float = 1.5, b: float = 0.75):
+        self.comments = sorted(comments, key=lambda c: c.get("created") or "", reverse=True)  # Newest first
+        self.k1 = k1
+        self.b = b
+        self.term_frequencies = [
+            Counter(tokenize(f"{c.get('author', {}).get('displayName', '')} {c.get('body') or ''}")) for c in self.comments
+        ]
+        self.lengths = [sum(tf.values()) for tf in self.term_frequencies]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequencies = Counter(term for tf in self.term_frequencies for term in tf)
+        n = len(self.comments)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequencies.items()}
+
+    def score(self, position: int, query_terms: List[str]) -> float:
+        tf = self.term_frequencies[position]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / (self.average_length or 1))
+        return sum(
+            self.idf[term] * tf[term] * (self.k1 + 1) / (tf[term] + norm)
+            for term in query_terms if term in tf
+        )
+
+    def search(self, query: str = "", top_k: int = 5, since: Optional[str] = None, until: Optional[str] = None,
+               max_tokens: int = 800) -> List[Comment]:
+        """
+        Return up to top_k comments, most relevant first (most recent first if there is no query),
+        restricted to the inclusive ISO date range [since, until] and to max_tokens in total.
+        """
+        candidates = [
+            i for i, c in enumerate(self.comments)
+            if (not since or comment_date(c) >= since) and (not until or comment_date(c) <= until)
+        ]
+        query_terms = tokenize(query or "")
+        if query_terms:
+            scored = [(self.score(i, query_terms), i) for i in candidates]
+            # Stable sort keeps newer comments first among equal scores
+            candidates = [i for score, i in sorted(scored, key=lambda s: s[0], reverse=True) if score > 0]
+
+        results: List[Comment] = []
+        used_tokens = 0
+        for i in candidates[:top_k]:
+            comment = dict(self.comments[i])
+            comment["body"] = cap(comment.get("body") or "", MAX_COMMENT_CHARS)
+            tokens = count_tokens(format_comment(comment))
+            if results and used_tokens + tokens > max_tokens:
+                break
+            results.append(comment)
+            used_tokens += tokens
+        return results
+
+
+def format_comment(comment: Comment) -> str:
+    author = comment.get("author", {}).get("displayName") or "Unknown"
+    return f"[{comment_date(comment)}] {author}: {' '.join((comment.get('body') or '').split())}"
+
+
+_indexes: Dict[str, Tuple[tuple, CommentIndex]] = {}
+_lock = threading.Lock()
+
+
+def index_comments(ticket_id: str, comments: List[Comment]) -> CommentIndex:
+    """
+    Build (or reuse) the index for a ticket's comments. The index is rebuilt only when the comments change.
+    """
+    signature = tuple((c.get("id"), c.get("updated") or c.get("created")) for c in comments)
+    with _lock:
+        cached = _indexes.get(ticket_id)
+        if cached and cached[0] == signature:
+            return cached[1]
+    index = CommentIndex(comments)
+    with _lock:
+        _indexes[ticket_id] = (signature, index)
+    return index
+
+
+def invalidate(ticket_id: str):
+    with _lock:
+        _indexes.pop(ticket_id, None)
@@ -0,0 +1,21 @@
+"""
+Process-wide configuration loading. The .env file is read once, on the first load_config() call;
+settings already present in the environment take precedence over the file.
+"""
+import threading
+from dotenv import load_dotenv
+
+TICKET_PROJECT_KEY = "APP"  # Jira project whose tickets the standup covers
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config():
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
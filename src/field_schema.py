@@ -0,0 +1,187 @@
+"""
+Resolves logical ticket fields (start date, story points, sprint) to the field ids of the connected Jira instance.
+
+Custom field ids differ between Jira instances (customfield_10015 is the start date on one site, something else on
+the next), so they are discovered from /rest/api/2/field instead of being hardcoded. The field list is cached on disk
+with a format version and a TTL; processes sharing the cache file (e.g. on a shared volume) discover it once between
+them, and a file lock keeps processes that start together from all fetching it at once.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import requests
+from typing import Callable, Dict, List, Optional, TypedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each process may fetch once when the cache is cold
+    fcntl = None
+
+FIELD_SCHEMA_VERSION = 1  # Bump when the cached format changes; older cache files are then ignored
+
+# Logical name -> field names and custom field types that identify it. A matching type is preferred over a name match.
+LOGICAL_FIELDS = {
+    "start_date": {"names": ["start date"], "types": ["com.atlassian.jira.plugin.system.customfieldtypes:datepicker"]},
+    "story_points": {
+        "names": ["story points", "story point estimate"],
+        "types": ["com.atlassian.jira.plugin.system.customfieldtypes:float", "com.pyxis.greenhopper.jira:jsw-story-points"],
+    },
+    "sprint": {"names": ["sprint"], "types": ["com.pyxis.greenhopper.jira:gh-sprint"]},
+}
+
+# Used while the field list cannot be fetched and nothing is cached
+DEFAULT_FIELD_IDS = {"start_date": "customfield_10015"}
+
+STANDARD_FIELDS = ["summary", "description", "priority", "status", "duedate", "updated"]
+
+RETRY_AFTER_FAILURE_S = 60.0
+
+
+class JiraField(TypedDict):
+    id: str
+    name: str
+    custom_type: Optional[str]
+
+
+def resolve_field_ids(fields: List[JiraField]) -> Dict[str, str]:
+    resolved = {}
+    for logical, spec in LOGICAL_FIELDS.items():
+        named = [f for f in fields if f["name"].strip().lower() in spec["names"]]
+        typed = [f for f in named if f["custom_type"] in spec["types"]]
+        # Sprint fields are recognised by type alone; a plain "Sprint" text field is a worse match
+        candidates = typed or [f for f in fields if logical == "sprint" and f["custom_type"] in spec["types"]] or named
+        if candidates:
+            resolved[logical] = candidates[0]["id"]
+    return resolved
+
+
+def sprint_name(value) -> Optional[str]:
+    """
+    Name of the most recent sprint in a sprint field value: a list of sprint objects (Cloud)
+    or of "com.atlassian.greenhopper.service.sprint.Sprint@...[name=Sprint 4,...]" strings (Server).
+    """
+    if not value:
+        return None
+    latest = value[-1] if isinstance(value, list) else value
+    if isinstance(latest, dict):
+        return latest.get("name")
+    match = re.search(r"name=([^,\]]+)", str(latest))
+    return match.group(1) if match else str(latest)
+
+
+class FieldSchema:
+    def __init__(self, base_url: str, fetch_fields: Callable[[], List[dict]], cache_path: Optional[str] = None,
+                 ttl: float = 86400.0):
+        self.base_url = base_url
+        self.fetch_fields = fetch_fields
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._field_ids: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def field_id(self, logical: str) -> Optional[str]:
+        """
+        Field id for a logical field name, or None if this Jira instance has no such field.
+        """
+        return self.field_ids().get(logical)
+
+    def field_ids(self) -> Dict[str, str]:
+        if self._field_ids is None or time.time() >= self._expires_at:
+            with self._lock:
+                if self._field_ids is None or time.time() >= self._expires_at:
+                    self._load()
+        return self._field_ids
+
+    def search_fields(self) -> List[str]:
+        """
+        The fields parse_ticket reads, for the `fields` parameter of search and issue requests.
+        """
+        return STANDARD_FIELDS + sorted(set(self.field_ids().values()))
+
+    def _load(self):
+        cached = self._read_cache()
+        if cached is None:
+            with self._cache_file_lock():
+                cached = self._read_cache()  # Another process may have fetched it while we waited
+                if cached is None:
+                    cached = self._fetch_and_store()
+        if cached is None:
+            stale = self._read_cache(allow_expired=True)
+            self._field_ids = resolve_field_ids(stale["fields"]) if stale else dict(DEFAULT_FIELD_IDS)
+            self._expires_at = time.time() + RETRY_AFTER_FAILURE_S
+            return
+        self._field_ids = resolve_field_ids(cached["fields"])
+        self._expires_at = cached["fetched_at"] + self.ttl
+
+    def _fetch_and_store(self) -> Optional[dict]:
+        try:
+            raw = self.fetch_fields()
+        except requests.RequestException as e:  # Includes JiraUnavailableError
+            print(f"\n⚠️ Could not load the Jira field list, using cached or default field ids: {e}")
+            return None
+        cached = {
+            "version": FIELD_SCHEMA_VERSION,
+            "base_url": self.base_url,
+            "fetched_at": time.time(),
+            "fields": [
+                {"id": f["id"], "name": f.get("name", ""), "custom_type": (f.get("schema") or {}).get("custom")}
+                for f in raw
+            ],
+        }
+        if self.cache_path:
+            self._write_cache(cached)
+        return cached
+
+    def _read_cache(self, allow_expired: bool = False) -> Optional[dict]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("version") != FIELD_SCHEMA_VERSION or cached.get("base_url") != self.base_url:
+            return None
+        if not allow_expired and time.time() - cached.get("fetched_at", 0) >= self.ttl:
+            return None
+        return cached
+
+    def _write_cache(self, cached: dict):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file and rename, so readers never see a half-written cache
+            fd, temporary = tempfile.mkstemp(dir=directory, prefix=".field_schema.")
+            with os.fdopen(fd, "w") as f:
+                json.dump(cached, f)
+            os.replace(temporary, self.cache_path)
+        except OSError as e:
+            print(f"\n⚠️ Could not write the Jira field cache {self.cache_path}: {e}")
+
+    def _cache_file_lock(self):
+        return _FileLock(f"{self.cache_path}.lock" if self.cache_path and fcntl else None)
+
+
+class _FileLock:
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if self.path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "a")
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except OSError:
+                self._file = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
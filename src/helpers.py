@@ -1,5 +1,6 @@
 import json
 from typing import cast
+from langgraph.types import interrupt
 from models import SystemCommand
 
 def deserialize_system_command(json_str: str) -> SystemCommand:
@@ -33,4 +34,13 @@ def print_ai_response(response_content: str):
     if is_json(response_content) or response_content == "":
         # If the response is JSON or empty, we don't print it directly
         return
-    print(f"\n🤖 AI: {response_content}")
\ No newline at end of file
+    print(f"\n🤖 AI: {response_content}")
+USER_PROMPT = "\n👤 User: "
+
+def ask_user(prompt: str = USER_PROMPT) -> str:
+    """
+    Pause the graph at a checkpoint until the user's next message arrives.
+    The run that called this ends here; the node is re-run from the start when the session
+    is resumed with the message (see session_runner.resume_session), so call it before any side effects.
+    """
+    return interrupt({"prompt": prompt})
@@ -0,0 +1,190 @@
+"""
+Local intent classifier for stage-exit detection.
+
+Short replies like "no", "nothing else", "that's all" or "end" are recognised without an LLM round-trip.
+Exact phrases are matched by rules. Everything else that is short enough goes through a small
+multinomial naive Bayes model bundled in data/intent_model.json. Anything uncertain returns None
+and the caller falls back to the LLM.
+
+    python3 src/intent_classifier.py train   # rebuild data/intent_model.json from data/intent_training.jsonl
+    python3 src/intent_classifier.py eval    # precision/coverage on data/intent_testset.jsonl
+"""
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+MODEL_PATH = os.path.join(DATA_DIR, "intent_model.json")
+TRAINING_PATH = os.path.join(DATA_DIR, "intent_training.jsonl")
+TESTSET_PATH = os.path.join(DATA_DIR, "intent_testset.jsonl")
+
+EXIT = "exit"          # Nothing more to discuss in this stage
+END = "end"            # End the whole conversation
+CONTINUE = "continue"  # Bare "yes" - the user has something else but has not said what yet
+OTHER = "other"        # Real content, needs the LLM
+
+CONFIDENCE_THRESHOLD = 0.9
+MAX_TOKENS = 8  # Longer messages always carry content worth sending to the LLM
+
+RULES = [
+    (EXIT, re.compile(
+        r"^(no+|nope|nah|no thanks?( you)?|no,? thanks?( you)?|nothing( else)?|nothing more|none|not really|"
+        r"that'?s (all|it|everything)|i'?m (good|done|fine|all set)|all (good|set)|we'?re (good|done)|"
+        r"no (more )?questions?|no other questions?|no further questions?|let'?s (move on|proceed|continue)|move on|"
+        r"i don'?t have any( (more|other))? questions?)$"
+    )),
+    (END, re.compile(
+        r"^(end|end (the |this )?(conversation|meeting|standup|scrum|chat)|bye|good ?bye|quit|exit|stop|"
+        r"let'?s (end|stop|wrap up)( (here|now|the (conversation|meeting)))?|i'?m done for today)$"
+    )),
+    (CONTINUE, re.compile(
+        r"^(yes|yeah|yep|yup|sure|ok(ay)?,? (yes|sure)|i (do|have)( a| one| another)? (question|thing)|"
+        r"one more (thing|question)|i have (one|another) (more )?question)$"
+    )),
+]
+
+
+def normalize(text: str) -> str:
+    text = text.lower().strip()
+    text = re.sub(r"[‘’]", "'", text)
+    text = re.sub(r"[^a-z0-9' ,]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip(" ,")
+    return text
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.replace("'", "") for t in re.findall(r"[a-z0-9']+", normalize(text))]
+
+
+def features(tokens: List[str]) -> List[str]:
+    return tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def train(examples: List[Tuple[str, str]]) -> dict:
+    """
+    Fit a multinomial naive Bayes model with add-one smoothing.
+    """
+    class_counts = Counter(label for _, label in examples)
+    feature_counts: Dict[str, Counter] = defaultdict(Counter)
+    vocabulary = set()
+    for text, label in examples:
+        feats = features(tokenize(text))
+        feature_counts[label].update(feats)
+        vocabulary.update(feats)
+
+    total = sum(class_counts.values())
+    model = {"classes": sorted(class_counts), "priors": {}, "likelihoods": {}, "unknown": {}}
+    for label in model["classes"]:
+        denominator = sum(feature_counts[label].values()) + len(vocabulary)
+        model["priors"][label] = math.log(class_counts[label] / total)
+        model["likelihoods"][label] = {
+            feat: round(math.log((count + 1) / denominator), 4) for feat, count in feature_counts[label].items()
+        }
+        model["unknown"][label] = round(math.log(1 / denominator), 4)
+    return model
+
+
+class IntentClassifier:
+    def __init__(self, model: dict, threshold: float = CONFIDENCE_THRESHOLD):
+        self.model = model
+        self.threshold = threshold
+
+    @staticmethod
+    def load(path: str = MODEL_PATH) -> "IntentClassifier":
+        with open(path, encoding="utf-8") as f:
+            return IntentClassifier(json.load(f))
+
+    def probabilities(self, text: str) -> Dict[str, float]:
+        feats = features(tokenize(text))
+        scores = {}
+        for label in self.model["classes"]:
+            likelihoods = self.model["likelihoods"][label]
+            unknown = self.model["unknown"][label]
+            scores[label] = self.model["priors"][label] + sum(likelihoods.get(f, unknown) for f in feats)
+        best = max(scores.values())
+        exp_scores = {label: math.exp(score - best) for label, score in scores.items()}
+        norm = sum(exp_scores.values())
+        return {label: value / norm for label, value in exp_scores.items()}
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Return EXIT, END or CONTINUE when confident, otherwise None (send to the LLM).
+        """
+        normalized = normalize(text)
+        for intent, pattern in RULES:
+            if pattern.match(normalized):
+                return intent
+
+        tokens = tokenize(text)
+        if not tokens or len(tokens) > MAX_TOKENS or "?" in text:
+            return None
+        probabilities = self.probabilities(text)
+        intent = max(probabilities, key=probabilities.get)
+        if intent == OTHER or probabilities[intent] < self.threshold:
+            return None
+        return intent
+
+
+_classifier: Optional[IntentClassifier] = None
+
+
+def classify_intent(text: str) -> Optional[str]:
+    global _classifier
+    if _classifier is None:
+        _classifier = IntentClassifier.load()
+    return _classifier.classify(text)
+
+
+def load_examples(path: str) -> List[Tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        return [(row["text"], row["intent"]) for row in map(json.loads, f) if row]
+
+
+def evaluate(classifier: IntentClassifier, examples: List[Tuple[str, str]]) -> dict:
+    """
+    Precision per handled intent, coverage (share of messages answered locally) and
+    how many real messages were wrongly handled without the LLM.
+    """
+    predicted = Counter()
+    correct = Counter()
+    wrongly_handled = []
+    for text, label in examples:
+        intent = classifier.classify(text)
+        if intent is None:
+            continue
+        predicted[intent] += 1
+        if intent == label:
+            correct[intent] += 1
+        else:
+            wrongly_handled.append((text, label, intent))
+    handled = sum(predicted.values())
+    return {
+        "examples": len(examples),
+        "coverage": handled / len(examples) if examples else 0.0,
+        "precision": correct.total() / handled if handled else 1.0,
+        "precision_per_intent": {intent: correct[intent] / predicted[intent] for intent in predicted},
+        "wrongly_handled": wrongly_handled,
+    }
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "eval"
+    if command == "train":
+        with open(MODEL_PATH, "w", encoding="utf-8") as f:
+            json.dump(train(load_examples(TRAINING_PATH)), f, indent=1, sort_keys=True)
+        print(f"Model written to {MODEL_PATH}")
+    else:
+        examples = load_examples(TESTSET_PATH)
+        result = evaluate(IntentClassifier.load(), examples)
+        trained = {normalize(text) for text, _ in load_examples(TRAINING_PATH)}
+        print(f"Examples: {result['examples']} ({sum(normalize(text) in trained for text, _ in examples)} also in the training data)")
+        print(f"Coverage (handled without LLM): {result['coverage']:.1%}")
+        print(f"Precision: {result['precision']:.1%}")
+        for intent, precision in sorted(result["precision_per_intent"].items()):
+            print(f"  {intent:<9} {precision:.1%}")
+        for text, label, intent in result["wrongly_handled"]:
+            print(f"  wrong: {text!r} expected {label}, got {intent}")
@@ -0,0 +1,91 @@
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypedDict
+
+
+class CacheEntry(TypedDict):
+    value: Any
+    fetched_at: float
+    version: int  # The cache's version when this entry was last written
+
+
+class JiraCache:
+    """
+    In-process store of the last known good Jira reads, keyed by (kind, key),
+    e.g. ("ticket", "APP-1"), ("comments", "APP-1", limit, since) or ("search", jql).
+    Values are deep-copied on the way in and out so callers can mutate what they get back.
+    `version` changes whenever an entry is added, replaced or removed; key_version tells whether one entry changed.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return {"value": copy.deepcopy(entry["value"]), "fetched_at": entry["fetched_at"], "version": entry["version"]}
+
+    def key_version(self, key: Hashable) -> Optional[int]:
+        """
+        Version of the entry under `key`, without copying its value; None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["version"] if entry else None
+
+    def values_where(self, predicate: Callable[[Hashable], bool]) -> List[Any]:
+        with self._lock:
+            return [copy.deepcopy(entry["value"]) for key, entry in self._entries.items() if predicate(key)]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self.version += 1
+            self._entries[key] = {"value": copy.deepcopy(value), "fetched_at": time.time(), "version": self.version}
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.version += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self.version += 1 if keys else 0
+        return len(keys)
+
+    def patch_where(self, predicate: Callable[[Hashable], bool], patch: Callable[[Any, Hashable], Any]) -> int:
+        """
+        Replace the value of every matching entry with patch(value, key). The entry keeps its `fetched_at`,
+        so a patched search list still expires with the TTL of its other tickets. An entry is dropped if `patch` returns None.
+        """
+        patched = 0
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                value = patch(copy.deepcopy(self._entries[key]["value"]), key)
+                if value is None:
+                    del self._entries[key]
+                else:
+                    self._entries[key] = {**self._entries[key], "value": value, "version": self.version + 1}
+                patched += 1
+            self.version += 1 if patched else 0
+        return patched
+
+    @staticmethod
+    def is_fresh(entry: CacheEntry, ttl: float) -> bool:
+        return ttl > 0 and time.time() - entry["fetched_at"] < ttl
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
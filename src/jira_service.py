@@ -1,8 +1,20 @@
 import os
+import functools
+import threading
+import time
 import requests
-from dotenv import load_dotenv
-from typing import List, Dict, Any, TypedDict, NotRequired
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import Future
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, TypedDict, NotRequired, Optional
 import json
+from tracing import Tracer
+from profiler import profiled
+from circuit_breaker import CircuitBreaker
+from jira_cache import JiraCache
+from scheduler import Scheduler, background_priority
+from field_schema import FieldSchema, sprint_name
+from config import load_config
 
 class Author(TypedDict):
     accountId: str
@@ -22,114 +34,491 @@ class Ticket(TypedDict):
     description: str
     status: NotRequired[str]
     priority: NotRequired[str]
+    start_date: NotRequired[str]
+    due_date: NotRequired[str]
+    story_points: NotRequired[float]
+    sprint: NotRequired[str]
+    updated: NotRequired[str]  # Last change to the issue, including comments
     comments: NotRequired[List[Comment]]
+    stale_as_of: NotRequired[str]  # Set when served from the last known good data during a Jira outage
+
+class QueuedWrite(TypedDict):
+    queued: bool
+    operation: str
+    issue_key: str
+
+class JiraUnavailableError(requests.RequestException):
+    """Raised when Jira cannot be reached (network error, 5xx/429 after retries, or circuit open)."""
+    may_have_applied = False  # A POST that failed after it was sent (e.g. read timeout); replaying it could apply it twice
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+def reached_jira(error: requests.RequestException) -> bool:
+    """
+    Whether a request that failed with a network error may have been received by Jira.
+    Only failures to connect (refused, DNS, TLS handshake, connect timeout) mean it was never sent.
+    """
+    if isinstance(error, (requests.ConnectTimeout, requests.exceptions.SSLError)):
+        return False
+    if isinstance(error, requests.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return not isinstance(reason, NewConnectionError)
+    return True
+
+def is_queued(result: Any) -> bool:
+    """
+    Check if the result of a JiraService write is a placeholder for a write queued during an outage.
+    """
+    return isinstance(result, dict) and result.get("queued") is True
+
+def queue_when_unavailable(method):
+    """
+    Decorator for JiraService write methods. While Jira is unavailable the write is queued
+    and replayed in order once the circuit closes again. A QueuedWrite placeholder is returned instead.
+    Writes that may already have been applied are not queued; their JiraUnavailableError is raised.
+    """
+    @functools.wraps(method)
+    def wrapper(self, issue_key, *args, **kwargs):
+        if not self.stale_while_revalidate:
+            return method(self, issue_key, *args, **kwargs)
+        if self.pending_writes:
+            # Keep writes ordered behind the ones already waiting
+            queued = self._enqueue_write(method, issue_key, args, kwargs)
+            self._flush_in_background()
+            return queued
+        try:
+            return method(self, issue_key, *args, **kwargs)
+        except JiraUnavailableError as e:
+            if e.may_have_applied:
+                raise
+            return self._enqueue_write(method, issue_key, args, kwargs)
+    return wrapper
+
+def invalidates_issue_cache(method):
+    """
+    Decorator for JiraService write methods: drop cached reads of the issue after a successful write.
+    """
+    @functools.wraps(method)
+    def wrapper(self, issue_key, *args, **kwargs):
+        result = method(self, issue_key, *args, **kwargs)
+        self.invalidate_issue(issue_key)
+        return result
+    return wrapper
 
 class JiraService:
     _instance = None
 
-    def __init__(self, base_url: str, email: str, api_token: str):
+    def __init__(self, base_url: str, email: str, api_token: str, max_retries: int = 2, timeout: float = 10.0,
+                 stale_while_revalidate: bool = True, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 cache_ttl: float = 0.0, field_schema_cache: Optional[str] = None, field_schema_ttl: float = 86400.0):
         self.base_url = base_url.rstrip("/")
         self.auth = (email, api_token)
         self.headers = {"Accept": "application/json"}
+        self.session = requests.Session()  # Keeps connections alive, so only the first call pays DNS/TLS setup
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stale_while_revalidate = stale_while_revalidate
+        self.cache_ttl = cache_ttl  # Seconds a read is served from the cache without asking Jira; safe to raise with the webhook receiver
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, on_close=self._flush_in_background)
+        self.cache = JiraCache()
+        self.fields = FieldSchema(self.base_url, self._fetch_fields, field_schema_cache, field_schema_ttl)
+        self.pending_writes = []
+        self.account: Optional[Author] = None  # Set by validate_credentials
+        self._refreshing = set()
+        self._prefetched: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
 
     @staticmethod
     def get_instance():
-        load_dotenv()
         if JiraService._instance is None:
+            load_config()
             jira_url = os.getenv("JIRA_URL")
             jira_email = os.getenv("JIRA_EMAIL")
             jira_token = os.getenv("JIRA_API_TOKEN")
-            JiraService._instance = JiraService(jira_url, jira_email, jira_token)
+            JiraService._instance = JiraService(
+                jira_url,
+                jira_email,
+                jira_token,
+                timeout=float(os.getenv("JIRA_TIMEOUT", "10")),
+                stale_while_revalidate=os.getenv("JIRA_STALE_WHILE_REVALIDATE", "true").lower() == "true",
+                cache_ttl=float(os.getenv("JIRA_CACHE_TTL", "0")),
+                field_schema_cache=os.getenv("JIRA_FIELD_SCHEMA_CACHE", ".jira_field_schema.json") or None,
+                field_schema_ttl=float(os.getenv("JIRA_FIELD_SCHEMA_TTL", "86400")),
+            )
         return JiraService._instance
 
+    def _request(self, operation: str, method: str, path: str, issue_key: str = None, **kwargs) -> requests.Response:
+        """
+        Perform a Jira REST call and record a trace span for it.
+        Idempotent GET requests are retried on connection errors and throttling/gateway responses.
+        Network errors and 5xx/429 responses count as circuit breaker failures and raise JiraUnavailableError.
+        A POST that may have reached Jira before failing raises it with may_have_applied set.
+        """
+        tracer = Tracer.get_instance()
+        span = tracer.start_span("jira", operation, method=method, endpoint=path, issue_key=issue_key)
+        max_attempts = 1 + (self.max_retries if method == "GET" else 0)
+        start = time.perf_counter()
+        response = None
+        attempts = 0
+        with profiled("jira", operation):
+            try:
+                if not self.breaker.allow_request():
+                    raise JiraUnavailableError("Jira circuit breaker is open")
+                while True:
+                    attempts += 1
+                    Scheduler.get_instance().acquire("jira")
+                    try:
+                        response = self.session.request(method, f"{self.base_url}{path}", headers=self.headers, auth=self.auth, timeout=self.timeout, **kwargs)
+                    except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                        if attempts >= max_attempts:
+                            self.breaker.record_failure()
+                            error = JiraUnavailableError(f"Jira unreachable: {e}")
+                            error.may_have_applied = method == "POST" and reached_jira(e)
+                            raise error from e
+                    except Exception:
+                        # Not an outage (e.g. TooManyRedirects, InvalidURL): no breaker failure, but a half-open
+                        # probe must not stay in flight or every later request would be refused
+                        self.breaker.release_probe()
+                        raise
+                    else:
+                        if response.status_code not in RETRYABLE_STATUS_CODES or attempts >= max_attempts:
+                            break
+                    time.sleep(0.2 * 2 ** (attempts - 1))
+                if response.status_code >= 500 or response.status_code in RETRYABLE_STATUS_CODES:
+                    self.breaker.record_failure()
+                    raise JiraUnavailableError(f"Jira returned {response.status_code} for {method} {path}", response=response)
+                self.breaker.record_success()
+                response.raise_for_status()
+                return response
+            except requests.RequestException as e:
+                span["error"] = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                span["latency_ms"] = (time.perf_counter() - start) * 1000
+                span["attempts"] = attempts
+                span["status_code"] = response.status_code if response is not None else None
+                span["response_bytes"] = len(response.content) if response is not None else 0
+                tracer.record(span)
+
+    def _cached_read(self, cache_key: tuple, loader):
+        """
+        Read through the last-known-good cache.
+        Entries younger than cache_ttl are served without asking Jira.
+        In stale-while-revalidate mode an open circuit serves the cached value immediately
+        (marked stale) and refreshes it in the background; a failed live read falls back to the cache.
+        """
+        with self._lock:
+            prefetched = self._prefetched.pop(cache_key, None)
+        if prefetched is not None:
+            try:
+                with profiled("jira", "prefetched"):
+                    return prefetched.result()
+            except JiraUnavailableError:
+                pass  # Read again below, falling back to the cache if Jira is still unavailable
+        cached = self.cache.get(cache_key)
+        if cached is not None and JiraCache.is_fresh(cached, self.cache_ttl):
+            return cached["value"]
+        if self.stale_while_revalidate and cached is not None and self.breaker.is_open():
+            self._refresh_in_background(cache_key, loader)
+            return self._mark_stale(cached)
+        try:
+            value = loader()
+        except JiraUnavailableError:
+            if not self.stale_while_revalidate or cached is None:
+                raise
+            return self._mark_stale(cached)
+        self.cache.put(cache_key, value)
+        return value
+
+    def _mark_stale(self, cached) -> Any:
+        as_of = datetime.fromtimestamp(cached["fetched_at"]).isoformat(timespec="minutes")
+        value = cached["value"]
+        for item in (value if isinstance(value, list) else [value]):
+            if isinstance(item, dict) and "title" in item:
+                item["stale_as_of"] = as_of
+        return value
+
+    def _prefetch(self, cache_key: tuple, loader) -> Future:
+        """
+        Start a read in the background. The next _cached_read of the same key waits for it instead of calling Jira again.
+        """
+        future = Future()
+        with self._lock:
+            self._prefetched[cache_key] = future
+
+        def load():
+            try:
+                value = loader()
+                self.cache.put(cache_key, value)
+                future.set_result(value)
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=load, daemon=True).start()
+        return future
+
+    def _refresh_in_background(self, cache_key: tuple, loader):
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                with background_priority():
+                    self.cache.put(cache_key, loader())
+            except JiraUnavailableError:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _enqueue_write(self, method, issue_key: str, args, kwargs) -> QueuedWrite:
+        with self._lock:
+            self.pending_writes.append((method, issue_key, args, kwargs))
+        return {"queued": True, "operation": method.__name__, "issue_key": issue_key}
+
+    def _flush_in_background(self):
+        if self.pending_writes:
+            threading.Thread(target=self.flush_pending_writes, daemon=True).start()
+
+    def flush_pending_writes(self) -> int:
+        """
+        Replay queued writes in order. Stops at the first write that fails because Jira is still unavailable.
+        Returns the number of writes sent.
+        """
+        sent = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if not self.pending_writes:
+                        return sent
+                    method, issue_key, args, kwargs = self.pending_writes[0]
+                try:
+                    with background_priority():
+                        method(self, issue_key, *args, **kwargs)
+                except JiraUnavailableError as e:
+                    if not e.may_have_applied:
+                        return sent
+                    print(f"\n⚠️ Dropped queued Jira write {method.__name__} for {issue_key}, it may or may not have been applied: {e}")
+                except requests.RequestException as e:
+                    print(f"\n⚠️ Dropped queued Jira write {method.__name__} for {issue_key}: {e}")
+                with self._lock:
+                    self.pending_writes.pop(0)
+                sent += 1
+
+    def invalidate_issue(self, issue_key: str):
+        """
+        Drop every cached read of a single issue (ticket, comments, transitions) and the cached searches,
+        which may list the issue with its old status or dates.
+        """
+        affected = lambda key: key[0] == "search" or key[1] == issue_key
+        self.cache.invalidate_where(affected)
+        with self._lock:
+            for key in [k for k in self._prefetched if affected(k)]:
+                del self._prefetched[key]
+
+    def is_degraded(self) -> bool:
+        return self.breaker.is_open()
+
+    def degraded_note(self) -> str:
+        """
+        Note for prompts while Jira is unavailable. Empty when Jira is healthy.
+        """
+        if not self.is_degraded():
+            return ""
+        return (
+            "NOTE: Jira is currently unavailable. Ticket data marked with 'stale_as_of' comes from the last successful fetch and may be outdated. "
+            "Any changes (comments, status or date updates) are saved and will be applied to Jira once it recovers. Mention this briefly to the user if relevant."
+        )
+
+    def _fetch_fields(self) -> List[dict]:
+        return self._request("fetch_fields", "GET", "/rest/api/2/field").json()
+
+    def validate_credentials(self) -> Author:
+        """
+        Fetch the account the API token belongs to. Raises requests.HTTPError (401) for invalid credentials.
+        """
+        self.account = self._request("validate_credentials", "GET", "/rest/api/2/myself").json()
+        return self.account
+
+    def parse_ticket(self, issue: dict) -> Ticket:
+        fields = issue.get("fields", {})
+        field_ids = self.fields.field_ids()
+        ticket: Ticket = {
+            "id": issue.get("key", ""),
+            "title": fields.get("summary", ""),
+            "description": fields.get("description", ""),
+            "priority": fields.get("priority", {}).get("name") if fields.get("priority") else None,
+            "status": fields.get("status", {}).get("name") if fields.get("status") else None,
+            "start_date": fields.get(field_ids.get("start_date")),
+            "due_date": fields.get("duedate"),
+            "updated": fields.get("updated"),
+        }
+        story_points = fields.get(field_ids.get("story_points"))
+        if story_points is not None:
+            ticket["story_points"] = story_points
+        sprint = sprint_name(fields.get(field_ids.get("sprint")))
+        if sprint:
+            ticket["sprint"] = sprint
+        return ticket
+
     def fetch_user_tickets(self, user_email: str, project_key: str = None) -> List[Ticket]:
+        jql = self.user_tickets_jql(user_email, project_key)
+        return self._cached_read(("search", jql), lambda: self._search_tickets(jql))
+
+    def prefetch_user_tickets(self, user_email: str, project_key: str = None) -> Future:
+        """
+        Start fetch_user_tickets in the background; the next fetch_user_tickets call returns its result.
+        """
+        jql = self.user_tickets_jql(user_email, project_key)
+        return self._prefetch(("search", jql), lambda: self._search_tickets(jql))
+
+    @staticmethod
+    def user_tickets_jql(user_email: str, project_key: str = None) -> str:
         # Build JQL with optional project filter
         jql = f'assignee = "{user_email}" AND resolution = Unresolved'
         if project_key:
             jql = f'project = "{project_key}" AND ' + jql
-        url = f"{self.base_url}/rest/api/2/search"
-        params = {"jql": jql}
-        response = requests.get(url, headers=self.headers, params=params, auth=self.auth)
-        response.raise_for_status()
+        return jql
+
+    def _search_tickets(self, jql: str) -> List[Ticket]:
+        params = {"jql": jql, "fields": ",".join(self.fields.search_fields())}
+        response = self._request("fetch_user_tickets", "GET", "/rest/api/2/search", params=params)
         issues = response.json().get("issues", [])
+        return [self.parse_ticket(issue) for issue in issues]
 
+    def fetch_project_tickets(self, project_key: str) -> List[Ticket]:
+        """
+        Fetch every unresolved ticket of a project, most recently updated first, one page per request.
+        """
+        jql = self.project_tickets_jql(project_key)
+        return self._cached_read(("search", jql), lambda: self._search_all_tickets(jql))
+
+    @staticmethod
+    def project_tickets_jql(project_key: str) -> str:
+        return f'project = "{project_key}" AND resolution = Unresolved ORDER BY updated DESC'
+
+    def _search_all_tickets(self, jql: str, page_size: int = 100, max_tickets: int = 50000) -> List[Ticket]:
         tickets: List[Ticket] = []
-        for issue in issues:
-            fields = issue["fields"]
-            ticket: Ticket = {
-                "id": issue["key"],
-                "title": fields.get("summary", ""),
-                "description": fields.get("description", ""),
-                "priority": fields.get("priority", {}).get("name") if fields.get("priority") else None,
-                "status": fields.get("status", {}).get("name") if fields.get("status") else None,
-                "start_date": fields.get("customfield_10015"),
-                "due_date": fields.get("duedate"),
-            }
-            tickets.append(ticket)
+        while len(tickets) < max_tickets:
+            params = {"jql": jql, "startAt": len(tickets), "maxResults": page_size, "fields": ",".join(self.fields.search_fields())}
+            data = self._request("fetch_project_tickets", "GET", "/rest/api/2/search", params=params).json()
+            issues = data.get("issues", [])
+            tickets.extend(self.parse_ticket(issue) for issue in issues)
+            if not issues or len(tickets) >= data.get("total", 0):
+                break
         return tickets
 
-    def fetch_ticket_comments(self, issue_key: str) -> List[Comment]:
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/comment"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
-        response.raise_for_status()
-        data = response.json()
-        comments: List[Comment] = []
-        for comment in data.get("comments", []):
-            author_data = comment.get("author", {})
-            author: Author = {
-                "accountId": author_data.get("accountId", ""),
-                "displayName": author_data.get("displayName", ""),
-            }
-            if "emailAddress" in author_data:
-                author["emailAddress"] = author_data["emailAddress"]
-            comment_obj: Comment = {
-                "id": comment.get("id", ""),
-                "author": author,
-                "body": comment.get("body", ""),
-                "created": comment.get("created", ""),
-            }
-            if "updated" in comment:
-                comment_obj["updated"] = comment["updated"]
-            comments.append(comment_obj)
-        return comments
+    def cached_tickets(self, project_key: Optional[str] = None) -> List[Ticket]:
+        """
+        Tickets from every cached search result, de-duplicated by id. Never calls Jira.
+        """
+        tickets: Dict[str, Ticket] = {}
+        for result in self.cache.values_where(lambda key: key[0] == "search"):
+            for ticket in result:
+                if project_key is None or ticket["id"].startswith(f"{project_key}-"):
+                    tickets[ticket["id"]] = ticket
+        return list(tickets.values())
 
+    def fetch_ticket_comments(self, issue_key: str, limit: Optional[int] = None, since: Optional[str] = None) -> List[Comment]:
+        """
+        Fetch comments of a Jira ticket, newest first.
+        Stops after `limit` comments and/or at the first comment created before `since` (ISO date or datetime).
+        """
+        return self._cached_read(
+            ("comments", issue_key, limit, since),
+            lambda: list(self.iter_ticket_comments(issue_key, limit=limit, since=since)),
+        )
+
+    def iter_ticket_comments(self, issue_key: str, limit: Optional[int] = None, since: Optional[str] = None,
+                             page_size: int = 50) -> Iterator[Comment]:
+        """
+        Iterate over the comments of a Jira ticket newest first, one page per request.
+        Pages are only requested while they are needed, so long histories cost the same as short ones.
+        """
+        start_at = 0
+        yielded = 0
+        while True:
+            max_results = page_size if limit is None else min(page_size, limit - yielded)
+            params = {"startAt": start_at, "maxResults": max_results, "orderBy": "-created"}
+            response = self._request("fetch_ticket_comments", "GET", f"/rest/api/2/issue/{issue_key}/comment", issue_key=issue_key, params=params)
+            data = response.json()
+            page = data.get("comments", [])
+            for comment in page:
+                parsed = self.parse_comment(comment)
+                if since and parsed["created"][:len(since)] < since:
+                    return
+                yield parsed
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+            start_at += len(page)
+            if not page or start_at >= data.get("total", 0):
+                return
+
+    def parse_comment(self, comment: dict) -> Comment:
+        author_data = comment.get("author", {})
+        author: Author = {
+            "accountId": author_data.get("accountId", ""),
+            "displayName": author_data.get("displayName", ""),
+        }
+        if "emailAddress" in author_data:
+            author["emailAddress"] = author_data["emailAddress"]
+        comment_obj: Comment = {
+            "id": comment.get("id", ""),
+            "author": author,
+            "body": comment.get("body", ""),
+            "created": comment.get("created", ""),
+        }
+        if "updated" in comment:
+            comment_obj["updated"] = comment["updated"]
+        return comment_obj
+
+    @queue_when_unavailable
+    @invalidates_issue_cache
     def add_comment(self, issue_key: str, comment_body: str) -> Dict[str, Any]:
         """
         Add a comment to a Jira ticket.
         """
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/comment"
         payload = {"body": comment_body}
-        response = requests.post(url, headers=self.headers, auth=self.auth, json=payload)
-        response.raise_for_status()
+        response = self._request("add_comment", "POST", f"/rest/api/2/issue/{issue_key}/comment", issue_key=issue_key, json=payload)
         return response.json()
 
+    @queue_when_unavailable
+    @invalidates_issue_cache
     def update_ticket_status(self, issue_key: str, transition_id: str) -> bool:
         """
         Update the status of a Jira ticket by performing a transition.
         You must provide the correct transition_id for the desired status.
         """
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
         payload = {"transition": {"id": transition_id}}
-        response = requests.post(url, headers=self.headers, auth=self.auth, json=payload)
-        response.raise_for_status()
+        response = self._request("update_ticket_status", "POST", f"/rest/api/2/issue/{issue_key}/transitions", issue_key=issue_key, json=payload)
         return response.status_code == 204
     
     def get_transitions(self, issue_key: str,) -> bool:
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
-        
-        response = requests.get(url, headers=self.headers, auth=self.auth)
-        response.raise_for_status()
+        return self._cached_read(("transitions", issue_key), lambda: self._get_transitions(issue_key))
+
+    def _get_transitions(self, issue_key: str) -> list:
+        response = self._request("get_transitions", "GET", f"/rest/api/2/issue/{issue_key}/transitions", issue_key=issue_key)
         return response.json().get("transitions", [])
 
+    @queue_when_unavailable
+    @invalidates_issue_cache
     def update_ticket_dates(self, issue_key: str, start_date: str = None, end_date: str = None) -> bool:
         """
         Update the start date and/or end date (due date) of a Jira ticket.
         Dates should be in ISO format: 'YYYY-MM-DD'.
         """
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}"
         fields = {}
         if start_date:
-            fields["customfield_10015"] = start_date  # Replace with your Jira instance's actual custom field ID for start date
+            start_date_field = self.fields.field_id("start_date")
+            if not start_date_field:
+                raise ValueError("This Jira instance has no start date field.")
+            fields[start_date_field] = start_date
         if end_date:
             fields["duedate"] = end_date  # 'duedate' is standard for end/due date in Jira
 
@@ -137,40 +526,27 @@ class JiraService:
             raise ValueError("At least one of start_date or end_date must be provided.")
 
         payload = {"fields": fields}
-        response = requests.put(url, headers=self.headers, auth=self.auth, json=payload)
-        response.raise_for_status()
+        response = self._request("update_ticket_dates", "PUT", f"/rest/api/2/issue/{issue_key}", issue_key=issue_key, json=payload)
         return response.status_code == 204
     
     def delete_all_comments(self, issue_key: str) -> None:
         """
         Delete all comments from a Jira ticket.
         """
-        comments = self.fetch_ticket_comments(issue_key)
-        for comment in comments:
+        for comment in list(self.iter_ticket_comments(issue_key)):
             comment_id = comment["id"]
-            url = f"{self.base_url}/rest/api/2/issue/{issue_key}/comment/{comment_id}"
-            response = requests.delete(url, headers=self.headers, auth=self.auth)
-            response.raise_for_status()
+            self._request("delete_comment", "DELETE", f"/rest/api/2/issue/{issue_key}/comment/{comment_id}", issue_key=issue_key)
 
     def fetch_ticket_by_id(self, issue_key: str) -> Ticket:
         """
         Fetch a single Jira ticket by its issue key.
         """
-        url = f"{self.base_url}/rest/api/2/issue/{issue_key}"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
-        response.raise_for_status()
-        issue = response.json()
-        fields = issue.get("fields", {})
-        ticket: Ticket = {
-            "id": issue.get("key", ""),
-            "title": fields.get("summary", ""),
-            "description": fields.get("description", ""),
-            "priority": fields.get("priority", {}).get("name") if fields.get("priority") else None,
-            "status": fields.get("status", {}).get("name") if fields.get("status") else None,
-            "start_date": fields.get("customfield_10015"),
-            "due_date": fields.get("duedate"),
-        }
-        return ticket
+        return self._cached_read(("ticket", issue_key), lambda: self._fetch_ticket_by_id(issue_key))
+
+    def _fetch_ticket_by_id(self, issue_key: str) -> Ticket:
+        params = {"fields": ",".join(self.fields.search_fields())}
+        response = self._request("fetch_ticket_by_id", "GET", f"/rest/api/2/issue/{issue_key}", issue_key=issue_key, params=params)
+        return self.parse_ticket(response.json())
 
 
 # Example usage:
@@ -194,18 +570,5 @@ class JiraService:
 # transitions = jira_service.get_transitions(issue_key)
 # print(f"Transitions for {issue_key}: {json.dumps(transitions, indent=2)}")
 
-# import os
-# import requests
-
-# JIRA_URL = os.getenv("JIRA_URL")
-# JIRA_EMAIL = os.getenv("JIRA_EMAIL")
-# JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
-
-# url = f"{JIRA_URL.rstrip('/')}/rest/api/2/field"
-# response = requests.get(url, auth=(JIRA_EMAIL, JIRA_API_TOKEN), headers={"Accept": "application/json"})
-# response.raise_for_status()
-# fields = response.json()
-
-# import json
-# print(json.dumps(fields, indent=2))
-
+# Field ids this Jira instance uses for start date, story points and sprint (see field_schema.py):
+# print(json.dumps(jira_service.fields.field_ids(), indent=2))
@@ -0,0 +1,167 @@
+"""
+Receiver for Jira webhooks that keeps the JiraService cache up to date.
+
+Register http://<host>:<port>/jira-webhook?secret=<JIRA_WEBHOOK_SECRET> in Jira for the
+"issue updated", "issue created/deleted" and "comment created/updated/deleted" events.
+Updated tickets and new comments are patched into the cache in place; anything that cannot be
+patched exactly is invalidated. With the receiver running, JIRA_CACHE_TTL can be set high.
+
+For local testing, `send_event` (or `python3 src/jira_webhook.py <url> <issue_key> <comment>`)
+posts the same payloads Jira would send.
+"""
+import json
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+import requests
+from jira_service import JiraService
+
+WEBHOOK_PATH = "/jira-webhook"
+
+# Changes that can move an issue in or out of a saved search (the JQL is not evaluated locally)
+SEARCH_AFFECTING_FIELDS = {"assignee", "resolution", "project"}
+
+
+def apply_event(service: JiraService, payload: dict) -> bool:
+    """
+    Apply a Jira webhook payload to the service cache. Returns False for events that are ignored.
+    """
+    event = payload.get("webhookEvent", "")
+    issue = payload.get("issue") or {}
+    issue_key = issue.get("key")
+    if not issue_key:
+        return False
+    cache = service.cache
+
+    if event == "jira:issue_updated":
+        ticket = service.parse_ticket(issue)
+        cache.patch_where(lambda key: key == ("ticket", issue_key), lambda _, __: ticket)
+        changed_fields = {item.get("field") for item in (payload.get("changelog") or {}).get("items", [])}
+        if changed_fields & SEARCH_AFFECTING_FIELDS:
+            cache.invalidate_where(lambda key: key[0] == "search")
+        else:
+            cache.patch_where(
+                lambda key: key[0] == "search",
+                lambda tickets, _: [ticket if t["id"] == issue_key else t for t in tickets],
+            )
+        if "status" in changed_fields:
+            cache.invalidate(("transitions", issue_key))
+        return True
+
+    if event in ("jira:issue_created", "jira:issue_deleted"):
+        cache.invalidate_where(lambda key: key[0] == "search" or key[1] == issue_key)
+        return True
+
+    if event == "comment_created" and payload.get("comment"):
+        comment = service.parse_comment(payload["comment"])
+
+        def prepend(comments, key):
+            # Cached comment lists are keyed ("comments", issue_key, limit, since) and ordered newest first
+            limit = key[2]
+            comments = [comment] + [c for c in comments if c["id"] != comment["id"]]
+            return comments[:limit] if limit is not None else comments
+
+        cache.patch_where(lambda key: key[0] == "comments" and key[1] == issue_key, prepend)
+        return True
+
+    if event in ("comment_updated", "comment_deleted"):
+        cache.invalidate_where(lambda key: key[0] == "comments" and key[1] == issue_key)
+        return True
+
+    return False
+
+
+def invalidate_event(service: JiraService, payload) -> int:
+    """
+    Drop every cache entry an event about the payload's issue could affect, for events apply_event could not apply.
+    """
+    issue = payload.get("issue") if isinstance(payload, dict) else None
+    issue_key = issue.get("key") if isinstance(issue, dict) else None
+    if not issue_key:
+        return 0
+    return service.cache.invalidate_where(lambda key: key[0] == "search" or key[1] == issue_key)
+
+
+class JiraWebhookHandler(BaseHTTPRequestHandler):
+    service: JiraService = None
+    secret: Optional[str] = None
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != WEBHOOK_PATH:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.secret and parse_qs(url.query).get("secret", [None])[0] != self.secret:
+            self.send_response(403)
+            self.end_headers()
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self.send_response(400)
+            self.end_headers()
+            return
+        try:
+            apply_event(self.service, payload)
+        except Exception as e:  # Malformed payload, e.g. an issue without fields
+            print(f"\n⚠️ Could not apply Jira webhook event, invalidated the issue's cache entries: {type(e).__name__}: {e}")
+            invalidate_event(self.service, payload)
+            self.send_response(500)
+            self.end_headers()
+            return
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_webhook_receiver(service: JiraService, host: str = "0.0.0.0", port: int = 8765, secret: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Serve the webhook endpoint from a daemon thread. Call .shutdown() on the returned server to stop it.
+    """
+    handler = type("BoundJiraWebhookHandler", (JiraWebhookHandler,), {"service": service, "secret": secret})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="jira-webhook").start()
+    return server
+
+
+def issue_updated_event(issue_key: str, fields: dict, changed_fields: list = ()) -> dict:
+    return {
+        "webhookEvent": "jira:issue_updated",
+        "issue": {"key": issue_key, "fields": fields},
+        "changelog": {"items": [{"field": field} for field in changed_fields]},
+    }
+
+
+def comment_created_event(issue_key: str, body: str, author: str = "Webhook Tester", comment_id: str = None) -> dict:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+    return {
+        "webhookEvent": "comment_created",
+        "issue": {"key": issue_key},
+        "comment": {
+            "id": comment_id or str(int(datetime.now().timestamp() * 1000)),
+            "author": {"accountId": "", "displayName": author},
+            "body": body,
+            "created": now,
+            "updated": now,
+        },
+    }
+
+
+def send_event(url: str, payload: dict) -> int:
+    """
+    Local stand-in for Jira: post a webhook payload to a receiver and return the HTTP status code.
+    """
+    return requests.post(url, json=payload, timeout=5).status_code
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: python3 src/jira_webhook.py <receiver_url> <issue_key> <comment>")
+        sys.exit(1)
+    print(send_event(sys.argv[1], comment_created_event(sys.argv[2], sys.argv[3])))
@@ -0,0 +1,171 @@
+"""
+Deadline-bounded, hedged LLM calls.
+
+Each call has a deadline. If the first request has not answered by the configured percentile
+of that stage's recent latencies, a duplicate (hedged) request is sent and the first valid
+response wins. Transient OpenAI errors are retried with jittered exponential backoff while
+the deadline allows.
+"""
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+import openai
+from config import load_config
+
+TRANSIENT_ERRORS = (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class HedgedLLMClient:
+    _instance = None
+
+    def __init__(self, hedge_percentile: float = 95.0, min_samples: int = 20, default_hedge_delay: float = 5.0,
+                 max_retries: int = 2, backoff_base: float = 0.5, max_workers: int = 32):
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples  # Below this many samples the default delay is used
+        self.default_hedge_delay = default_hedge_delay
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-hedge")
+        self._attempt_latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=500))
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=5000))
+        self._hedges: Dict[str, int] = defaultdict(int)
+        self._timeouts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if HedgedLLMClient._instance is None:
+            load_config()
+            HedgedLLMClient._instance = HedgedLLMClient(
+                hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+                default_hedge_delay=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "5")),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            )
+        return HedgedLLMClient._instance
+
+    def hedge_delay(self, stage: str, hedge_percentile: Optional[float] = None) -> float:
+        """
+        Seconds to wait for the first request before sending the hedged one.
+        """
+        with self._lock:
+            samples = list(self._attempt_latencies[stage])
+        if len(samples) < self.min_samples:
+            return self.default_hedge_delay
+        return percentile(samples, hedge_percentile or self.hedge_percentile)
+
+    def invoke(self, stage: str, call: Callable[[], object], deadline_s: float,
+               hedge_percentile: Optional[float] = None, is_valid: Callable[[object], bool] = lambda _: True):
+        """
+        Run call() with a deadline and at most one hedged duplicate, returning the first valid result.
+        If every attempt returns an invalid result the last one is returned so the caller can handle it;
+        if none returns in time, LLMDeadlineExceeded is raised. Non-transient errors are raised without hedging.
+        """
+        start = time.monotonic()
+        deadline = start + deadline_s
+        hedge_at = start + self.hedge_delay(stage, hedge_percentile)
+        pending = {self._submit(stage, call, deadline)}
+        hedged = False
+        fallback = None
+        last_error: Optional[BaseException] = None
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now if hedged else min(deadline, hedge_at) - now
+            done, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    if not isinstance(last_error, TRANSIENT_ERRORS):
+                        raise last_error  # e.g. a bad request or bad credentials: a duplicate would fail the same way
+                elif is_valid(future.result()):
+                    self._record(stage, start)
+                    return future.result()
+                else:
+                    fallback = future.result()
+            # Hedge when the first request is slow, or straight away if it failed with a transient error.
+            # An invalid answer is handed back to the caller, which escalates instead.
+            if not hedged and time.monotonic() < deadline and (time.monotonic() >= hedge_at or (not pending and fallback is None)):
+                hedged = True
+                with self._lock:
+                    self._hedges[stage] += 1
+                pending.add(self._submit(stage, call, deadline))
+
+        if fallback is not None:
+            self._record(stage, start)
+            return fallback
+        if pending:
+            with self._lock:
+                self._timeouts[stage] += 1
+            raise LLMDeadlineExceeded(f"{stage}: no response within {deadline_s:g}s")
+        raise last_error
+
+    def _submit(self, stage: str, call: Callable[[], object], deadline: float):
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._attempt, stage, call, deadline)
+
+    def _attempt(self, stage: str, call: Callable[[], object], deadline: float):
+        for retry in range(self.max_retries + 1):
+            start = time.monotonic()
+            try:
+                result = call()
+            except TRANSIENT_ERRORS:
+                backoff = random.uniform(0, self.backoff_base * 2 ** retry)  # Full jitter
+                if retry == self.max_retries or time.monotonic() + backoff >= deadline:
+                    raise
+                time.sleep(backoff)
+                continue
+            with self._lock:
+                self._attempt_latencies[stage].append(time.monotonic() - start)
+            return result
+
+    def _record(self, stage: str, start: float):
+        with self._lock:
+            self._latencies[stage].append((time.monotonic() - start) * 1000)
+
+    def latency_report(self) -> Dict[str, dict]:
+        """
+        End-to-end latency percentiles, hedges and timeouts per stage.
+        """
+        with self._lock:
+            stages = set(self._latencies) | set(self._timeouts)
+            return {
+                stage: {
+                    "calls": len(self._latencies[stage]),
+                    "p50_ms": percentile(self._latencies[stage], 50),
+                    "p95_ms": percentile(self._latencies[stage], 95),
+                    "p99_ms": percentile(self._latencies[stage], 99),
+                    "hedges": self._hedges[stage],
+                    "timeouts": self._timeouts[stage],
+                }
+                for stage in stages
+            }
+
+    def print_latency_report(self):
+        report = self.latency_report()
+        if not report:
+            return
+        print("\n📊 LLM latency per stage:")
+        print(f"   {'stage':<24}{'calls':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'hedges':>8}{'timeouts':>10}")
+        for stage, row in sorted(report.items(), key=lambda item: item[1]["p95_ms"], reverse=True):
+            print(
+                f"   {stage:<24}{row['calls']:>6}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}{row['p99_ms']:>9.0f}"
+                f"{row['hedges']:>8}{row['timeouts']:>10}"
+            )
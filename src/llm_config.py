@@ -0,0 +1,295 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, NotRequired, Optional, TypedDict
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
+from helpers import deserialize_system_command
+from tools import TOOLS_BY_NAME
+from tracing import Tracer
+from profiler import profiled
+from scheduler import Scheduler
+from token_counter import count_tokens
+from llm_client import HedgedLLMClient, LLMDeadlineExceeded
+from config import load_config
+
+
+class StageLLMConfig(TypedDict):
+    model: str
+    temperature: float
+    tools: List[str]
+    max_tokens: NotRequired[Optional[int]]
+    escalate_to: NotRequired[str]  # Model used when this model produces an invalid command
+    commands: NotRequired[List[str]]  # Commands the stage prompt allows
+    deadline_s: NotRequired[float]  # Give up on a call (hedges included) after this many seconds
+    hedge_percentile: NotRequired[float]  # Send a hedged request after this percentile of recent latencies
+    interactive: NotRequired[bool]  # Default True: a user waits on the reply, so a missed deadline answers with DEADLINE_REPLY
+
+
+DEFAULT_DEADLINE_S = 30.0
+DEADLINE_REPLY = "Sorry, that took me too long. Could you say that again?"
+
+STAGE_COMMANDS = ["proceed_to_next_stage", "end_conversation", "ticket_processing_done"]
+
+# USD per 1M tokens (input, output)
+MODEL_PRICING = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+# Configuration used for every stage when routing is disabled (SCRUM_LLM_ROUTING=off)
+DEFAULT_LLM_CONFIG: StageLLMConfig = {
+    "model": "gpt-4.1-mini",
+    "temperature": 0.5,
+    "tools": list(TOOLS_BY_NAME),
+    "max_tokens": None,
+    "commands": STAGE_COMMANDS,
+}
+
+STAGE_LLM_CONFIG: Dict[str, StageLLMConfig] = {
+    "main_bot": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.5,
+        "tools": [],
+        "max_tokens": 500,
+        "commands": ["ticket_chosen", "end_conversation", "show_ticket_list", "show_ticket_details"],
+        "deadline_s": 15,
+    },
+    "basic_info": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.5,
+        "tools": ["current_date", "parse_to_iso_date", "fetch_comments", "search_comments", "find_similar_tickets", "add_comment"],
+        "max_tokens": 800,
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 20,
+    },
+    # Acknowledgement stages: ask one question, acknowledge, move on
+    "previous_progress_made": {
+        "model": "gpt-4.1-nano",
+        "temperature": 0.3,
+        "tools": ["current_date", "parse_to_iso_date", "search_comments"],
+        "max_tokens": 300,
+        "escalate_to": "gpt-4.1-mini",
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 10,
+    },
+    "plan_for_the_day": {
+        "model": "gpt-4.1-nano",
+        "temperature": 0.3,
+        "tools": ["current_date", "parse_to_iso_date", "search_comments"],
+        "max_tokens": 300,
+        "escalate_to": "gpt-4.1-mini",
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 10,
+    },
+    "blocker_check": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.3,
+        "tools": ["current_date", "find_similar_tickets", "add_comment", "update_status", "update_ticket_dates"],
+        "max_tokens": 600,
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 20,
+    },
+    "due_date_check": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.3,
+        "tools": ["current_date", "parse_to_iso_date", "update_ticket_dates"],
+        "max_tokens": 400,
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 15,
+    },
+    "summarize_conversation": {
+        "model": "gpt-4.1",
+        "temperature": 0.2,
+        "tools": [],
+        "max_tokens": 800,
+        "deadline_s": 45,
+        "interactive": False,
+    },
+    "confirm_summary": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.2,
+        "tools": ["add_comment"],
+        "max_tokens": 1000,
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 20,
+    },
+    # Routing stage: "do you have more questions?"
+    "additional_help": {
+        "model": "gpt-4.1-nano",
+        "temperature": 0.3,
+        "tools": list(TOOLS_BY_NAME),
+        "max_tokens": 400,
+        "escalate_to": "gpt-4.1-mini",
+        "commands": STAGE_COMMANDS,
+        "deadline_s": 10,
+    },
+    # Nightly comment digests and suggested questions (src/standup_briefs.py); nobody is waiting on them
+    "standup_brief": {
+        "model": "gpt-4.1-mini",
+        "temperature": 0.2,
+        "tools": [],
+        "max_tokens": 300,
+        "deadline_s": 60,
+        "interactive": False,
+    },
+}
+
+
+def routing_enabled() -> bool:
+    return os.getenv("SCRUM_LLM_ROUTING", "on").lower() != "off"
+
+
+def stage_config(stage: str) -> StageLLMConfig:
+    if not routing_enabled():
+        return {**DEFAULT_LLM_CONFIG, "interactive": STAGE_LLM_CONFIG.get(stage, {}).get("interactive", True)}
+    return STAGE_LLM_CONFIG.get(stage, DEFAULT_LLM_CONFIG)
+
+
+def build_chat_model(model: str, config: StageLLMConfig):
+    # Retries and timeouts are handled by HedgedLLMClient
+    chat_model = ChatOpenAI(
+        model=model,
+        temperature=config["temperature"],
+        max_tokens=config.get("max_tokens"),
+        timeout=config.get("deadline_s", DEFAULT_DEADLINE_S),
+        max_retries=0,
+    )
+    if config["tools"]:
+        return chat_model.bind_tools([TOOLS_BY_NAME[name] for name in config["tools"]])
+    return chat_model
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def is_valid_response(content: str, commands: Optional[List[str]]) -> bool:
+    """
+    Check that a response is either plain conversation or a well-formed command the stage allows.
+    Text that looks like an attempted command but does not parse is invalid.
+    """
+    if not commands or '"command"' not in content:
+        return True
+    try:
+        command = deserialize_system_command(content)
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return False
+    return command["command"] in commands
+
+
+class StageLLM:
+    """
+    Chat model for a single stage, configured from STAGE_LLM_CONFIG.
+    Escalates to a stronger model when the configured one produces an invalid command,
+    and records an "llm" span (model, latency, tokens, cost) for every call.
+    Calls go through HedgedLLMClient, so a stage never waits longer than its deadline.
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.config = stage_config(stage)
+        self.llm = build_chat_model(self.config["model"], self.config)
+        escalate_to = self.config.get("escalate_to")
+        self.escalation_llm = build_chat_model(escalate_to, self.config) if escalate_to else None
+
+    def invoke(self, messages):
+        with profiled("llm", self.stage):
+            response = self._call(self.llm, self.config["model"], messages)
+            if self.escalation_llm and not self._is_valid(response):
+                response = self._call(self.escalation_llm, self.config["escalate_to"], messages, escalated=True)
+        return response
+
+    def warm_up(self):
+        """
+        Open the connection to the model endpoint and check the API key, so the first invoke skips DNS/TLS setup.
+        Stage models with the same deadline share one HTTP client and its connection pool.
+        """
+        chat_model = getattr(self.llm, "bound", self.llm)  # Unwrap bind_tools
+        chat_model.root_client.models.retrieve(self.config["model"])
+
+    def _is_valid(self, response) -> bool:
+        return bool(response.tool_calls) or is_valid_response(response.content, self.config.get("commands"))
+
+    def _call(self, llm, model: str, messages, escalated: bool = False):
+        try:
+            return HedgedLLMClient.get_instance().invoke(
+                self.stage,
+                lambda: self._invoke(llm, model, messages, escalated),
+                deadline_s=self.config.get("deadline_s", DEFAULT_DEADLINE_S),
+                hedge_percentile=self.config.get("hedge_percentile"),
+                is_valid=self._is_valid,
+            )
+        except LLMDeadlineExceeded:
+            if not self.config.get("interactive", True):
+                raise  # Summaries and briefs have their own fallbacks; the apology must not end up in them
+            # Keep the standup going; the user's next message retries the stage
+            return AIMessage(content=DEADLINE_REPLY)
+
+    def _invoke(self, llm, model: str, messages, escalated: bool = False):
+        tracer = Tracer.get_instance()
+        span = tracer.start_span("llm", self.stage, model=model, escalated=escalated)
+        # OpenAI rate limits count prompt tokens plus the requested completion budget
+        estimated_tokens = sum(count_tokens(str(m.content)) for m in messages) + (self.config.get("max_tokens") or 500)
+        Scheduler.get_instance().acquire("openai", estimated_tokens)
+        start = time.perf_counter()
+        try:
+            response = llm.invoke(messages)
+            usage = response.usage_metadata or {}
+            span["input_tokens"] = usage.get("input_tokens", 0)
+            span["output_tokens"] = usage.get("output_tokens", 0)
+            span["cost_usd"] = estimate_cost(model, span["input_tokens"], span["output_tokens"])
+        except Exception as e:
+            span["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span["latency_ms"] = (time.perf_counter() - start) * 1000
+            tracer.record(span)
+        return response
+
+
+_stage_llms: Dict[str, StageLLM] = {}
+_stage_llms_lock = threading.Lock()
+
+
+def stage_llm(stage: str) -> StageLLM:
+    if stage not in _stage_llms:
+        load_config()
+        with _stage_llms_lock:
+            if stage not in _stage_llms:
+                _stage_llms[stage] = StageLLM(stage)
+    return _stage_llms[stage]
+
+
+def stage_report(spans: List[dict]) -> Dict[str, dict]:
+    """
+    Aggregate "llm" spans into calls, latency, tokens and cost per stage.
+    """
+    report: Dict[str, dict] = {}
+    for span in spans:
+        if span.get("kind") != "llm":
+            continue
+        row = report.setdefault(span["operation"], {"calls": 0, "escalations": 0, "latency_ms": 0.0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0})
+        row["calls"] += 1
+        row["escalations"] += 1 if span.get("escalated") else 0
+        row["latency_ms"] += span["latency_ms"]
+        row["input_tokens"] += span.get("input_tokens", 0)
+        row["output_tokens"] += span.get("output_tokens", 0)
+        row["cost_usd"] += span.get("cost_usd", 0.0)
+    return report
+
+
+def print_stage_report(spans: List[dict]):
+    report = stage_report(spans)
+    if not report:
+        return
+    print("\n📊 LLM usage per stage:")
+    print(f"   {'stage':<24}{'calls':>6}{'escal.':>7}{'avg ms':>9}{'tokens in':>11}{'tokens out':>11}{'cost $':>10}")
+    for stage, row in sorted(report.items(), key=lambda item: item[1]["latency_ms"], reverse=True):
+        print(
+            f"   {stage:<24}{row['calls']:>6}{row['escalations']:>7}{row['latency_ms'] / row['calls']:>9.0f}"
+            f"{row['input_tokens']:>11}{row['output_tokens']:>11}{row['cost_usd']:>10.4f}"
+        )
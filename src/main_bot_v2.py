@@ -1,62 +1,72 @@
 import json
 import os
-from dotenv import load_dotenv
+from typing import Dict, Optional
+import requests
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from jira_service import JiraService, Ticket
-from models import Ticket, ScrumAgentTicketProcessorState, MainBotPhase
-from helpers import deserialize_system_command, print_ai_response
+from langgraph.types import Overwrite
+from jira_service import JiraService, JiraUnavailableError, Ticket
+from models import Ticket, ScrumAgentTicketProcessorState, MainBotPhase, ticket_processor_initial_stages
+from helpers import ask_user, deserialize_system_command, print_ai_response
+from ticket_renderer import (
+    TicketDelta, sort_tickets, ticket_index, print_ticket_list, render_ticket_details,
+    ticket_snapshot, ticket_delta, delta_size, encode_ticket_delta,
+)
+from ticket_briefing import TicketBriefing, brief_tickets
+from standup_briefs import load_brief, session_briefings
+from config import load_config, TICKET_PROJECT_KEY
+
+MIN_FULL_REBUILD_CHANGES = 3  # Deltas this small are always sent as a delta, even for short ticket lists
 
 def fetch_jira_tickets(user_id) -> list[Ticket]:
     """Fetch Jira tickets for a given user using Jira REST API."""
     service = JiraService.get_instance()
-    return service.fetch_user_tickets(user_id, "APP")
+    return service.fetch_user_tickets(user_id, TICKET_PROJECT_KEY)
 
 
-def main_bot(agent_state: ScrumAgentTicketProcessorState, llm=None):
-    load_dotenv()
-    tickets = fetch_jira_tickets(os.getenv("CURRENT_USER_EMAIL"))
-    tickets_str = json.dumps(tickets, indent=2)
+def restarted_instructions(recently_processed_ticket_ids: list[str]) -> str:
+    return f"""
+    - Previous ticket discussion is complete. This is a continuation of the scrum meeting.
+    - Ask the user which ticket they want to discuss next, or if they want to end the conversation.
+    - Recently discussed tickets: {recently_processed_ticket_ids}
+        (They are hidden from the printed ticket list unless the user asks for the list again. Do not mention them explicitly.)
+    - If the user selects a recently discussed ticket, confirm if they want to continue with it or choose a different ticket.
+    """
 
+
+def main_bot_prompt(restarted: bool, recently_processed_ticket_ids: list[str], tickets_str: str, jira_note: str) -> str:
     conversation_note = (
         """
         This is a continuation of a previous conversation. Continue helping the user with their tickets. Ask the user what is the next ticket they want to discuss about any other ticket or else if you could end the conversation. "
         """
-        if agent_state['main_bot_phase'] == MainBotPhase.RESTARTED
+        if restarted
         else "This is a new conversation. Start by greeting the user and helping them choose a ticket. Give a small introduction about the bot and its purpose."
     )
 
-    restarted_bot_prompt = (f"""
-    - Previous ticket discussion is complete. This is a continuation of the scrum meeting.
-    - Ask the user which ticket they want to discuss next, or if they want to end the conversation.
-    - Recently discussed tickets: {agent_state["recently_processed_ticket_ids"] or []}
-        (Do not show these tickets in the list unless the user asks about it. Do not mention them explicitly.)
-    - If the user selects a recently discussed ticket, confirm if they want to continue with it or choose a different ticket.
-    """ if agent_state['main_bot_phase'] == MainBotPhase.RESTARTED
-        else ""
-    )
+    restarted_bot_prompt = restarted_instructions(recently_processed_ticket_ids) if restarted else ""
 
-    prompt = f"""
+    return f"""
     You are an agent conducting a scrum meeting. Speak as the user's manager. {conversation_note}
 
     Context:
     - You have a list of tickets assigned to the user.
-    - Each ticket has: Ticket ID, Summary, Status, Priority, Start Date, Due Date.
+    - The system prints the full ticket list to the user right after your first message. Do not list, repeat or reformat the tickets yourself.
+    - The ticket index below is a table: a header line, then one ticket per row with columns separated by '|'. Empty cells mean not set.
+    - The attention column lists checks that need follow-up (overdue, due_soon, missing_due_date, missing_start_date, stale_in_progress, unanswered_comment). You may suggest starting with those tickets.
 
     Follow all these instructions strictly. Do not skip any of them:
-    - Show the list of tickets in this format:
-        Ticket ID: <id>
-        Summary: <summary>
-        Status: <status>
-        Priority: <priority>
-        Start Date: <start_date> or "Not Set"
-        Due Date: <due_date> or "Not Set"
-    - Order the tickets as follows:
-        1. Tickets with status "In Progress"
-        2. Tickets with status "To Do"
-        3. Recently processed tickets (show these last; do not mention them explicitly to the user)
     - {restarted_bot_prompt}
     - Ask the user to choose a ticket to discuss, or if they want to end the conversation.
-    - If the user requests a ticket's description, provide it.
+    - If the user asks to see the ticket list again, respond ONLY with this JSON (no extra text):
+        {{
+            "command": "show_ticket_list"
+        }}
+    - If the user requests a ticket's description or details, respond ONLY with this JSON (no extra text):
+        {{
+            "command": "show_ticket_details",
+            "args": {{
+                "ticket_id": "<ticket_id>"
+            }}
+        }}
     - If the user selects a ticket, respond ONLY with this JSON (no extra text):
         {{
             "command": "ticket_chosen",
@@ -71,46 +81,160 @@ def main_bot(agent_state: ScrumAgentTicketProcessorState, llm=None):
             "command": "end_conversation"
         }}
 
-    Tickets:
+    {jira_note}
+
+    Ticket index:
     {tickets_str}
     """
 
-    if agent_state["main_bot_phase"] in [MainBotPhase.NOT_STARTED, MainBotPhase.RESTARTED]:
-        agent_state["main_bot_messages"].append(SystemMessage(content=prompt))
-        response = llm.invoke(agent_state["main_bot_messages"])
+
+def restart_delta_prompt(recently_processed_ticket_ids: list[str], delta: Optional[TicketDelta], jira_note: str,
+                         briefings: Optional[Dict[str, TicketBriefing]] = None) -> str:
+    """
+    Sent on RESTARTED after the first system prompt, which already holds the ticket index:
+    only the changes since that index was built are added. `delta` is None when the list could not be refreshed.
+    """
+    changes = encode_ticket_delta(delta, recently_processed_ticket_ids, briefings) if delta is not None else "Unknown: the ticket list could not be refreshed."
+    return f"""
+    Do not greet the user again.
+    {restarted_instructions(recently_processed_ticket_ids)}
+    Changes to the ticket index since it was sent (same table format; these values replace the ones in the index):
+    {changes}
+
+    {jira_note}
+    """
+
+
+def chosen_ticket(tickets: list[Ticket], ticket_id: str) -> tuple[Optional[Ticket], str]:
+    """
+    The ticket the user chose, fetched from Jira if it is not in the list (e.g. the list could not be loaded).
+    Returns (None, reason) when it cannot be found.
+    """
+    ticket = next((t for t in tickets if t["id"] == ticket_id), None)
+    if ticket is not None:
+        return ticket, ""
+    try:
+        return JiraService.get_instance().fetch_ticket_by_id(ticket_id), ""
+    except JiraUnavailableError:
+        return None, f"I can't open ticket {ticket_id} right now because Jira is unavailable."
+    except requests.RequestException:
+        return None, f"I couldn't find ticket {ticket_id} in Jira."
+
+
+def use_ticket_delta(agent_state: ScrumAgentTicketProcessorState, delta: TicketDelta, tickets: list[Ticket], tickets_loaded: bool) -> bool:
+    """
+    A restart sends only the delta while the first system prompt is still in the history
+    and at most half of the tickets changed; otherwise the full prompt is rebuilt.
+    """
+    if agent_state["main_bot_phase"] != MainBotPhase.RESTARTED:
+        return False
+    if not agent_state.get("main_bot_ticket_snapshot") or not agent_state["main_bot_messages"]:
+        return False
+    # Without a fresh list the index already sent is the best there is
+    return not tickets_loaded or delta_size(delta) <= max(MIN_FULL_REBUILD_CHANGES, len(tickets) // 2)
+
+
+def main_bot(agent_state: ScrumAgentTicketProcessorState, llm=None):
+    load_config()
+    # Wait for the user first: everything before ask_user runs again when the session resumes
+    user_message = None
+    if agent_state["main_bot_phase"] not in [MainBotPhase.NOT_STARTED, MainBotPhase.RESTARTED]:
+        user_message = HumanMessage(content=ask_user())
+
+    tickets_loaded = True
+    # The greeting starts from last night's brief when there is a fresh one; later turns fetch the live list
+    brief = load_brief(os.getenv("CURRENT_USER_EMAIL")) if agent_state["main_bot_phase"] == MainBotPhase.NOT_STARTED else None
+    try:
+        tickets = brief["tickets"] if brief else fetch_jira_tickets(os.getenv("CURRENT_USER_EMAIL"))
+        jira_note = JiraService.get_instance().degraded_note()
+    except JiraUnavailableError:
+        tickets = []
+        tickets_loaded = False
+        jira_note = "NOTE: Jira is currently unavailable and the ticket list could not be loaded. Tell the user and offer to end the conversation or try again later."
+    recently_processed_ticket_ids = agent_state["recently_processed_ticket_ids"] or []
+    tickets = sort_tickets(tickets, recently_processed_ticket_ids)
+    restarted = agent_state["main_bot_phase"] == MainBotPhase.RESTARTED
+    briefings = agent_state.get("ticket_briefings") or {}
+    if brief:
+        briefings = session_briefings(brief, os.getenv("CURRENT_USER_EMAIL"), (JiraService.get_instance().account or {}).get("accountId"))
+    elif agent_state["main_bot_phase"] == MainBotPhase.NOT_STARTED and tickets_loaded:
+        # Per-ticket checks that need no input from the user, for all tickets at once
+        briefings = brief_tickets(tickets, os.getenv("CURRENT_USER_EMAIL"))
+
+    # Updates below only carry the new messages; the append_messages reducer adds them to the history
+    delta = ticket_delta(agent_state.get("main_bot_ticket_snapshot") or {}, tickets)
+    if use_ticket_delta(agent_state, delta, tickets, tickets_loaded):
+        # Keep the first system prompt (and its ticket index) byte-identical, so it also stays in the provider's prompt cache
+        base_message = agent_state["main_bot_messages"][0]
+        restart_message = SystemMessage(content=restart_delta_prompt(
+            recently_processed_ticket_ids, delta if tickets_loaded else None, jira_note, briefings))
+        response = llm.invoke([base_message, restart_message])
         print_ai_response(response.content)
+        print_ticket_list([t for t in tickets if t["id"] not in recently_processed_ticket_ids], briefings)
         return {
             "main_bot_phase": MainBotPhase.IN_PROGRESS,
-            "recently_processed_ticket_ids": agent_state["recently_processed_ticket_ids"],
-            "main_bot_messages": list(agent_state["main_bot_messages"]) + [response]
+            # The previous ticket's conversation and any earlier delta are dropped
+            "main_bot_messages": Overwrite([base_message, restart_message, response]),
+            # Its stage transcripts were spilled to disk by ticket_processing_end_node
+            "ticket_processing_stages": Overwrite(ticket_processor_initial_stages()),
         }
 
-    user_input = input("\n👤 User: ")
-    agent_state["main_bot_messages"].append(HumanMessage(content=user_input))
+    if agent_state["main_bot_phase"] in [MainBotPhase.NOT_STARTED, MainBotPhase.RESTARTED]:
+        tickets_str = ticket_index(tickets, recently_processed_ticket_ids, briefings)
+        system_message = SystemMessage(content=main_bot_prompt(restarted, recently_processed_ticket_ids, tickets_str, jira_note))
+        response = llm.invoke([system_message])
+        print_ai_response(response.content)
+        if restarted:
+            # Recently discussed tickets are only shown again if the user asks for the list
+            print_ticket_list([t for t in tickets if t["id"] not in recently_processed_ticket_ids], briefings)
+            # The previous ticket's conversation is dropped, and its stages (spilled to disk by ticket_processing_end_node)
+            update = {"main_bot_messages": Overwrite([system_message, response]), "ticket_processing_stages": Overwrite(ticket_processor_initial_stages())}
+        else:
+            print_ticket_list(tickets, briefings)
+            update = {"main_bot_messages": [system_message, response]}
+        return {
+            **update,
+            "main_bot_phase": MainBotPhase.IN_PROGRESS,
+            "main_bot_ticket_snapshot": ticket_snapshot(tickets) if tickets_loaded else {},
+            "ticket_briefings": briefings,
+        }
 
-    response = llm.invoke(agent_state["main_bot_messages"])
+    response = llm.invoke([*agent_state["main_bot_messages"], user_message])
     print_ai_response(response.content)
     try:
         systemCommand = deserialize_system_command(response.content)
         if systemCommand["command"] == "ticket_chosen" and "ticket_id" in systemCommand["args"]:
+            ticket, not_found = chosen_ticket(tickets, systemCommand["args"]["ticket_id"])
+            if ticket is None:
+                reply = AIMessage(content=f"{not_found} Which ticket would you like to discuss?")
+                print_ai_response(reply.content)
+                return {
+                    "main_bot_phase": MainBotPhase.IN_PROGRESS,
+                    "main_bot_messages": [user_message, response, reply],
+                }
             return {
                 "main_bot_phase": MainBotPhase.TICKET_CHOSEN,
-                "current_ticket": next((t for t in tickets if t["id"] == systemCommand["args"]["ticket_id"]), None),
-                "main_bot_messages": list(agent_state["main_bot_messages"]),
-                "recently_processed_ticket_ids": agent_state["recently_processed_ticket_ids"],
-                "ticket_processing_messages": [response]
+                "current_ticket": ticket,
+                "main_bot_messages": [user_message],
+                "ticket_processing_stages": Overwrite(ticket_processor_initial_stages()),
             }
         
         if systemCommand["command"] == "end_conversation":
             return {
                 "main_bot_phase": MainBotPhase.END_CONVERSATION,
             }
+
+        if systemCommand["command"] == "show_ticket_list":
+            print_ticket_list(tickets, briefings)
+
+        if systemCommand["command"] == "show_ticket_details" and "ticket_id" in systemCommand["args"]:
+            ticket = next((t for t in tickets if t["id"] == systemCommand["args"]["ticket_id"]), None)
+            print(f"\n{render_ticket_details(ticket)}" if ticket else f"\nTicket {systemCommand['args']['ticket_id']} not found.")
         
     except (json.JSONDecodeError, TypeError):
         pass
 
     return {
         "main_bot_phase": MainBotPhase.IN_PROGRESS,
-        "recently_processed_ticket_ids": agent_state["recently_processed_ticket_ids"],
-        "main_bot_messages": list(agent_state["main_bot_messages"]) + [response]
+        "main_bot_messages": [user_message, response],
     }
\ No newline at end of file
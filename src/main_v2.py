@@ -1,3 +1,13 @@
+import os
+from config import load_config, TICKET_PROJECT_KEY
+from warmup import start_warmup
+
+warmup = None
+if __name__ == "__main__":
+    load_config()
+    # Connect to Jira and the LLM endpoint and start the ticket search while the modules below load and the graphs compile
+    warmup = start_warmup(os.getenv("CURRENT_USER_EMAIL"), TICKET_PROJECT_KEY)
+
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from models import ScrumAgentTicketProcessorState, TicketProcessorPhase, MainBotPhase, ticket_processor_initial_stages
@@ -12,15 +22,25 @@ from langchain_core.prompts import PromptTemplate
 from prompts import ticket_processor_stage_prompt, ticket_processor_base_prompt
 from main_bot_v2 import main_bot
 from ticket_processor_bot_v2 import execute_stage, custom_tool_node, summarize_conversation_node, ticket_processing_end_node
-
-tools = [current_date, parse_to_iso_date,  fetch_comments, add_comment, update_status, update_ticket_dates]
-llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.5).bind_tools(tools)
+from tracing import Tracer, traced_node
+from llm_config import stage_llm, print_stage_report
+from jira_webhook import start_webhook_receiver
+from scheduler import Scheduler
+from llm_client import HedgedLLMClient
+from session_runner import start_session, resume_session
+from profiler import profiled, start_profile, finish_profile
+from message_store import CompactMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+import uuid
 
 def main_bot_flow_decision(state: ScrumAgentTicketProcessorState):
     # breakpoint()  # For debugging purposes, remove in production
     if "bot_state" in state and state["bot_state"] == MainBotPhase.COMPLETED:
         return "end_conversation"
 
+    if state.get("main_bot_phase") == MainBotPhase.END_CONVERSATION:
+        return "end_conversation"
+
     messages = state["main_bot_messages"]
 
     if not messages:
@@ -40,23 +60,23 @@ def stage_flow_decision(state):
 
 
 graph = StateGraph(ScrumAgentTicketProcessorState)
-graph.add_node("basic_info_custom_tool_node", custom_tool_node)
-graph.add_node("previous_progress_made_custom_tool_node", custom_tool_node)
-graph.add_node("plan_for_the_day_custom_tool_node", custom_tool_node)
-graph.add_node("blocker_check_custom_tool_node", custom_tool_node)
-graph.add_node("due_date_check_custom_tool_node", custom_tool_node)
-graph.add_node("confirm_summary_custom_tool_node", custom_tool_node)
-graph.add_node("additional_help_node_custom_tool_node", custom_tool_node)
-
-graph.add_node("basic_info", lambda state: execute_stage(state, llm))
-graph.add_node("previous_progress_made", lambda state: execute_stage(state, llm))
-graph.add_node("plan_for_the_day", lambda state: execute_stage(state, llm))
-graph.add_node("blocker_check", lambda state: execute_stage(state, llm))
-graph.add_node("due_date_check", lambda state: execute_stage(state, llm))
-graph.add_node("summarize_conversation", lambda state: summarize_conversation_node(state, llm))
-graph.add_node("confirm_summary", lambda state: execute_stage(state, llm))
-graph.add_node("additional_help_node", lambda state: execute_stage(state, llm))
-graph.add_node("ticket_processing_end_node", ticket_processing_end_node)
+graph.add_node("basic_info_custom_tool_node", traced_node("basic_info_custom_tool_node", custom_tool_node))
+graph.add_node("previous_progress_made_custom_tool_node", traced_node("previous_progress_made_custom_tool_node", custom_tool_node))
+graph.add_node("plan_for_the_day_custom_tool_node", traced_node("plan_for_the_day_custom_tool_node", custom_tool_node))
+graph.add_node("blocker_check_custom_tool_node", traced_node("blocker_check_custom_tool_node", custom_tool_node))
+graph.add_node("due_date_check_custom_tool_node", traced_node("due_date_check_custom_tool_node", custom_tool_node))
+graph.add_node("confirm_summary_custom_tool_node", traced_node("confirm_summary_custom_tool_node", custom_tool_node))
+graph.add_node("additional_help_node_custom_tool_node", traced_node("additional_help_node_custom_tool_node", custom_tool_node))
+
+graph.add_node("basic_info", traced_node("basic_info", lambda state: execute_stage(state, stage_llm("basic_info"))))
+graph.add_node("previous_progress_made", traced_node("previous_progress_made", lambda state: execute_stage(state, stage_llm("previous_progress_made"))))
+graph.add_node("plan_for_the_day", traced_node("plan_for_the_day", lambda state: execute_stage(state, stage_llm("plan_for_the_day"))))
+graph.add_node("blocker_check", traced_node("blocker_check", lambda state: execute_stage(state, stage_llm("blocker_check"))))
+graph.add_node("due_date_check", traced_node("due_date_check", lambda state: execute_stage(state, stage_llm("due_date_check"))))
+graph.add_node("summarize_conversation", traced_node("summarize_conversation", lambda state: summarize_conversation_node(state, stage_llm("summarize_conversation"))))
+graph.add_node("confirm_summary", traced_node("confirm_summary", lambda state: execute_stage(state, stage_llm("confirm_summary"))))
+graph.add_node("additional_help_node", traced_node("additional_help_node", lambda state: execute_stage(state, stage_llm("additional_help"))))
+graph.add_node("ticket_processing_end_node", traced_node("ticket_processing_end_node", ticket_processing_end_node))
 
 graph.set_entry_point("basic_info")
 graph.add_conditional_edges(
@@ -67,8 +87,9 @@ graph.add_conditional_edges(
         TicketProcessorPhase.IN_PROGRESS: "basic_info",
         TicketProcessorPhase.PROCEED_TO_NEXT_STAGE: "previous_progress_made",
         TicketProcessorPhase.TOOLS_CALL: "basic_info_custom_tool_node",  # This will call the tool node
-        TicketProcessorPhase.END_CONVERSATION: END,  # This will end the conversation
-        TicketProcessorPhase.COMPLETED: END,  # This will end the conversation
+        # Early exits also go through the end node, which discards the rolling summary and records the outcome
+        TicketProcessorPhase.END_CONVERSATION: "ticket_processing_end_node",
+        TicketProcessorPhase.COMPLETED: "ticket_processing_end_node",
     }
 )
 
@@ -80,8 +101,8 @@ graph.add_conditional_edges(
         TicketProcessorPhase.IN_PROGRESS: "previous_progress_made",
         TicketProcessorPhase.PROCEED_TO_NEXT_STAGE: "plan_for_the_day",
         TicketProcessorPhase.TOOLS_CALL: "previous_progress_made_custom_tool_node",
-        TicketProcessorPhase.END_CONVERSATION: END,  # This will end the conversation
-        TicketProcessorPhase.COMPLETED: END,  # This will end the conversation
+        TicketProcessorPhase.END_CONVERSATION: "ticket_processing_end_node",
+        TicketProcessorPhase.COMPLETED: "ticket_processing_end_node",
     }
 )
 
@@ -93,8 +114,8 @@ graph.add_conditional_edges(
         TicketProcessorPhase.IN_PROGRESS: "plan_for_the_day",
         TicketProcessorPhase.PROCEED_TO_NEXT_STAGE: "blocker_check",
         TicketProcessorPhase.TOOLS_CALL: "plan_for_the_day_custom_tool_node",  # This will call the tool node
-        TicketProcessorPhase.END_CONVERSATION: END,  # This will end the conversation
-        TicketProcessorPhase.COMPLETED: END,  # This will end the conversation
+        TicketProcessorPhase.END_CONVERSATION: "ticket_processing_end_node",
+        TicketProcessorPhase.COMPLETED: "ticket_processing_end_node",
     }
 )
 
@@ -152,16 +173,18 @@ graph.add_conditional_edges(
 
 graph.add_edge("ticket_processing_end_node", END)
 graph.add_edge("basic_info_custom_tool_node", "basic_info")
+graph.add_edge("previous_progress_made_custom_tool_node", "previous_progress_made")
 graph.add_edge("plan_for_the_day_custom_tool_node", "plan_for_the_day")
 graph.add_edge("blocker_check_custom_tool_node", "blocker_check")
 graph.add_edge("due_date_check_custom_tool_node", "due_date_check")
 graph.add_edge("confirm_summary_custom_tool_node", "confirm_summary")
+graph.add_edge("additional_help_node_custom_tool_node", "additional_help_node")
 subgraph_app = graph.compile()
 
 
 
 main_graph = StateGraph(ScrumAgentTicketProcessorState)
-main_graph.add_node("main_bot", lambda state: main_bot(state, llm))
+main_graph.add_node("main_bot", traced_node("main_bot", lambda state: main_bot(state, stage_llm("main_bot"))))
 main_graph.add_node("ticket_processing_bot", subgraph_app)  # graph is your subgraph, not subgraph_app
 
 main_graph.set_entry_point("main_bot")
@@ -176,17 +199,42 @@ main_graph.add_conditional_edges(
 )
 main_graph.add_edge("ticket_processing_bot", "main_bot")
 
-main_graph_app = main_graph.compile()
-
-initial_state = {
-    "main_bot_phase": MainBotPhase.NOT_STARTED,
-    "recently_processed_ticket_ids": [],
-    "main_bot_messages": [],
-    "ticket_processing_current_stage": "basic_info",
-    "ticket_processing_stages": ticket_processor_initial_stages()
-}
+# Sessions pause at a checkpoint whenever they wait for the user (see session_runner); only the latest one is kept
+checkpoint_serde = JsonPlusSerializer(allowed_msgpack_modules=[
+    ("models", "MainBotPhase"),
+    ("models", "TicketProcessorPhase"),
+])
+main_graph_app = main_graph.compile(checkpointer=CompactMemorySaver(serde=checkpoint_serde))
+
+def initial_state():
+    return {
+        "main_bot_phase": MainBotPhase.NOT_STARTED,
+        "recently_processed_ticket_ids": [],
+        "main_bot_messages": [],
+        "ticket_processing_current_stage": "basic_info",
+        "ticket_processing_stages": ticket_processor_initial_stages()
+    }
 
-main_graph_app.invoke(initial_state, {"recursion_limit": 1000})
+if __name__ == "__main__":
+    if os.getenv("JIRA_WEBHOOK_PORT"):
+        start_webhook_receiver(JiraService.get_instance(), port=int(os.getenv("JIRA_WEBHOOK_PORT")), secret=os.getenv("JIRA_WEBHOOK_SECRET"))
+
+    session_id = str(uuid.uuid4())
+    start_profile(session_id)  # Only when SCRUM_PROFILE_DIR is set
+    prompt = start_session(main_graph_app, session_id, initial_state())
+    while prompt is not None:
+        with profiled("human", "input"):
+            user_input = input(prompt)
+        prompt = resume_session(main_graph_app, session_id, user_input)
+    finish_profile(session_id)
+
+    # Spans are always recorded in process; JIRA_TRACE_FILE only turns on the export
+    Tracer.get_instance().print_summary("jira", session_id)
+    print_stage_report(Tracer.get_instance().spans_for("llm", session_id))
+    HedgedLLMClient.get_instance().print_latency_report()
+    Scheduler.get_instance().print_metrics()
+    if warmup:
+        warmup.print_report()
 
 # Draw the graphs to PNG files (optional, for visualization)
 # main_graph_app.get_graph().draw_png("main_bot.png")
@@ -0,0 +1,225 @@
+"""
+Compact, memory-bounded checkpoint storage for long standups.
+
+- CompactMemorySaver keeps only the latest checkpoint of each session (sessions only ever resume from it)
+  and drops a ticket's subgraph checkpoints once the ticket is done, so memory stays flat as tickets pile up.
+- Messages are stored as slots: [SLOT, kind, content, id, extras], without response and usage metadata.
+- System prompts are split into paragraphs and long paragraphs are interned in a PromptPool shared by all
+  sessions: stage instructions are stored once per process and the ticket shared by a ticket's stage prompts once per ticket.
+- Completed tickets' transcripts are spilled to <SCRUM_TRANSCRIPT_DIR>/<session>.jsonl before main_bot drops them.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage, messages_from_dict, messages_to_dict
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from config import load_config
+
+SLOT = "\x00msg"
+REF = "¶"  # Marks an interned paragraph: REF + digest
+MIN_INTERN_CHARS = 200  # Shorter paragraphs are stored inline
+MIN_SWEEP_SIZE = 1024  # Pool entries before unreferenced ones are first swept
+_PARAGRAPH = re.compile(r"(\n\s*\n)")
+_REF_BYTES = re.compile(REF.encode() + rb"([0-9a-f]{16})")
+
+_KINDS = {SystemMessage: "system", HumanMessage: "human", AIMessage: "ai", ToolMessage: "tool"}
+_CLASSES = {kind: cls for cls, kind in _KINDS.items()}
+# Fields kept besides content and id, when set. response_metadata and usage_metadata are only read right after a call.
+_EXTRAS = ["name", "tool_calls", "invalid_tool_calls", "tool_call_id", "additional_kwargs"]
+
+
+class PromptPool:
+    """
+    Content-addressed paragraphs of system prompts.
+    """
+
+    def __init__(self):
+        self._texts: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def intern(self, text: str) -> str:
+        digest = hashlib.sha1(text.encode()).hexdigest()[:16]
+        self._texts.setdefault(digest, text)
+        return digest
+
+    def text(self, digest: str) -> str:
+        return self._texts[digest]
+
+    def retain(self, digests: Iterable[str]):
+        live = set(digests)
+        self._texts = {d: t for d, t in self._texts.items() if d in live}
+
+
+class CompactSerializer:
+    """
+    Wraps a checkpoint serializer: messages anywhere in the value are written as slots and read back as messages.
+    """
+
+    def __init__(self, serde, pool: PromptPool):
+        self.serde = serde
+        self.pool = pool
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        return self.serde.dumps_typed(self._pack(obj))
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        return self._unpack(self.serde.loads_typed(data))
+
+    def _pack(self, value):
+        if type(value) in _KINDS:
+            return self._slot(value)
+        if type(value) is dict:
+            return {k: self._pack(v) for k, v in value.items()}
+        if type(value) is list:
+            return [self._pack(v) for v in value]
+        if type(value) is tuple:
+            return tuple(self._pack(v) for v in value)
+        return value
+
+    def _unpack(self, value):
+        # The serializer reads tuples back as lists
+        if type(value) in (list, tuple) and value and value[0] == SLOT:
+            return self._message(value)
+        if type(value) is dict:
+            return {k: self._unpack(v) for k, v in value.items()}
+        if type(value) is list:
+            return [self._unpack(v) for v in value]
+        if type(value) is tuple:
+            return tuple(self._unpack(v) for v in value)
+        return value
+
+    def _slot(self, message: BaseMessage) -> tuple:
+        kind = _KINDS[type(message)]
+        content = message.content
+        if kind == "system" and isinstance(content, str):
+            kind, content = "prompt", self._intern_paragraphs(content)
+        extras = {field: getattr(message, field) for field in _EXTRAS if getattr(message, field, None)}
+        return (SLOT, kind, content, message.id, extras or None)
+
+    def _message(self, slot: tuple) -> BaseMessage:
+        _, kind, content, message_id, extras = slot
+        if kind == "prompt":
+            kind, content = "system", "".join(self.pool.text(part[1:]) if part.startswith(REF) else part for part in content)
+        return _CLASSES[kind](content=content, id=message_id, **(extras or {}))
+
+    def _intern_paragraphs(self, text: str) -> tuple:
+        parts, inline = [], ""
+        for chunk in _PARAGRAPH.split(text):
+            # Inline text that happens to start with REF is interned too, so it cannot be mistaken for a reference
+            if len(chunk) >= MIN_INTERN_CHARS or chunk.startswith(REF):
+                if inline:
+                    parts.append(inline)
+                    inline = ""
+                parts.append(REF + self.pool.intern(chunk))
+            else:
+                inline += chunk
+        return tuple(parts + [inline] if inline else parts)
+
+
+class CompactMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that keeps one checkpoint per session and namespace, with compact message storage.
+    """
+
+    def __init__(self, *, serde=None, pool: Optional[PromptPool] = None):
+        self.pool = pool or PromptPool()
+        super().__init__(serde=CompactSerializer(serde or JsonPlusSerializer(), self.pool))
+        self._versions: Dict[Tuple[str, str], dict] = {}  # (thread, namespace) -> channel versions of the kept checkpoint
+        self._sweep_at = MIN_SWEEP_SIZE
+        # Interning and storing a blob happen under the lock, so a sweep never sees a paragraph without its blob
+        self._lock = threading.RLock()
+
+    def get_tuple(self, config):
+        with self._lock:
+            return super().get_tuple(config)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._lock:
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            self._drop_older(thread_id, checkpoint_ns, checkpoint)
+            if checkpoint_ns == "":
+                # The root only checkpoints between steps, so the subgraph that ran in the step has finished
+                for child_ns in [ns for ns in self.storage[thread_id] if ns]:
+                    self._drop_namespace(thread_id, child_ns)
+            if len(self.pool) >= self._sweep_at:
+                self._sweep()
+            return next_config
+
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            super().delete_thread(thread_id)
+            for key in [key for key in self._versions if key[0] == thread_id]:
+                del self._versions[key]
+
+    def _drop_older(self, thread_id: str, checkpoint_ns: str, checkpoint):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        for checkpoint_id in [c for c in checkpoints if c != checkpoint["id"]]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        versions = dict(checkpoint["channel_versions"])
+        for channel, version in self._versions.get((thread_id, checkpoint_ns), {}).items():
+            if versions.get(channel) != version:
+                self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+        self._versions[(thread_id, checkpoint_ns)] = versions
+
+    def _drop_namespace(self, thread_id: str, checkpoint_ns: str):
+        for checkpoint_id in self.storage[thread_id].pop(checkpoint_ns):
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for channel, version in self._versions.pop((thread_id, checkpoint_ns), {}).items():
+            self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+
+    def _sweep(self):
+        """
+        Drop pool paragraphs no stored value references. Runs when the pool has doubled since the last sweep.
+        """
+        stored = [blob[1] for blob in self.blobs.values()]
+        stored += [write[2][1] for writes in self.writes.values() for write in writes.values()]
+        self.pool.retain(match.decode() for data in stored for match in _REF_BYTES.findall(data))
+        self._sweep_at = max(MIN_SWEEP_SIZE, 2 * len(self.pool))
+
+
+def transcript_dir() -> str:
+    load_config()
+    return os.getenv("SCRUM_TRANSCRIPT_DIR", "standup_transcripts")
+
+
+def spill_ticket_transcript(session_id: Optional[str], ticket_id: str, stages: dict):
+    """
+    Append a completed ticket's stage transcripts to the session's JSONL file.
+    """
+    record = {
+        "ticket_id": ticket_id,
+        "completed_at": time.time(),
+        "stages": {stage_id: messages_to_dict(stage.get("messages", [])) for stage_id, stage in stages.items() if stage.get("messages")},
+    }
+    directory = transcript_dir()
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{session_id or 'no-session'}.jsonl"), "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+def load_ticket_transcripts(session_id: str) -> List[dict]:
+    """
+    Transcripts spilled for a session, oldest first, with the messages restored.
+    """
+    path = os.path.join(transcript_dir(), f"{session_id}.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    for record in records:
+        record["stages"] = {stage_id: messages_from_dict(messages) for stage_id, messages in record["stages"].items()}
+    return records
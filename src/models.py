@@ -1,7 +1,9 @@
+import uuid
 from enum import Enum
-from typing import TypedDict, List, NotRequired, Annotated, Sequence, Union
+from typing import TypedDict, Dict, List, NotRequired, Annotated, Sequence, Union
 from langgraph.graph.message import add_messages
 from jira_service import Ticket
+from ticket_briefing import TicketBriefing
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
 class BotFlow(str, Enum):
@@ -35,6 +37,39 @@ class TicketProcessorAgentState(TypedDict):
     ticket_processing_messages: Annotated[Sequence, add_messages]
 
 
+def append_messages(left: Sequence, right: Sequence) -> list:
+    """
+    Reducer for message lists that only grow: nodes return just the messages they added.
+    A list that starts with the current first message (the state a subgraph hands back) is a snapshot,
+    and only its new tail is appended. Return Overwrite([...]) from langgraph.types to replace the list.
+    """
+    left = left or []
+    right = list(right or [])
+    if left and right and right[0].id is not None and right[0].id == left[0].id:
+        right = right[len(left):]
+    if not right:
+        return left
+    for message in right:
+        # Ids make snapshots recognisable after a checkpoint round-trip
+        if message.id is None:
+            message.id = str(uuid.uuid4())
+    return [*left, *right]
+
+
+def merge_stages(left: dict, right: dict) -> dict:
+    """
+    Reducer for ticket_processing_stages. Updates look like {stage_id: {changed fields..., "messages": new messages}};
+    only the stages named in the update are copied.
+    """
+    merged = dict(left or {})
+    for stage_id, update in right.items():
+        stage = dict(merged.get(stage_id, {}))
+        for key, value in update.items():
+            stage[key] = append_messages(stage.get("messages"), value) if key == "messages" else value
+        merged[stage_id] = stage
+    return merged
+
+
 class TicketProcessorPhase(str, Enum):
     NOT_STARTED = "ticket_processor_not_started"
     IN_PROGRESS = "ticket_processor_in_progress"
@@ -48,15 +83,19 @@ class TicketProcessorStage(TypedDict):
     prompt: str
     phase: TicketProcessorPhase
     next_stage_id: NotRequired[int]  # ID of the next stage to proceed to
-    messages: Annotated[Sequence, add_messages]
+    messages: Annotated[Sequence, append_messages]
+    started_at: NotRequired[float]  # Unix time the stage started
+    completed_at: NotRequired[float]  # Unix time the stage proceeded or ended the conversation
 
 class ScrumAgentTicketProcessorState(TypedDict):
     main_bot_phase: MainBotPhase
     recently_processed_ticket_ids: NotRequired[List[str]]
     current_ticket: Ticket
-    main_bot_messages: Annotated[Sequence, add_messages]
+    main_bot_messages: Annotated[Sequence, append_messages]
+    main_bot_ticket_snapshot: NotRequired[Dict[str, str]]  # Ticket id -> hash of the index row in main_bot's system prompt
+    ticket_briefings: NotRequired[Dict[str, TicketBriefing]]  # From the pre-analysis at session start
     ticket_processing_current_stage: int
-    ticket_processing_stages: List[TicketProcessorStage]
+    ticket_processing_stages: Annotated[Dict[str, TicketProcessorStage], merge_stages]
 
 def ticket_processor_initial_stages() -> ScrumAgentTicketProcessorState:
     return {
@@ -0,0 +1,326 @@
+"""
+Structured log of standup outcomes for team analytics.
+
+One record per discussed ticket is written when ticket processing ends. Records are appended
+to a small JSONL staging file and compacted into Parquet files partitioned by month
+(<SCRUM_OUTCOME_DIR>/month=YYYY-MM/part-*.parquet). Queries read only the columns and months they need.
+
+    python3 src/outcome_log.py report --by team,month [--since 2026-01-01] [--until 2026-03-31] [--team APP]
+    python3 src/outcome_log.py compact
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, TypedDict
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Records are still staged as JSONL; compaction and queries need pyarrow
+    pa = None
+
+from models import ScrumAgentTicketProcessorState
+from config import load_config
+
+OUTCOME_STAGES = ["basic_info", "previous_progress_made", "plan_for_the_day", "blocker_check", "due_date_check", "confirm_summary", "additional_help"]
+COMPACT_EVERY = 500  # Staged records per Parquet file
+
+NO_BLOCKER = re.compile(
+    r"^\s*(no|none|nope|nothing|all good|not really)\b|\b(no|not|nothing|none|zero|without)\b[\w\s,']{0,20}\b(block\w*|impediments?|issues?|problems?)",
+    re.IGNORECASE,
+)
+BLOCKER = re.compile(r"\b(block\w*|stuck|waiting (on|for)|depend\w* on|can'?t|cannot|impediments?)\b", re.IGNORECASE)
+
+
+class StandupOutcome(TypedDict):
+    outcome_id: str
+    session_id: Optional[str]
+    team: str
+    user: Optional[str]
+    ticket_id: str
+    date: str  # YYYY-MM-DD
+    recorded_at: datetime
+    status: Optional[str]  # Status when the ticket was discussed
+    status_transition_ids: List[str]  # Transitions applied during the standup
+    has_blocker: bool
+    previous_progress: str
+    plan_for_the_day: str
+    blocker_answer: str
+    start_date_before: Optional[str]
+    start_date_after: Optional[str]
+    due_date_before: Optional[str]
+    due_date_after: Optional[str]
+    due_date_changed: bool
+    duration_s: float
+    stage_durations_s: Dict[str, Optional[float]]
+    user_turns: int
+    summary: str
+    completed: bool  # False if the user ended the conversation before the last stage
+
+
+def _schema():
+    return pa.schema([
+        ("outcome_id", pa.string()),
+        ("session_id", pa.string()),
+        ("team", pa.string()),
+        ("user", pa.string()),
+        ("ticket_id", pa.string()),
+        ("date", pa.string()),
+        ("recorded_at", pa.timestamp("s", tz="UTC")),
+        ("status", pa.string()),
+        ("status_transition_ids", pa.list_(pa.string())),
+        ("has_blocker", pa.bool_()),
+        ("previous_progress", pa.string()),
+        ("plan_for_the_day", pa.string()),
+        ("blocker_answer", pa.string()),
+        ("start_date_before", pa.string()),
+        ("start_date_after", pa.string()),
+        ("due_date_before", pa.string()),
+        ("due_date_after", pa.string()),
+        ("due_date_changed", pa.bool_()),
+        ("duration_s", pa.float64()),
+        ("stage_durations_s", pa.struct([(stage, pa.float64()) for stage in OUTCOME_STAGES])),
+        ("user_turns", pa.int32()),
+        ("summary", pa.string()),
+        ("completed", pa.bool_()),
+    ])
+
+
+def _dataset_schema():
+    # Records as read back: the month partition key is a column too
+    return _schema().append(pa.field("month", pa.string()))
+
+
+def _user_answers(stage: dict) -> List[str]:
+    return [m.content for m in stage.get("messages", []) if m.type == "human"]
+
+
+def _tool_calls(stages: dict, name: str) -> List[dict]:
+    return [
+        call["args"]
+        for stage in stages.values() for m in stage.get("messages", [])
+        for call in (getattr(m, "tool_calls", None) or []) if call["name"] == name
+    ]
+
+
+def reported_blocker(answers: List[str]) -> bool:
+    return any(BLOCKER.search(answer) and not NO_BLOCKER.search(answer) for answer in answers)
+
+
+def outcome_from_state(state: ScrumAgentTicketProcessorState, session_id: Optional[str] = None) -> StandupOutcome:
+    """
+    Build the outcome record of the ticket that was just discussed.
+    """
+    now = time.time()
+    stages = state["ticket_processing_stages"]
+    ticket = state["current_ticket"]
+    started_at = stages["basic_info"].get("started_at") or now
+
+    date_updates = _tool_calls(stages, "update_ticket_dates")
+    start_date_after, due_date_after = ticket.get("start_date"), ticket.get("due_date")
+    for args in date_updates:
+        start_date_after = args.get("start_date") or start_date_after
+        due_date_after = args.get("end_date") or due_date_after
+
+    blocker_answers = _user_answers(stages["blocker_check"])
+    return {
+        "outcome_id": str(uuid.uuid4()),
+        "session_id": session_id,
+        "team": os.getenv("SCRUM_TEAM") or ticket["id"].split("-")[0],
+        "user": os.getenv("CURRENT_USER_EMAIL"),
+        "ticket_id": ticket["id"],
+        "date": datetime.fromtimestamp(started_at).date().isoformat(),
+        "recorded_at": datetime.fromtimestamp(now, timezone.utc),
+        "status": ticket.get("status"),
+        "status_transition_ids": [str(args.get("transition_id")) for args in _tool_calls(stages, "update_status")],
+        "has_blocker": reported_blocker(blocker_answers),
+        "previous_progress": "\n".join(_user_answers(stages["previous_progress_made"])),
+        "plan_for_the_day": "\n".join(_user_answers(stages["plan_for_the_day"])),
+        "blocker_answer": "\n".join(blocker_answers),
+        "start_date_before": ticket.get("start_date"),
+        "start_date_after": start_date_after,
+        "due_date_before": ticket.get("due_date"),
+        "due_date_after": due_date_after,
+        "due_date_changed": due_date_after != ticket.get("due_date"),
+        "duration_s": now - started_at,
+        "stage_durations_s": {
+            stage: (stages[stage]["completed_at"] - stages[stage]["started_at"])
+            if stages[stage].get("started_at") and stages[stage].get("completed_at") else None
+            for stage in OUTCOME_STAGES
+        },
+        "user_turns": sum(len(_user_answers(stages[stage])) for stage in OUTCOME_STAGES),
+        "summary": stages["summarize_conversation"].get("summary", ""),
+        "completed": stages["additional_help"].get("completed_at") is not None,
+    }
+
+
+class OutcomeLog:
+    _instance = None
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.staging_path = os.path.join(directory, "staging.jsonl")
+        self._staged = None  # Records in the staging file, counted on first use
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if OutcomeLog._instance is None:
+            load_config()
+            OutcomeLog._instance = OutcomeLog(os.getenv("SCRUM_OUTCOME_DIR", "standup_outcomes"))
+        return OutcomeLog._instance
+
+    def append(self, outcome: StandupOutcome):
+        record = dict(outcome, recorded_at=outcome["recorded_at"].isoformat())
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._staged is None:
+                self._staged = self._count_staged()
+            with open(self.staging_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            self._staged += 1
+            should_compact = pa is not None and self._staged >= COMPACT_EVERY
+        if should_compact:
+            self.compact()
+
+    def _count_staged(self) -> int:
+        if not os.path.exists(self.staging_path):
+            return 0
+        with open(self.staging_path) as f:
+            return sum(1 for line in f if line.strip())
+
+    def _staged_table(self):
+        if not os.path.exists(self.staging_path):
+            return _schema().empty_table()
+        with open(self.staging_path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for row in rows:
+            row["recorded_at"] = datetime.fromisoformat(row["recorded_at"])
+        return pa.Table.from_pylist(rows, schema=_schema())
+
+    def write_table(self, table):
+        """
+        Write records straight to Parquet, one new file per month (also used for backfills).
+        """
+        months = pc.utf8_slice_codeunits(table["date"], 0, 7)
+        for month in pc.unique(months).to_pylist():
+            part_dir = os.path.join(self.directory, f"month={month}")
+            os.makedirs(part_dir, exist_ok=True)
+            pq.write_table(table.filter(pc.equal(months, month)), os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet"))
+
+    def compact(self) -> int:
+        """
+        Move staged records into Parquet. Returns the number of records moved.
+        """
+        with self._lock:
+            table = self._staged_table()
+            if table.num_rows:
+                self.write_table(table)
+                os.remove(self.staging_path)
+            self._staged = 0
+            return table.num_rows
+
+    def _has_parquet(self) -> bool:
+        return os.path.isdir(self.directory) and any(name.startswith("month=") for name in os.listdir(self.directory))
+
+    def read(self, columns: List[str], since: Optional[str] = None, until: Optional[str] = None, team: Optional[str] = None):
+        """
+        Read the given columns of all records in the inclusive date range [since, until], staged ones included.
+        """
+        conditions = []
+        if since:
+            # The month condition prunes whole partitions before any file is opened
+            conditions += [ds.field("month") >= since[:7], ds.field("date") >= since]
+        if until:
+            conditions += [ds.field("month") <= until[:7], ds.field("date") <= until]
+        if team:
+            conditions.append(ds.field("team") == team)
+        condition = None
+        for c in conditions:
+            condition = c if condition is None else condition & c
+
+        tables = []
+        if self._has_parquet():
+            dataset = ds.dataset(self.directory, format="parquet", partitioning="hive", schema=_dataset_schema())
+            tables.append(dataset.to_table(columns=columns, filter=condition))
+        staged = self._staged_table()
+        if staged.num_rows:
+            staged = staged.append_column("month", pc.utf8_slice_codeunits(staged["date"], 0, 7))
+            tables.append(ds.dataset(staged).to_table(columns=columns, filter=condition))
+
+        if not tables:
+            return _dataset_schema().empty_table().select(columns)
+        return pa.concat_tables(tables)
+
+
+GROUP_COLUMNS = {"team", "user", "ticket_id", "month", "date"}
+
+
+def report(by: List[str], since: Optional[str] = None, until: Optional[str] = None, team: Optional[str] = None):
+    """
+    Standups, blockers, due date changes, status changes and average minutes per group.
+    """
+    unknown = set(by) - GROUP_COLUMNS
+    if unknown:
+        raise ValueError(f"Cannot group by {', '.join(sorted(unknown))}; choose from {', '.join(sorted(GROUP_COLUMNS))}")
+    columns = list(dict.fromkeys(by + ["outcome_id", "has_blocker", "due_date_changed", "status_transition_ids", "duration_s"]))
+    table = OutcomeLog.get_instance().read(columns, since, until, team)
+    table = table.append_column("status_changes", pc.list_value_length(table["status_transition_ids"]).fill_null(0))
+    grouped = table.group_by(by).aggregate([
+        ("outcome_id", "count"),
+        ("has_blocker", "sum"),
+        ("due_date_changed", "sum"),
+        ("status_changes", "sum"),
+        ("duration_s", "mean"),
+    ])
+    names = {
+        "outcome_id_count": "standups",
+        "has_blocker_sum": "blockers",
+        "due_date_changed_sum": "due_date_changes",
+        "status_changes_sum": "status_changes",
+        "duration_s_mean": "avg_duration_s",
+    }
+    grouped = grouped.rename_columns([names.get(name, name) for name in grouped.column_names])
+    return grouped.select(by + list(names.values())).sort_by([(c, "ascending") for c in by])
+
+
+def print_report(table):
+    by = table.column_names[:-5]
+    print("".join(f"{c:<16}" for c in by) + f"{'standups':>10}{'blockers':>10}{'due chg':>9}{'status chg':>12}{'avg min':>9}")
+    for row in table.to_pylist():
+        print(
+            "".join(f"{str(row[c]):<16}" for c in by)
+            + f"{row['standups']:>10}{row['blockers'] or 0:>10}{row['due_date_changes'] or 0:>9}"
+            + f"{row['status_changes'] or 0:>12}{(row['avg_duration_s'] or 0) / 60:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    if pa is None:
+        print("pyarrow is required: pip install pyarrow")
+        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Query the standup outcome log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report")
+    report_parser.add_argument("--by", default="team,month", help="Comma-separated: " + ", ".join(sorted(GROUP_COLUMNS)))
+    report_parser.add_argument("--since", help="YYYY-MM-DD")
+    report_parser.add_argument("--until", help="YYYY-MM-DD")
+    report_parser.add_argument("--team")
+    commands.add_parser("compact")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        print(f"Compacted {OutcomeLog.get_instance().compact()} records")
+    else:
+        start = time.perf_counter()
+        result = report(args.by.split(","), args.since, args.until, args.team)
+        print_report(result)
+        print(f"\n{result.num_rows} groups in {(time.perf_counter() - start) * 1000:.0f} ms")
@@ -0,0 +1,158 @@
+"""
+Per-session profile of where a standup's wall time goes. Enabled by setting SCRUM_PROFILE_DIR.
+
+Graph nodes, LLM calls, Jira requests, tool calls and the wait for the user's input are timed as nested frames.
+A frame's self time (its time minus the frames nested in it) counts toward its category:
+  human      waiting for the user to type
+  llm        LLM calls, including rate-limit waits, hedges and escalations
+  jira       Jira requests, including retries and rate-limit waits
+  tool       tool execution, minus the Jira calls it makes
+  node       the nodes' own code (prompts, parsing, state updates)
+  framework  LangGraph around the nodes: routing, reducers, checkpoints
+Work at background priority (rolling summaries, cache refreshes) is off the critical path and reported separately.
+When the session ends a table is printed and <SCRUM_PROFILE_DIR>/<session>.folded is written:
+a folded-stack file for flamegraph.pl or speedscope, in microseconds.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from config import load_config
+from scheduler import Priority, current_priority
+from tracing import current_session
+
+CATEGORIES = ["human", "llm", "jira", "tool", "node", "framework"]
+BACKGROUND = "background"
+
+Path = Tuple[str, ...]
+
+
+class _Frame:
+    def __init__(self, path: Path):
+        self.path = path
+        self.child_s = 0.0
+        self.open = True
+
+
+_frame: ContextVar[Optional[_Frame]] = ContextVar("profile_frame", default=None)
+_profiles: Dict[str, "SessionProfile"] = {}
+
+
+def profile_dir() -> Optional[str]:
+    load_config()
+    return os.getenv("SCRUM_PROFILE_DIR") or None
+
+
+class SessionProfile:
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.self_s: Dict[Path, float] = defaultdict(float)
+        self.calls: Dict[Path, int] = defaultdict(int)
+        self.category: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def close(self, frame: _Frame, category: str, elapsed: float, parent: Optional[_Frame]):
+        """
+        Record a finished frame's self time and count its time as nested in its parent's.
+        """
+        with self._lock:
+            frame.open = False
+            self.self_s[frame.path] += max(0.0, elapsed - frame.child_s)
+            self.calls[frame.path] += 1
+            self.category[frame.path] = category
+            if parent is not None and parent.open:
+                parent.child_s += elapsed
+
+    def totals(self) -> Dict[str, float]:
+        totals = dict.fromkeys(CATEGORIES + [BACKGROUND], 0.0)
+        for path, seconds in self.self_s.items():
+            totals[BACKGROUND if path[0] == BACKGROUND else self.category[path]] += seconds
+        return totals
+
+    def node_rows(self) -> Dict[str, Dict[str, float]]:
+        """
+        Seconds per category spent inside each node, with the node's call count under "calls".
+        """
+        rows: Dict[str, Dict[str, float]] = {}
+        for path, seconds in self.self_s.items():
+            node = next((p for p, frame in zip(path, self._prefixes(path)) if self.category.get(frame) == "node"), None)
+            if node is None or path[0] == BACKGROUND:
+                continue
+            row = rows.setdefault(node, dict.fromkeys(["calls"] + CATEGORIES, 0.0))
+            row[self.category[path]] += seconds
+            if self.category[path] == "node":
+                row["calls"] += self.calls[path]
+        return rows
+
+    @staticmethod
+    def _prefixes(path: Path) -> List[Path]:
+        return [path[:i + 1] for i in range(len(path))]
+
+    def report(self) -> List[str]:
+        totals = self.totals()
+        wall = sum(totals[c] for c in CATEGORIES) or 1e-9
+        lines = [f"Session profile: {wall:.1f} s"]
+        lines += [f"   {c:<10}{totals[c]:>9.2f} s {100 * totals[c] / wall:>5.1f}%" for c in CATEGORIES]
+        lines.append(f"   {BACKGROUND:<10}{totals[BACKGROUND]:>9.2f} s  (not in the total)")
+        lines.append(f"   {'node':<40}{'calls':>6}" + "".join(f"{c + ' ms':>10}" for c in ["llm", "jira", "tool", "own"]))
+        rows = self.node_rows()
+        for node in sorted(rows, key=lambda n: -sum(rows[n][c] for c in CATEGORIES)):
+            row = rows[node]
+            lines.append(f"   {node:<40}{row['calls']:>6.0f}" + "".join(f"{1000 * row[c]:>10.0f}" for c in ["llm", "jira", "tool", "node"]))
+        return lines
+
+    def folded(self) -> List[str]:
+        return [f"{';'.join(path)} {round(seconds * 1e6)}" for path, seconds in sorted(self.self_s.items()) if seconds > 0]
+
+
+def start_profile(session_id: str) -> Optional[SessionProfile]:
+    if not profile_dir():
+        return None
+    _profiles[session_id] = SessionProfile(session_id)
+    return _profiles[session_id]
+
+
+def finish_profile(session_id: str) -> Optional[SessionProfile]:
+    """
+    Stop profiling the session, print its table and write its folded stacks.
+    """
+    profile = _profiles.pop(session_id, None)
+    if profile is None:
+        return None
+    print("\n⏱️ " + "\n".join(profile.report()))
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{session_id}.folded")
+    with open(path, "w") as f:
+        f.write("\n".join(profile.folded()) + "\n")
+    print(f"   Folded stacks: {path}")
+    return profile
+
+
+@contextmanager
+def profiled(category: str, name: str):
+    """
+    Time the enclosed block as a frame of the current session's profile; a no-op when it is not being profiled.
+    """
+    profile = _profiles.get(current_session()) if _profiles else None
+    if profile is None:
+        yield
+        return
+    parent = _frame.get()
+    label = name if category == "node" else f"{category}:{name}"
+    if current_priority() == Priority.BACKGROUND and not (parent and parent.path[0] == BACKGROUND):
+        parent = None
+        parent_path = (BACKGROUND,)
+    else:
+        parent_path = parent.path if parent else ()
+    frame = _Frame(parent_path + (label,))
+    token = _frame.set(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _frame.reset(token)
+        profile.close(frame, category, time.perf_counter() - start, parent)
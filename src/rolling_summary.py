@@ -0,0 +1,68 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from langchain_core.messages import SystemMessage
+from models import ScrumAgentTicketProcessorState
+from prompts import SUMMARY_STAGES, format_stage_transcript, rolling_summary_update_prompt
+from tracing import current_session
+from scheduler import background_priority
+
+# Summary updates run here while the next stage talks to the user
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rolling-summary")
+_summaries: Dict[Tuple[Optional[str], str], Future] = {}
+_lock = threading.Lock()
+
+
+def _key(state: ScrumAgentTicketProcessorState) -> Tuple[Optional[str], str]:
+    return (current_session(), state["current_ticket"]["id"])
+
+
+def stage_completed(state: ScrumAgentTicketProcessorState, stage_id: str, new_messages=()):
+    """
+    Fold the transcript of a completed stage into the ticket's rolling summary in the background.
+    new_messages are the stage's messages from the current turn, not yet merged into `state`.
+    Updates for one ticket are chained so each one starts from the previous summary.
+    """
+    if stage_id not in SUMMARY_STAGES:
+        return
+    transcript = format_stage_transcript([*state["ticket_processing_stages"][stage_id].get("messages", []), *new_messages])
+    if not transcript:
+        return
+
+    # Resolved lazily to avoid building chat models at import time
+    from llm_config import stage_llm
+    llm = stage_llm("summarize_conversation")
+
+    key = _key(state)
+    with _lock:
+        previous = _summaries.get(key)
+
+        def update() -> str:
+            previous_summary = previous.result() if previous else ""
+            prompt = rolling_summary_update_prompt(previous_summary, stage_id, transcript)
+            with background_priority():
+                return llm.invoke([SystemMessage(content=prompt)]).content.strip()
+
+        context = contextvars.copy_context()
+        _summaries[key] = _executor.submit(context.run, update)
+
+
+def current_summary(state: ScrumAgentTicketProcessorState, timeout: float = None) -> Optional[str]:
+    """
+    Wait for pending updates and return the rolling summary, or None if there is none
+    (or it failed), in which case the caller summarizes the full conversation.
+    """
+    with _lock:
+        future = _summaries.get(_key(state))
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=timeout) or None
+    except Exception:
+        return None
+
+
+def discard(state: ScrumAgentTicketProcessorState):
+    with _lock:
+        _summaries.pop(_key(state), None)
@@ -0,0 +1,170 @@
+"""
+Process-wide scheduler for calls to rate-limited backends (Jira, OpenAI).
+
+Each backend has a token bucket. Callers wait for capacity with `Scheduler.get_instance().acquire(backend, cost)`.
+When several callers are waiting, interactive calls go before background work (prefetch, refreshes,
+queued write flushes, rolling summaries). Within a priority, the session that was served least
+recently goes first, so one busy standup cannot starve the others.
+"""
+import itertools
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+from tracing import Tracer, current_session
+from config import load_config
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar("scheduler_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+@contextmanager
+def background_priority():
+    """
+    Run the enclosed backend calls at background priority.
+    """
+    token = _current_priority.set(Priority.BACKGROUND)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def seconds_until(self, cost: float) -> float:
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def take(self, cost: float):
+        self._refill()
+        self.tokens -= cost
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    last_served: int
+    seq: int
+    session: Optional[str] = field(compare=False)
+    cost: float = field(compare=False)
+
+
+class _Backend:
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.waiting: List[_Waiter] = []
+        self.last_served: Dict[Optional[str], int] = defaultdict(int)
+        self.served = 0
+        self.max_queue_depth = 0
+        self.wait_times_ms = deque(maxlen=5000)
+
+
+class Scheduler:
+    _instance = None
+
+    def __init__(self, limits: Dict[str, tuple]):
+        """
+        limits maps a backend name to (tokens per second, burst capacity).
+        """
+        self._backends = {name: _Backend(TokenBucket(rate, capacity)) for name, (rate, capacity) in limits.items()}
+        self._condition = threading.Condition()
+        self._seq = itertools.count()
+
+    @staticmethod
+    def get_instance():
+        if Scheduler._instance is None:
+            load_config()
+            jira_rate = float(os.getenv("JIRA_REQUESTS_PER_SECOND", "10"))
+            openai_tpm = float(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000"))
+            Scheduler._instance = Scheduler({
+                "jira": (jira_rate, jira_rate * 2),
+                "openai": (openai_tpm / 60, openai_tpm / 6),  # Allow bursts of 10 seconds' worth of tokens
+            })
+        return Scheduler._instance
+
+    def acquire(self, backend_name: str, cost: float = 1.0):
+        """
+        Block until the backend has capacity for `cost` and this caller is next in line.
+        """
+        backend = self._backends[backend_name]
+        cost = min(cost, backend.bucket.capacity)
+        session = current_session()
+        priority = _current_priority.get()
+        start = time.perf_counter()
+        with self._condition:
+            waiter = _Waiter(priority, backend.last_served[session], next(self._seq), session, cost)
+            backend.waiting.append(waiter)
+            backend.max_queue_depth = max(backend.max_queue_depth, len(backend.waiting))
+            queue_depth = len(backend.waiting)
+            while True:
+                if min(backend.waiting) is waiter:
+                    wait = backend.bucket.seconds_until(cost)
+                    if wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait)
+                else:
+                    self._condition.wait(timeout=1.0)
+            backend.bucket.take(cost)
+            backend.waiting.remove(waiter)
+            backend.served += 1
+            backend.last_served[session] = backend.served
+            self._condition.notify_all()
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        backend.wait_times_ms.append(wait_ms)
+        tracer = Tracer.get_instance()
+        span = tracer.start_span("scheduler", backend_name, priority=priority.name.lower(), queue_depth=queue_depth, cost=cost)
+        span["latency_ms"] = wait_ms
+        tracer.record(span)
+
+    def metrics(self) -> Dict[str, dict]:
+        """
+        Queue depth and wait-time percentiles per backend.
+        """
+        result = {}
+        with self._condition:
+            for name, backend in self._backends.items():
+                waits = sorted(backend.wait_times_ms)
+                result[name] = {
+                    "queue_depth": len(backend.waiting),
+                    "max_queue_depth": backend.max_queue_depth,
+                    "served": backend.served,
+                    "wait_ms_p50": statistics.median(waits) if waits else 0.0,
+                    "wait_ms_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_ms_max": waits[-1] if waits else 0.0,
+                }
+        return result
+
+    def print_metrics(self):
+        print("\n📊 Scheduler:")
+        for name, m in self.metrics().items():
+            print(
+                f"   {name}: {m['served']} calls, queue depth {m['queue_depth']} (max {m['max_queue_depth']}), "
+                f"wait p50 {m['wait_ms_p50']:.0f} ms, p95 {m['wait_ms_p95']:.0f} ms, max {m['wait_ms_max']:.0f} ms"
+            )
@@ -0,0 +1,40 @@
+"""
+Turn-based driver for the scrum graph.
+
+Each call runs the graph for one session until it needs the user's next message (an interrupt raised
+by helpers.ask_user), then returns the prompt to show. Nothing waits for the human in between:
+the session lives in the checkpointer under its thread id, so any worker sharing the checkpointer
+can run the next turn. The graph is compiled with an in-memory checkpointer; to spread sessions
+over several processes, compile it with a shared one (e.g. langgraph-checkpoint-postgres).
+"""
+from typing import Optional
+from langgraph.types import Command
+from tracing import set_session
+from profiler import profiled
+
+
+def session_config(session_id: str) -> dict:
+    return {"configurable": {"thread_id": session_id}}
+
+
+def _pending_prompt(result: dict) -> Optional[str]:
+    interrupts = result.get("__interrupt__")
+    return interrupts[0].value["prompt"] if interrupts else None
+
+
+def start_session(app, session_id: str, initial_state: dict) -> Optional[str]:
+    """
+    Run the opening turn. Returns the prompt for the user's reply, or None if the conversation ended.
+    """
+    set_session(session_id)
+    with profiled("framework", "langgraph"):
+        return _pending_prompt(app.invoke(initial_state, session_config(session_id)))
+
+
+def resume_session(app, session_id: str, user_input: str) -> Optional[str]:
+    """
+    Run the next turn with the user's message. Returns the next prompt, or None if the conversation ended.
+    """
+    set_session(session_id)
+    with profiled("framework", "langgraph"):
+        return _pending_prompt(app.invoke(Command(resume=user_input), session_config(session_id)))
@@ -0,0 +1,270 @@
+"""
+Nightly standup briefs: everything a session needs before the user's first answer, precomputed per user.
+
+A brief holds the user's tickets in the order they are shown and, per ticket, a digest of the comments since
+the last standup, the due-date risk and questions to ask. main_bot starts from a fresh brief instead of searching
+Jira and fetching every ticket's comments, and the stage prompts of the chosen ticket include its digest and questions.
+
+The LLM digests run in a process pool. Tickets whose `updated` timestamp has not changed since the previous
+brief are carried over without a Jira or LLM call. Briefs are stored in <SCRUM_BRIEF_DIR>/<user>.json and are
+used for SCRUM_BRIEF_MAX_AGE_HOURS after they are built; schedule the build nightly, e.g. with cron:
+
+    python3 src/standup_briefs.py build --users alice@example.com,bob@example.com
+    python3 src/standup_briefs.py show alice@example.com
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple, TypedDict
+import requests
+from config import load_config, TICKET_PROJECT_KEY
+from jira_service import Comment, JiraService, Ticket
+from standup_history import StandupHistory
+from ticket_briefing import MAX_WORKERS as JIRA_WORKERS, RECENT_COMMENTS, TicketBriefing, brief_ticket
+from ticket_renderer import sort_tickets
+
+BRIEF_VERSION = 1
+BRIEF_STAGE = "standup_brief"  # STAGE_LLM_CONFIG entry for the digests
+DIGEST_COMMENTS = 20  # Newest comments read per changed ticket
+MAX_QUESTIONS = 3
+MAX_WORKERS = 4
+DUE_DATE_FLAGS = ["overdue", "due_soon", "missing_due_date"]
+
+
+class TicketBrief(TypedDict):
+    ticket_id: str
+    updated: Optional[str]  # The ticket's `updated` when it was briefed; None to brief it again next time
+    comments: Optional[List[Comment]]  # The RECENT_COMMENTS newest, to recompute the briefing on the day
+    due_date_risk: Optional[str]  # overdue, due_soon or missing_due_date on the day the brief was built
+    comment_digest: str
+    suggested_questions: List[str]
+
+
+class StandupBrief(TypedDict):
+    version: int
+    user: str
+    project_key: Optional[str]
+    built_at: float
+    tickets: List[Ticket]  # In the order the ticket list is shown
+    briefs: Dict[str, TicketBrief]
+
+
+class BuildReport(TypedDict):
+    user: str
+    tickets: int
+    reused: int  # Unchanged since the previous brief
+    digested: int  # Sent to the LLM
+    failed: int  # Digest failed; briefed again on the next build
+
+
+def brief_dir() -> str:
+    load_config()
+    return os.getenv("SCRUM_BRIEF_DIR", "standup_briefs")
+
+
+def max_age_hours() -> float:
+    load_config()
+    return float(os.getenv("SCRUM_BRIEF_MAX_AGE_HOURS", "18"))
+
+
+def brief_path(user: str) -> str:
+    return os.path.join(brief_dir(), re.sub(r"[^\w.@-]", "_", user) + ".json")
+
+
+def load_brief(user: Optional[str], max_age_h: Optional[float] = None) -> Optional[StandupBrief]:
+    """
+    The user's stored brief, or None if there is none for the current project or it is older than max_age_h
+    (SCRUM_BRIEF_MAX_AGE_HOURS by default; pass float("inf") for any age).
+    """
+    if not user:
+        return None
+    try:
+        with open(brief_path(user)) as f:
+            brief = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if brief.get("version") != BRIEF_VERSION or brief.get("project_key") != TICKET_PROJECT_KEY:
+        return None
+    if time.time() - brief.get("built_at", 0) > 3600 * (max_age_hours() if max_age_h is None else max_age_h):
+        return None
+    return brief
+
+
+def save_brief(brief: StandupBrief):
+    directory = os.path.dirname(os.path.abspath(brief_path(brief["user"])))
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file and rename, so a session starting mid-build never reads half a brief
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".brief.")
+    with os.fdopen(fd, "w") as f:
+        json.dump(brief, f)
+    os.replace(temporary, brief_path(brief["user"]))
+
+
+def session_briefings(brief: StandupBrief, user_email: Optional[str] = None,
+                      own_account_id: Optional[str] = None) -> Dict[str, TicketBriefing]:
+    """
+    Briefings for main_bot from a stored brief. The checks are rerun for today from the stored comments,
+    and the digest and suggested questions are added.
+    """
+    briefings = {}
+    for ticket in brief["tickets"]:
+        entry = brief["briefs"].get(ticket["id"])
+        if entry is None:
+            continue
+        briefing = brief_ticket(ticket, entry["comments"], user_email, own_account_id)
+        if entry["comment_digest"]:
+            briefing["notes"].append(f"Comments since the last standup: {entry['comment_digest']}")
+        if entry["suggested_questions"]:
+            briefing["suggested_questions"] = entry["suggested_questions"]
+        briefings[ticket["id"]] = briefing
+    return briefings
+
+
+def _init_worker(workers: int):
+    """
+    Runs once in each pool process. The processes share the OpenAI token budget, and clients
+    inherited from the parent process (connection pools, executor threads) are not reused.
+    """
+    import llm_config
+    from llm_client import HedgedLLMClient
+    from scheduler import Scheduler
+    load_config()
+    os.environ["OPENAI_TOKENS_PER_MINUTE"] = str(float(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000")) / workers)
+    Scheduler._instance = None
+    HedgedLLMClient._instance = None
+    llm_config._stage_llms.clear()
+
+
+def digest_ticket(ticket: Ticket, comments: List[Comment], notes: List[str]) -> Tuple[str, List[str]]:
+    """
+    Comment digest and suggested questions for one ticket. Runs in a pool process.
+    """
+    import llm_config
+    from langchain_core.messages import SystemMessage
+    from prompts import standup_brief_digest_prompt
+    response = llm_config.stage_llm(BRIEF_STAGE).invoke([SystemMessage(content=standup_brief_digest_prompt(ticket, comments, notes))])
+    result = json.loads(response.content)  # Like a missed deadline, malformed output raises and the ticket is retried next build
+    return str(result.get("digest") or "").strip(), [str(q) for q in result.get("questions") or []][:MAX_QUESTIONS]
+
+
+def _due_date_risk(briefing: TicketBriefing) -> Optional[str]:
+    return next((flag for flag in briefing["flags"] if flag in DUE_DATE_FLAGS), None)
+
+
+def _last_standup(ticket_id: str) -> Optional[str]:
+    latest = StandupHistory.get_instance().latest(ticket_id)
+    return latest["date"] if latest else None
+
+
+def build_briefs(users: List[str], project_key: Optional[str] = TICKET_PROJECT_KEY,
+                 workers: int = MAX_WORKERS) -> List[BuildReport]:
+    """
+    Build and store the brief of every user. Jira is read on threads of this process while the pool digests;
+    a user whose tickets cannot be loaded keeps their previous brief.
+    """
+    service = JiraService.get_instance()
+    today = date.today()
+    pending: List[Tuple[StandupBrief, BuildReport, Dict[str, Future]]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool, \
+            ThreadPoolExecutor(max_workers=JIRA_WORKERS, thread_name_prefix="brief-jira") as jira_pool:
+        # Fork the workers before this process starts any threads, so none is forked holding a lock
+        pool.submit(os.getpid).result()
+        for user in users:
+            try:
+                tickets = sort_tickets(service.fetch_user_tickets(user, project_key))
+            except requests.RequestException as e:  # Includes JiraUnavailableError
+                print(f"\n⚠️ Could not load the tickets of {user}, keeping their previous brief: {e}")
+                continue
+            previous = load_brief(user, float("inf"))
+            previous_briefs = previous["briefs"] if previous else {}
+            brief: StandupBrief = {"version": BRIEF_VERSION, "user": user, "project_key": project_key,
+                                   "built_at": time.time(), "tickets": tickets, "briefs": {}}
+            report: BuildReport = {"user": user, "tickets": len(tickets), "reused": 0, "digested": 0, "failed": 0}
+            changed = []
+            for ticket in tickets:
+                old = previous_briefs.get(ticket["id"])
+                if old and old["updated"] and old["updated"] == ticket.get("updated"):
+                    briefing = brief_ticket(ticket, old["comments"], user, today=today)
+                    brief["briefs"][ticket["id"]] = {**old, "due_date_risk": _due_date_risk(briefing)}
+                    report["reused"] += 1
+                else:
+                    changed.append(ticket)
+            comment_fetches = {t["id"]: jira_pool.submit(service.fetch_ticket_comments, t["id"], DIGEST_COMMENTS) for t in changed}
+            digests: Dict[str, Future] = {}
+            for ticket in changed:
+                try:
+                    comments = comment_fetches[ticket["id"]].result()
+                except requests.RequestException:  # Includes JiraUnavailableError
+                    comments = None
+                briefing = brief_ticket(ticket, comments, user, today=today)
+                brief["briefs"][ticket["id"]] = {
+                    "ticket_id": ticket["id"],
+                    "updated": ticket.get("updated") if comments is not None else None,
+                    "comments": comments[:RECENT_COMMENTS] if comments is not None else None,
+                    "due_date_risk": _due_date_risk(briefing),
+                    "comment_digest": "",
+                    "suggested_questions": [],
+                }
+                last_standup = _last_standup(ticket["id"])
+                new_comments = [c for c in comments or [] if not last_standup or c["created"][:10] >= last_standup]
+                if new_comments or briefing["flags"]:
+                    digests[ticket["id"]] = pool.submit(digest_ticket, ticket, new_comments, briefing["notes"])
+            pending.append((brief, report, digests))
+
+        for brief, report, digests in pending:
+            for ticket_id, future in digests.items():
+                entry = brief["briefs"][ticket_id]
+                try:
+                    entry["comment_digest"], entry["suggested_questions"] = future.result()
+                    report["digested"] += 1
+                except Exception as e:
+                    print(f"\n⚠️ Could not digest {ticket_id} for {brief['user']}: {type(e).__name__}: {e}")
+                    entry["updated"] = None
+                    report["failed"] += 1
+            save_brief(brief)
+    return [report for _, report, _ in pending]
+
+
+def print_brief(brief: StandupBrief):
+    age_h = (time.time() - brief["built_at"]) / 3600
+    print(f"Standup brief for {brief['user']}, built {age_h:.1f} hours ago\n")
+    for ticket in brief["tickets"]:
+        entry = brief["briefs"][ticket["id"]]
+        print(f"{ticket['id']} [{ticket.get('status') or 'Not Set'}] {ticket.get('title') or ''}")
+        if entry["due_date_risk"]:
+            print(f"   Due date: {entry['due_date_risk'].replace('_', ' ')} ({ticket.get('due_date') or 'not set'})")
+        if entry["comment_digest"]:
+            print(f"   Comments: {entry['comment_digest']}")
+        for question in entry["suggested_questions"]:
+            print(f"   ? {question}")
+
+
+if __name__ == "__main__":
+    load_config()
+    parser = argparse.ArgumentParser(description="Build or show the precomputed standup briefs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build")
+    build_parser.add_argument("--users", default=os.getenv("SCRUM_BRIEF_USERS") or os.getenv("CURRENT_USER_EMAIL") or "",
+                              help="Comma-separated user emails (default: SCRUM_BRIEF_USERS, then CURRENT_USER_EMAIL)")
+    build_parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Processes running the LLM digests")
+    show_parser = commands.add_parser("show")
+    show_parser.add_argument("user")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        stored = load_brief(args.user, float("inf"))
+        if stored is None:
+            print(f"No brief for {args.user} in {brief_dir()}")
+        else:
+            print_brief(stored)
+    else:
+        start = time.perf_counter()
+        for built in build_briefs([u.strip() for u in args.users.split(",") if u.strip()], workers=args.workers):
+            print(f"{built['user']}: {built['tickets']} tickets, {built['reused']} unchanged, "
+                  f"{built['digested']} digested, {built['failed']} failed")
+        print(f"Built in {time.perf_counter() - start:.1f} s")
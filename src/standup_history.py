@@ -0,0 +1,85 @@
+"""
+Local index of the standup summaries the bot posted to Jira, keyed by ticket and date.
+
+Summaries are recorded when confirm_summary posts them with add_comment. The previous_progress_made
+stage reads the latest one with a single primary-key lookup, so it does not fetch the ticket's comments.
+
+    python3 src/standup_history.py show APP-1
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date
+from typing import List, Optional, TypedDict
+from config import load_config
+
+
+class StandupSummary(TypedDict):
+    ticket_id: str
+    date: str  # YYYY-MM-DD
+    summary: str
+    posted_at: float
+    session_id: Optional[str]
+
+
+class StandupHistory:
+    _instance = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            # WITHOUT ROWID stores rows in primary-key order: the latest summary of a ticket is one B-tree seek
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS standup_summaries (
+                    ticket_id TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    posted_at REAL NOT NULL,
+                    session_id TEXT,
+                    PRIMARY KEY (ticket_id, date)
+                ) WITHOUT ROWID
+            """)
+
+    @staticmethod
+    def get_instance():
+        if StandupHistory._instance is None:
+            load_config()
+            StandupHistory._instance = StandupHistory(os.getenv("SCRUM_HISTORY_DB", "standup_history.sqlite3"))
+        return StandupHistory._instance
+
+    def record(self, ticket_id: str, summary: str, day: Optional[str] = None, session_id: Optional[str] = None):
+        """
+        Store the summary posted for a ticket. A second summary on the same day replaces the first.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO standup_summaries (ticket_id, date, summary, posted_at, session_id) VALUES (?, ?, ?, ?, ?)",
+                (ticket_id, day or date.today().isoformat(), summary, time.time(), session_id),
+            )
+
+    def latest(self, ticket_id: str) -> Optional[StandupSummary]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM standup_summaries WHERE ticket_id = ? ORDER BY date DESC LIMIT 1", (ticket_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def history(self, ticket_id: str, limit: int = 10) -> List[StandupSummary]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM standup_summaries WHERE ticket_id = ? ORDER BY date DESC LIMIT ?", (ticket_id, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "show":
+        print("Usage: python3 src/standup_history.py show <ticket_id>")
+        sys.exit(1)
+    for entry in StandupHistory.get_instance().history(sys.argv[2]):
+        print(f"[{entry['date']}]\n{entry['summary']}\n")
@@ -0,0 +1,130 @@
+"""
+Pre-analysis of all the user's tickets at session start, before the interactive walk-through.
+
+Checks that need no input from the user run for every ticket at once: due date proximity, missing dates,
+"In Progress" tickets without recent activity and comments nobody has answered. Comment fetches run
+concurrently, so the pass costs about one Jira round trip. The briefings go into the ticket index and
+printed list of main_bot, and into the stage prompts of the chosen ticket.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date
+from typing import Dict, List, NotRequired, Optional, TypedDict
+import requests
+from jira_service import Comment, JiraService, Ticket
+from standup_history import StandupHistory
+from profiler import profiled
+
+DUE_SOON_DAYS = 2  # due_date_check asks about due dates at most this many days away
+STALE_AFTER_DAYS = 5
+RECENT_COMMENTS = 5
+MAX_WORKERS = 8
+BRIEFING_TIMEOUT_S = 3.0  # Tickets whose comments are not loaded by then are briefed from their fields only
+
+
+class TicketBriefing(TypedDict):
+    ticket_id: str
+    flags: List[str]  # overdue, due_soon, missing_due_date, missing_start_date, stale_in_progress, unanswered_comment
+    notes: List[str]  # One sentence per flag, for prompts and the printed list
+    suggested_questions: NotRequired[List[str]]  # From the nightly standup brief, when there is one
+
+
+def days_until_due(ticket: Ticket, today: Optional[date] = None) -> Optional[int]:
+    if not ticket.get("due_date"):
+        return None
+    return (date.fromisoformat(ticket["due_date"][:10]) - (today or date.today())).days
+
+
+def due_date_needs_discussion(ticket: Ticket, today: Optional[date] = None) -> bool:
+    """
+    Whether due_date_check has anything to ask: the due date is missing or at most DUE_SOON_DAYS away.
+    """
+    days = days_until_due(ticket, today)
+    return days is None or days <= DUE_SOON_DAYS
+
+
+def _is_own(comment: Comment, user_email: Optional[str], own_account_id: Optional[str]) -> bool:
+    author = comment["author"]
+    if own_account_id and author.get("accountId") == own_account_id:
+        return True
+    return bool(user_email) and (author.get("emailAddress") or "").lower() == user_email.lower()
+
+
+def brief_ticket(ticket: Ticket, comments: Optional[List[Comment]], user_email: Optional[str] = None,
+                 own_account_id: Optional[str] = None, today: Optional[date] = None) -> TicketBriefing:
+    """
+    Briefing from the ticket's fields and its most recent comments (newest first).
+    `comments` is None when they could not be loaded; comment-based checks are then skipped.
+    """
+    today = today or date.today()
+    flags, notes = [], []
+    days = days_until_due(ticket, today)
+    if days is None:
+        flags.append("missing_due_date")
+        notes.append("No due date set.")
+    elif days < 0:
+        flags.append("overdue")
+        notes.append(f"Overdue: was due {ticket['due_date']} ({-days} days ago).")
+    elif days <= DUE_SOON_DAYS:
+        flags.append("due_soon")
+        notes.append(f"Due {ticket['due_date']}, in {days} day(s).")
+
+    in_progress = ticket.get("status") == "In Progress"
+    if in_progress and not ticket.get("start_date"):
+        flags.append("missing_start_date")
+        notes.append("In Progress but no start date set.")
+
+    if comments is None:
+        return {"ticket_id": ticket["id"], "flags": flags, "notes": notes}
+
+    if in_progress:
+        last_standup = StandupHistory.get_instance().latest(ticket["id"])
+        activity = [c["created"][:10] for c in comments[:1]] + ([last_standup["date"]] if last_standup else [])
+        last_activity = max(activity) if activity else None
+        if last_activity is None or (today - date.fromisoformat(last_activity)).days >= STALE_AFTER_DAYS:
+            flags.append("stale_in_progress")
+            notes.append(f"In Progress with no comment or standup update since {last_activity}." if last_activity
+                         else "In Progress with no comments or standup updates yet.")
+
+    if comments and not _is_own(comments[0], user_email, own_account_id):
+        latest = comments[0]
+        snippet = " ".join(latest["body"].split())[:120]
+        flags.append("unanswered_comment")
+        notes.append(f"Unanswered comment from {latest['author'].get('displayName') or 'someone'} on {latest['created'][:10]}: \"{snippet}\"")
+
+    return {"ticket_id": ticket["id"], "flags": flags, "notes": notes}
+
+
+def brief_tickets(tickets: List[Ticket], user_email: Optional[str] = None,
+                  timeout_s: float = BRIEFING_TIMEOUT_S) -> Dict[str, TicketBriefing]:
+    """
+    Brief every ticket, fetching the recent comments of all tickets concurrently.
+    """
+    service = JiraService.get_instance()
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="briefing")
+    # The startup warm-up usually has the account already
+    own_account = executor.submit(service.validate_credentials) if service.account is None else None
+    comment_fetches = {t["id"]: executor.submit(service.fetch_ticket_comments, t["id"], RECENT_COMMENTS) for t in tickets}
+    with profiled("jira", "brief_tickets"):
+        wait([f for f in [own_account, *comment_fetches.values()] if f], timeout=timeout_s)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    own_account_id = (service.account or {}).get("accountId")
+    briefings = {}
+    for ticket in tickets:
+        fetch = comment_fetches[ticket["id"]]
+        comments = None
+        if fetch.done() and not fetch.cancelled():
+            try:
+                comments = fetch.result()
+            except requests.RequestException:  # Includes JiraUnavailableError
+                pass
+        briefings[ticket["id"]] = brief_ticket(ticket, comments, user_email, own_account_id)
+    return briefings
+
+
+def briefing_notes(briefings: Optional[Dict[str, TicketBriefing]], ticket_id: str) -> List[str]:
+    return ((briefings or {}).get(ticket_id) or {}).get("notes", [])
+
+
+def briefing_questions(briefings: Optional[Dict[str, TicketBriefing]], ticket_id: str) -> List[str]:
+    return ((briefings or {}).get(ticket_id) or {}).get("suggested_questions", [])
@@ -0,0 +1,62 @@
+"""
+Compact, token-efficient encodings of tickets for prompts.
+
+A ticket list becomes a header line plus one '|'-separated row per ticket, instead of
+json.dumps(..., indent=2) which repeats every key and indents every field:
+
+    id|status|priority|start_date|due_date|title
+    APP-1|In Progress|High||2025-10-31|Login flow
+
+Empty cells mean the field is not set; columns that are empty for every ticket are dropped.
+"""
+from typing import List, Optional, Sequence
+from jira_service import Ticket
+
+LIST_COLUMNS = ["id", "status", "priority", "start_date", "due_date", "title", "description"]
+TICKET_FIELDS = ["id", "title", "status", "priority", "start_date", "due_date", "description"]
+
+LIST_DESCRIPTION_CHARS = 160
+TICKET_DESCRIPTION_CHARS = 1500
+
+
+def cap(text: str, max_chars: Optional[int]) -> str:
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return text[: max_chars - 1].rstrip() + "…"
+
+
+def _cell(value, max_chars: Optional[int] = None) -> str:
+    if value is None:
+        return ""
+    text = " ".join(str(value).split())  # Collapse newlines and runs of whitespace
+    return cap(text, max_chars).replace("|", "/")
+
+
+def encode_tickets(tickets: Sequence[Ticket], columns: List[str] = LIST_COLUMNS, max_description_chars: Optional[int] = LIST_DESCRIPTION_CHARS) -> str:
+    """
+    Encode tickets as a header-plus-rows table.
+    """
+    columns = [c for c in columns if any(t.get(c) not in (None, "") for t in tickets)]
+    if not columns:
+        return "(no tickets)"
+    rows = ["|".join(columns)]
+    for ticket in tickets:
+        rows.append("|".join(
+            _cell(ticket.get(c), max_description_chars if c == "description" else None) for c in columns
+        ))
+    return "\n".join(rows)
+
+
+def encode_ticket(ticket: Ticket, max_description_chars: Optional[int] = TICKET_DESCRIPTION_CHARS) -> str:
+    """
+    Encode a single ticket as "field: value" lines, omitting unset fields.
+    Fields beyond TICKET_FIELDS (e.g. stale_as_of) are appended at the end; comments and the updated timestamp are left out.
+    """
+    fields = TICKET_FIELDS + [k for k in ticket if k not in TICKET_FIELDS and k not in ("comments", "updated")]
+    lines = []
+    for field in fields:
+        value = ticket.get(field)
+        if value in (None, ""):
+            continue
+        lines.append(f"{field}: {_cell(value, max_description_chars if field == 'description' else None)}")
+    return "\n".join(lines)
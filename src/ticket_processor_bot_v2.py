@@ -1,8 +1,10 @@
 import json
+import re
+import time
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
-from models import ticket_processor_initial_stages, ScrumAgentTicketProcessorState, TicketProcessorPhase, MainBotPhase
-from prompts import ticket_processor_base_prompt, ticket_processor_stage_prompt
-from helpers import deserialize_system_command, is_json, print_ai_response
+from models import ScrumAgentTicketProcessorState, TicketProcessorPhase, MainBotPhase
+from prompts import conversation_transcript, ticket_processor_base_prompt, ticket_processor_stage_prompt
+from helpers import ask_user, deserialize_system_command, is_json, print_ai_response
 from tools import (
     current_date,
     parse_to_iso_date,
@@ -10,71 +12,110 @@ from tools import (
     add_comment,
     update_status,
     update_ticket_dates,
+    TOOLS_BY_NAME,
 )
-from jira_service import JiraService  # Import here to avoid circular imports
-
-
-def handle_json_response(state: ScrumAgentTicketProcessorState, response_content: str):
+from jira_service import JiraService, JiraUnavailableError  # Import here to avoid circular imports
+from intent_classifier import classify_intent, EXIT, END, CONTINUE
+import rolling_summary
+from outcome_log import OutcomeLog, outcome_from_state
+from message_store import spill_ticket_transcript
+from standup_history import StandupHistory
+from tracing import current_session
+from profiler import profiled
+from llm_client import LLMDeadlineExceeded
+from ticket_briefing import due_date_needs_discussion
+
+# Stages where a plain "no" / "nothing else" finishes the stage: next stage id and the reply shown to the user
+FAST_PATH_EXIT_STAGES = {
+    "basic_info": ("previous_progress_made", "Alright, let's move on with the scrum meeting."),
+    "additional_help": ("ticket_processing_end_node", None),
+}
+# The stages' own "any (other) questions?". Yes/no replies to anything else the bot asked (e.g. "shall I add this comment?")
+# go to the LLM, which knows what was asked.
+OPEN_QUESTION = re.compile(r"\b(any(thing)?|other|more|else|further)\b[^?]*\b(questions?|help|information|info|details|else)\b[^?]*\?", re.IGNORECASE)
+
+
+def stage_update(stage_id: str, messages=(), **fields) -> dict:
+    """
+    State update for one stage: the messages it added plus any changed fields (phase, next_stage_id, ...).
+    """
+    return {"ticket_processing_stages": {stage_id: {**fields, "messages": list(messages)}}}
+
+
+def handle_json_response(state: ScrumAgentTicketProcessorState, response_content: str, new_messages=()):
     current_stage_id = state["ticket_processing_current_stage"]
-    current_stage = state["ticket_processing_stages"][current_stage_id]
     systemCommand = deserialize_system_command(response_content)
     if "reply" in systemCommand:
         print_ai_response(systemCommand["reply"])
 
     if systemCommand["command"] == "proceed_to_next_stage":
-        current_stage["phase"] = TicketProcessorPhase.PROCEED_TO_NEXT_STAGE
+        fields = {"phase": TicketProcessorPhase.PROCEED_TO_NEXT_STAGE}
         if "args" in systemCommand and "next_stage_id" in systemCommand["args"]:
-            current_stage["next_stage_id"] = systemCommand["args"].get("next_stage_id", "basic_info")
-        return state
+            fields["next_stage_id"] = systemCommand["args"].get("next_stage_id", "basic_info")
+        rolling_summary.stage_completed(state, current_stage_id, new_messages)
+        return stage_update(current_stage_id, new_messages, completed_at=time.time(), **fields)
     
     if systemCommand["command"] == "end_conversation":
-        current_stage["phase"] = TicketProcessorPhase.END_CONVERSATION
+        return stage_update(current_stage_id, new_messages, phase=TicketProcessorPhase.END_CONVERSATION, completed_at=time.time())
 
-        return state
+    return stage_update(current_stage_id, new_messages)
         
 def handler_not_started_phase(state: ScrumAgentTicketProcessorState, llm=None):
     current_stage_id = state["ticket_processing_current_stage"]
     current_stage = state["ticket_processing_stages"][current_stage_id]
-    update_ticket_info(state)
+    started_at = time.time()
+    ticket_update = update_ticket_info(state)
+    state = {**state, **ticket_update}
+
+    if current_stage["node"] == "due_date_check" and not due_date_needs_discussion(state["current_ticket"]):
+        # Nothing to ask: the prompt would only make the model reply with proceed_to_next_stage
+        command = json.dumps({"command": "proceed_to_next_stage", "args": {"next_stage_id": "summarize_conversation"}})
+        update = handle_json_response(state, command)
+        update["ticket_processing_stages"][current_stage_id]["started_at"] = started_at
+        return {**ticket_update, **update}
 
     ticket_processor_prompt = ticket_processor_base_prompt(state)
     current_stage_prompt = ticket_processor_stage_prompt(state, current_stage["node"])
-    current_stage["messages"].append(SystemMessage(content=ticket_processor_prompt + " \n " + current_stage_prompt))
-    response = llm.invoke(current_stage["messages"])
+    system_message = SystemMessage(content=ticket_processor_prompt + " \n " + current_stage_prompt)
+    response = llm.invoke([*current_stage["messages"], system_message])
     if is_json(response.content):
-        return handle_json_response(state, response.content)
+        update = handle_json_response(state, response.content, [system_message])
+        update["ticket_processing_stages"][current_stage_id]["started_at"] = started_at
+        return {**ticket_update, **update}
     
     print_ai_response(response.content)
-    current_stage["messages"].append(response)
-    current_stage["phase"] = TicketProcessorPhase.IN_PROGRESS
-    return state
+    return {
+        **ticket_update,
+        **stage_update(current_stage_id, [system_message, response], phase=TicketProcessorPhase.IN_PROGRESS, started_at=started_at),
+    }
 
-def invoke_llm_call(state: ScrumAgentTicketProcessorState, llm=None):
+def invoke_llm_call(state: ScrumAgentTicketProcessorState, llm=None, new_messages=()):
     current_stage_id = state["ticket_processing_current_stage"]
     current_stage = state["ticket_processing_stages"][current_stage_id]
 
-    response = llm.invoke(current_stage["messages"])
+    response = llm.invoke([*current_stage["messages"], *new_messages])
     print_ai_response(response.content)
-    current_stage["messages"].append(response)
+    new_messages = [*new_messages, response]
 
     if hasattr(response, "tool_calls") and response.tool_calls:
-        current_stage["phase"] = TicketProcessorPhase.TOOLS_CALL
-        return state
+        return stage_update(current_stage_id, new_messages, phase=TicketProcessorPhase.TOOLS_CALL)
     
     if is_json(response.content):
-        return handle_json_response(state, response.content)
+        return handle_json_response(state, response.content, new_messages)
 
-    return state
+    return stage_update(current_stage_id, new_messages)
 
 
 def execute_stage(state: ScrumAgentTicketProcessorState, llm=None):
+    """
+    Run one turn of the current stage and return only what changed.
+    """
     # breakpoint()  # For debugging purposes, remove in production
     current_stage_id = state["ticket_processing_current_stage"]
     current_stage = state["ticket_processing_stages"][current_stage_id]
 
     if current_stage["phase"] == TicketProcessorPhase.PROCEED_TO_NEXT_STAGE:
-        state["ticket_processing_current_stage"] = current_stage["next_stage_id"]
-        return state
+        return {"ticket_processing_current_stage": current_stage["next_stage_id"]}
 
     if current_stage["phase"] == TicketProcessorPhase.NOT_STARTED:
         return handler_not_started_phase(state, llm)
@@ -82,72 +123,129 @@ def execute_stage(state: ScrumAgentTicketProcessorState, llm=None):
     if is_last_message_tool_call(current_stage["messages"]):
         return invoke_llm_call(state, llm)
 
-    user_input = input(f"\n👤 User: ")
-    user_message = HumanMessage(content=user_input)
-    current_stage["messages"].append(user_message)
+    user_message = HumanMessage(content=ask_user())
 
-    return invoke_llm_call(state, llm)
+    fast_path_update = handle_intent_fast_path(state, user_message)
+    if fast_path_update is not None:
+        return fast_path_update
 
-def summarize_conversation_node(state: ScrumAgentTicketProcessorState, llm=None):
-    summary_prompt = ticket_processor_stage_prompt(state, "summarize_conversation")
-    # Use the LLM to generate the summary
-    response = llm.invoke([SystemMessage(content=summary_prompt)])
-    summary = response.content.strip()
+    return invoke_llm_call(state, llm, [user_message])
 
-    state["ticket_processing_current_stage"] = "summarize_conversation"
-    current_stage = state["ticket_processing_stages"]["summarize_conversation"]
-    current_stage["summary"] = summary
-    current_stage["phase"] = TicketProcessorPhase.PROCEED_TO_NEXT_STAGE
-    current_stage["next_stage_id"] = "confirm_summary"
+def handle_intent_fast_path(state: ScrumAgentTicketProcessorState, user_message: HumanMessage):
+    """
+    Handle confident exit/end/continue replies locally instead of with an LLM round-trip.
+    Only replies to the stage's open question are handled; returns None when the message has to go to the LLM.
+    """
+    current_stage_id = state["ticket_processing_current_stage"]
+    intent = classify_intent(user_message.content)
+    if intent is None or not asked_open_question(state["ticket_processing_stages"][current_stage_id]["messages"]):
+        return None
+
+    if intent == END:
+        command = {"command": "end_conversation"}
+    elif intent == EXIT and current_stage_id in FAST_PATH_EXIT_STAGES:
+        next_stage_id, reply = FAST_PATH_EXIT_STAGES[current_stage_id]
+        command = {"command": "proceed_to_next_stage", "args": {"next_stage_id": next_stage_id}}
+        if reply:
+            command["reply"] = reply
+    elif intent == CONTINUE and current_stage_id in FAST_PATH_EXIT_STAGES:
+        reply = "Sure, what would you like to know?"
+        print_ai_response(reply)
+        return stage_update(current_stage_id, [user_message, AIMessage(content=reply)])
+    else:
+        return None
+
+    response_content = json.dumps(command)
+    return handle_json_response(state, response_content, [user_message, AIMessage(content=response_content)])
+
+def asked_open_question(messages) -> bool:
+    """
+    Whether the bot's last question in the stage was its "any (other) questions?".
+    """
+    last_reply = next((m.content for m in reversed(messages) if isinstance(m, AIMessage) and isinstance(m.content, str) and m.content), "")
+    questions = re.findall(r"[^.?!\n]*\?", last_reply)
+    return bool(questions) and bool(OPEN_QUESTION.search(questions[-1]))
 
-    return state
+def summarize_conversation_node(state: ScrumAgentTicketProcessorState, llm=None):
+    started_at = time.time()
+    # The rolling summary is kept up to date while the stages run; only fall back to
+    # summarizing the whole conversation if it is missing or failed.
+    with profiled("llm", "rolling_summary_wait"):
+        summary = rolling_summary.current_summary(state)
+    if summary is None:
+        summary_prompt = ticket_processor_stage_prompt(state, "summarize_conversation")
+        try:
+            response = llm.invoke([SystemMessage(content=summary_prompt)])
+            summary = response.content.strip()
+        except LLMDeadlineExceeded:
+            # Better the plain conversation than no summary; confirm_summary still asks before posting it
+            summary = f"Standup conversation (not summarized, the summary took too long):\n{conversation_transcript(state)}"
+
+    return {
+        "ticket_processing_current_stage": "summarize_conversation",
+        **stage_update(
+            "summarize_conversation",
+            summary=summary,
+            phase=TicketProcessorPhase.PROCEED_TO_NEXT_STAGE,
+            next_stage_id="confirm_summary",
+            started_at=started_at,
+            completed_at=time.time(),
+        ),
+    }
 
 def ticket_processing_end_node(state: ScrumAgentTicketProcessorState):
     # breakpoint()
 
-    state["main_bot_phase"] = MainBotPhase.RESTARTED
-    state["main_bot_messages"] = []
-    state["ticket_processing_current_stage"] = "basic_info"
-    state["recently_processed_ticket_ids"].append(state["current_ticket"]["id"])
-    state["ticket_processing_stages"] = ticket_processor_initial_stages()
-
-    return state
+    # main_bot starts a fresh conversation on RESTARTED and drops the stages, which are spilled to disk here
+    rolling_summary.discard(state)
+    try:
+        OutcomeLog.get_instance().append(outcome_from_state(state, current_session()))
+    except OSError as e:
+        print(f"\n⚠️ Could not record the standup outcome: {e}")
+    try:
+        spill_ticket_transcript(current_session(), state["current_ticket"]["id"], state["ticket_processing_stages"])
+    except OSError as e:
+        print(f"\n⚠️ Could not save the ticket transcript: {e}")
+    return {
+        "main_bot_phase": MainBotPhase.RESTARTED,
+        "ticket_processing_current_stage": "basic_info",
+        "recently_processed_ticket_ids": [*state["recently_processed_ticket_ids"], state["current_ticket"]["id"]],
+    }
 
 def custom_tool_node(state):
     current_stage_id = state["ticket_processing_current_stage"]
     current_stage = state["ticket_processing_stages"][current_stage_id]
-    # Get messages for this stage
-    messages = current_stage["messages"]
+    tool_messages = []
     
     # Assume the last AI message contains a tool call in the expected format
-    last_message = messages[-1]
+    last_message = current_stage["messages"][-1]
     if hasattr(last_message, "tool_calls") and last_message.tool_calls:
         for tool_call in last_message.tool_calls:
             function_name = tool_call["name"]
             params = tool_call.get("args", {})
             print(f"\n 🔧 USING TOOLS: {function_name}")
-            tool_map = {
-                "current_date": current_date,
-                "parse_to_iso_date": parse_to_iso_date,
-                "fetch_comments": fetch_comments,
-                "add_comment": add_comment,
-                "update_status": update_status,
-                "update_ticket_dates": update_ticket_dates,
-            }
-            tool_func = tool_map.get(function_name)
+            tool_func = TOOLS_BY_NAME.get(function_name)
             if tool_func:
-                result = tool_func.invoke(params)
-                messages.append(ToolMessage(content=str(result), tool_call_id=tool_call.get("id", "")))
-    current_stage["phase"] = TicketProcessorPhase.IN_PROGRESS
-    current_stage["messages"] = messages
-    return state
+                try:
+                    with profiled("tool", function_name):
+                        result = tool_func.invoke(params)
+                except JiraUnavailableError as e:
+                    result = f"Jira is currently unavailable and no cached data exists for this request: {e}"
+                if current_stage_id == "confirm_summary" and function_name == "add_comment" and not str(result).startswith("Failed"):
+                    # Posted (or queued) standup summaries prefill previous_progress_made next time
+                    StandupHistory.get_instance().record(params.get("ticket_id", state["current_ticket"]["id"]), params.get("comment", ""), session_id=current_session())
+                tool_messages.append(ToolMessage(content=str(result), tool_call_id=tool_call.get("id", "")))
+    return stage_update(current_stage_id, tool_messages, phase=TicketProcessorPhase.IN_PROGRESS)
 
 def is_last_message_tool_call(messages) -> bool:
     return isinstance(messages[-1], ToolMessage)
 
-def update_ticket_info(state: ScrumAgentTicketProcessorState):
+def update_ticket_info(state: ScrumAgentTicketProcessorState) -> dict:
     jira = JiraService.get_instance()
     ticket_id = state["current_ticket"]["id"]
-    latest_ticket = jira.fetch_ticket_by_id(ticket_id)
-    state["current_ticket"] = latest_ticket
-    return state
\ No newline at end of file
+    try:
+        latest_ticket = jira.fetch_ticket_by_id(ticket_id)
+    except JiraUnavailableError:
+        # Keep the ticket as it was listed by main_bot
+        return {}
+    return {"current_ticket": latest_ticket}
\ No newline at end of file
@@ -0,0 +1,125 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional, TypedDict
+from jira_service import Ticket
+from ticket_encoding import encode_tickets
+from ticket_briefing import TicketBriefing, briefing_notes
+
+INDEX_COLUMNS = ["id", "status", "priority", "due_date", "attention", "title", "recently_discussed"]
+SNAPSHOT_COLUMNS = ["status", "priority", "due_date", "title"]  # The index columns taken from Jira
+
+
+class TicketDelta(TypedDict):
+    added: List[Ticket]
+    updated: List[Ticket]
+    removed: List[str]
+
+STATUS_ORDER = {"In Progress": 0, "To Do": 1}
+
+
+def sort_tickets(tickets: List[Ticket], recently_processed_ticket_ids: Iterable[str] = ()) -> List[Ticket]:
+    """
+    Order tickets as shown to the user: "In Progress", then "To Do", then any other status,
+    with recently processed tickets last. The order within each group is kept.
+    """
+    recent = set(recently_processed_ticket_ids or [])
+    return sorted(
+        tickets,
+        key=lambda t: (t["id"] in recent, STATUS_ORDER.get(t.get("status"), len(STATUS_ORDER))),
+    )
+
+
+def render_ticket(ticket: Ticket) -> str:
+    return (
+        f"Ticket ID: {ticket['id']}\n"
+        f"Summary: {ticket.get('title') or ''}\n"
+        f"Status: {ticket.get('status') or 'Not Set'}\n"
+        f"Priority: {ticket.get('priority') or 'Not Set'}\n"
+        f"Start Date: {ticket.get('start_date') or 'Not Set'}\n"
+        f"Due Date: {ticket.get('due_date') or 'Not Set'}"
+    )
+
+
+def render_ticket_list(tickets: List[Ticket], briefings: Optional[Dict[str, TicketBriefing]] = None) -> str:
+    if not tickets:
+        return "No open tickets."
+    rendered = []
+    for t in tickets:
+        notes = briefing_notes(briefings, t["id"])
+        rendered.append(render_ticket(t) + (f"\nAttention: {' '.join(notes)}" if notes else ""))
+    return "\n\n".join(rendered)
+
+
+def render_ticket_details(ticket: Ticket) -> str:
+    return render_ticket(ticket) + f"\nDescription: {ticket.get('description') or 'No description'}"
+
+
+def print_ticket_list(tickets: List[Ticket], briefings: Optional[Dict[str, TicketBriefing]] = None):
+    print(f"\n📋 Your tickets:\n\n{render_ticket_list(tickets, briefings)}")
+
+
+def index_rows(tickets: List[Ticket], recently_processed_ticket_ids: Iterable[str] = (),
+               briefings: Optional[Dict[str, TicketBriefing]] = None) -> List[dict]:
+    """
+    Tickets with the index's derived columns: the pre-analysis flags and the recently discussed marker.
+    """
+    recent = set(recently_processed_ticket_ids or [])
+    return [
+        {
+            **t,
+            "attention": ",".join(((briefings or {}).get(t["id"]) or {}).get("flags", [])) or None,
+            "recently_discussed": "yes" if t["id"] in recent else None,
+        }
+        for t in tickets
+    ]
+
+
+def ticket_index(tickets: List[Ticket], recently_processed_ticket_ids: Iterable[str] = (),
+                 briefings: Optional[Dict[str, TicketBriefing]] = None) -> str:
+    """
+    Compact table for the LLM: enough to resolve which ticket the user means.
+    The attention column lists the pre-analysis flags of each ticket.
+    """
+    return encode_tickets(index_rows(tickets, recently_processed_ticket_ids, briefings), INDEX_COLUMNS)
+
+
+def ticket_snapshot(tickets: List[Ticket]) -> Dict[str, str]:
+    """
+    Ticket id -> short hash of the ticket's index row, to tell later which tickets changed.
+    """
+    return {
+        t["id"]: hashlib.sha1("\x1f".join(str(t.get(c) or "") for c in SNAPSHOT_COLUMNS).encode()).hexdigest()[:12]
+        for t in tickets
+    }
+
+
+def ticket_delta(snapshot: Dict[str, str], tickets: List[Ticket]) -> TicketDelta:
+    current = ticket_snapshot(tickets)
+    return {
+        "added": [t for t in tickets if t["id"] not in snapshot],
+        "updated": [t for t in tickets if t["id"] in snapshot and snapshot[t["id"]] != current[t["id"]]],
+        "removed": [ticket_id for ticket_id in snapshot if ticket_id not in current],
+    }
+
+
+def delta_size(delta: TicketDelta) -> int:
+    return len(delta["added"]) + len(delta["updated"]) + len(delta["removed"])
+
+
+def encode_ticket_delta(delta: TicketDelta, recently_processed_ticket_ids: Iterable[str] = (),
+                        briefings: Optional[Dict[str, TicketBriefing]] = None) -> str:
+    """
+    Changes since the ticket index was sent, in the index's table format.
+    Rows are built like the index's, so they keep their attention flags and recently discussed marker.
+    """
+    if not delta_size(delta):
+        return "No changes."
+    parts = []
+    if delta["added"]:
+        rows = index_rows(delta["added"], recently_processed_ticket_ids, briefings)
+        parts.append(f"New tickets:\n{encode_tickets(rows, INDEX_COLUMNS)}")
+    if delta["updated"]:
+        rows = index_rows(delta["updated"], recently_processed_ticket_ids, briefings)
+        parts.append(f"Updated tickets (current values):\n{encode_tickets(rows, INDEX_COLUMNS)}")
+    if delta["removed"]:
+        parts.append(f"No longer open: {', '.join(delta['removed'])}")
+    return "\n".join(parts)
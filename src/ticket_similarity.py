@@ -0,0 +1,165 @@
+"""
+Related and duplicate ticket finder: MinHash signatures with LSH banding over title + description.
+
+Signatures use one-permutation hashing: each shingle is hashed once (CRC32) into one of NUM_HASHES bins, and
+each bin keeps its minimum; empty bins are filled from the next non-empty one. Building an index is linear in
+the text, and a query only scores the tickets that share at least one band with it, so lookups stay in
+the milliseconds for tens of thousands of tickets.
+"""
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from comment_index import tokenize
+from jira_service import JiraService, Ticket
+
+NUM_HASHES = 64
+BANDS = 21
+ROWS = 3  # Pairs above roughly (1/BANDS) ** (1/ROWS) ~ 0.36 Jaccard become candidates
+BIN_BITS = 6  # log2(NUM_HASHES)
+EMPTY = 1 << 32
+
+
+def shingles(text: str) -> Set[str]:
+    """
+    Words and word pairs, stopwords removed.
+    """
+    words = tokenize(text)
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def signature(shingle_set: Set[str]) -> Optional[Tuple[int, ...]]:
+    if not shingle_set:
+        return None
+    bins = [EMPTY] * NUM_HASHES
+    for shingle in shingle_set:
+        h = zlib.crc32(shingle.encode())
+        position, value = h & (NUM_HASHES - 1), h >> BIN_BITS
+        if value < bins[position]:
+            bins[position] = value
+    # Densify: an empty bin borrows the value of the next non-empty bin, offset by the distance to it
+    for position in range(NUM_HASHES):
+        if bins[position] == EMPTY:
+            distance = 1
+            while bins[(position + distance) % NUM_HASHES] >= EMPTY:
+                distance += 1
+            bins[position] = bins[(position + distance) % NUM_HASHES] + distance * EMPTY
+    return tuple(bins)
+
+
+def estimated_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def ticket_text(ticket: Ticket) -> str:
+    return f"{ticket.get('title') or ''} {ticket.get('description') or ''}"
+
+
+class TicketSimilarityIndex:
+    def __init__(self):
+        self.tickets: Dict[str, Ticket] = {}
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self._texts: Dict[str, str] = {}
+        self._bands: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, sig: Tuple[int, ...]):
+        return [sig[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+
+    def add(self, ticket: Ticket):
+        text = ticket_text(ticket)
+        ticket_id = ticket["id"]
+        if self._texts.get(ticket_id) == text:
+            self.tickets[ticket_id] = ticket
+            return
+        self.remove(ticket_id)
+        sig = signature(shingles(text))
+        self.tickets[ticket_id] = ticket
+        self._texts[ticket_id] = text
+        if sig is None:
+            return
+        self.signatures[ticket_id] = sig
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            band.setdefault(key, set()).add(ticket_id)
+
+    def remove(self, ticket_id: str):
+        sig = self.signatures.pop(ticket_id, None)
+        self.tickets.pop(ticket_id, None)
+        self._texts.pop(ticket_id, None)
+        if sig is None:
+            return
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            bucket = band.get(key)
+            if bucket is not None:
+                bucket.discard(ticket_id)
+                if not bucket:
+                    del band[key]
+
+    def sync(self, tickets: List[Ticket]):
+        """
+        Make the index match `tickets`; only new, changed and removed tickets are re-hashed.
+        """
+        current = {t["id"] for t in tickets}
+        for ticket_id in [i for i in self.tickets if i not in current]:
+            self.remove(ticket_id)
+        for ticket in tickets:
+            self.add(ticket)
+
+    def similar(self, text: Optional[str] = None, ticket_id: Optional[str] = None, top_k: int = 5,
+                min_similarity: float = 0.15) -> List[Tuple[float, Ticket]]:
+        """
+        Tickets most similar to an indexed ticket and/or free text (e.g. a blocker description), best first.
+        """
+        query = ""
+        if ticket_id and ticket_id in self.tickets:
+            query = ticket_text(self.tickets[ticket_id])
+        if text:
+            query = f"{query} {text}"
+        sig = signature(shingles(query))
+        if sig is None:
+            return []
+        candidates: Set[str] = set()
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            candidates |= band.get(key, set())
+        candidates.discard(ticket_id)
+        scored = [(estimated_similarity(sig, self.signatures[c]), c) for c in candidates]
+        scored = [(score, c) for score, c in scored if score >= min_similarity]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(score, self.tickets[c]) for score, c in scored[:top_k]]
+
+
+_indexes: Dict[str, Tuple[int, TicketSimilarityIndex]] = {}  # Project key -> (version of its cached search, index)
+_lock = threading.Lock()
+_fetch_locks: Dict[str, threading.Lock] = {}
+
+
+def project_index(project_key: str, service: Optional[JiraService] = None) -> TicketSimilarityIndex:
+    """
+    Similarity index over a project's tickets, built from the cached search of the project's backlog.
+    The backlog is fetched once if it is not cached; after that the index is only re-synced when that
+    search result changes (e.g. after a webhook update), not on unrelated cache writes.
+    """
+    service = service or JiraService.get_instance()
+    search_key = ("search", service.project_tickets_jql(project_key))
+    with _lock:
+        version, index = _indexes.get(project_key, (None, None))
+        if index is not None and version == service.cache.key_version(search_key):
+            return index
+        fetch_lock = _fetch_locks.setdefault(project_key, threading.Lock())
+    # The cold fetch can take hundreds of requests: callers for the same project wait for one fetch,
+    # other projects' lookups do not wait at all
+    with fetch_lock:
+        if search_key not in service.cache:
+            service.fetch_project_tickets(project_key)
+    cached = service.cache.get(search_key)
+    with _lock:
+        version, index = _indexes.get(project_key, (None, None))
+        if index is None:
+            index = TicketSimilarityIndex()
+            _indexes[project_key] = (-1, index)  # Matches no cache version, so the next call fetches again
+        # Another caller may have synced a newer result meanwhile
+        if cached is not None and (version is None or cached["version"] > version):
+            index.sync(cached["value"])
+            _indexes[project_key] = (cached["version"], index)
+        return index
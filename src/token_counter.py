@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+# Characters per token for English/JSON text when no tokenizer is available
+FALLBACK_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # The encoding file could not be downloaded (offline)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4.1-mini") -> int:
+    """
+    Count prompt tokens with tiktoken when available, otherwise estimate from the text length.
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return -(-len(text) // FALLBACK_CHARS_PER_TOKEN)
+
+
+def is_exact() -> bool:
+    return _encoding("gpt-4.1-mini") is not None
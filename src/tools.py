@@ -1,6 +1,8 @@
 from langchain_core.tools import tool
 from dateutil import parser
-from jira_service import JiraService
+from jira_service import JiraService, JiraUnavailableError, is_queued
+from comment_index import index_comments, format_comment
+from ticket_similarity import project_index
 from datetime import date
 
 
@@ -24,15 +26,46 @@ def parse_to_iso_date(date_str: str) -> str:
         return f"Invalid date format: {e}"
 
 
+# Upper bound on comments pulled for a search when no date range is given
+SEARCH_COMMENT_LIMIT = 500
+
 @tool
-def fetch_comments(ticket_id: str) -> list:
+def fetch_comments(ticket_id: str, limit: int = 20) -> list:
     """
-    Fetch comments for a specific Jira ticket.
+    Fetch the most recent comments for a specific Jira ticket, newest first (20 by default).
     """
     service = JiraService.get_instance()
-    comments = service.fetch_ticket_comments(ticket_id)
+    comments = service.fetch_ticket_comments(ticket_id, limit=limit)
+    index_comments(ticket_id, comments)
     return comments
 
+@tool
+def search_comments(ticket_id: str, query: str = "", since: str = None, until: str = None, top_k: int = 5) -> str:
+    """
+    Search the comments of a Jira ticket and return only the most relevant ones (or the most recent ones if query is empty).
+    Prefer this over fetch_comments for tickets with many comments or for specific questions.
+    since/until are optional ISO dates (YYYY-MM-DD) limiting the comment creation date, e.g. for "what did we decide last week".
+    """
+    service = JiraService.get_instance()
+    comments = service.fetch_ticket_comments(ticket_id, limit=SEARCH_COMMENT_LIMIT, since=since)
+    index = index_comments(ticket_id, comments)
+    results = index.search(query, top_k=top_k, since=since, until=until)
+    if not results:
+        return "No matching comments found."
+    return "\n".join(format_comment(c) for c in results)
+
+@tool
+def find_similar_tickets(ticket_id: str, text: str = "", top_k: int = 5) -> str:
+    """
+    Find tickets in the same project that are related to or duplicates of a ticket.
+    Pass a blocker or problem description as text to match on it as well as on the ticket itself.
+    """
+    project_key = ticket_id.split("-")[0]
+    results = project_index(project_key).similar(text=text, ticket_id=ticket_id, top_k=top_k)
+    if not results:
+        return "No similar tickets found."
+    return "\n".join(f"{t['id']} [{t.get('status') or 'Unknown'}] {t.get('title') or ''} (similarity {score:.2f})" for score, t in results)
+
 @tool
 def update_status(ticket_id: str, transition_id: str) -> str:
     """
@@ -40,6 +73,8 @@ def update_status(ticket_id: str, transition_id: str) -> str:
     """
     service = JiraService.get_instance()
     result = service.update_ticket_status(ticket_id, transition_id)
+    if is_queued(result):
+        return "Jira is currently unavailable. The status update has been queued and will be applied once Jira recovers."
     return "Status updated successfully." if result else "Failed to update status."
 
 @tool
@@ -48,7 +83,14 @@ def add_comment(ticket_id: str, comment: str) -> str:
     Add a comment to a Jira ticket.
     """
     service = JiraService.get_instance()
-    result = service.add_comment(ticket_id, comment)
+    try:
+        result = service.add_comment(ticket_id, comment)
+    except JiraUnavailableError as e:
+        if not e.may_have_applied:
+            raise
+        return "Jira did not confirm the comment in time. It may have been added; check the ticket before adding it again."
+    if is_queued(result):
+        return "Jira is currently unavailable. The comment has been queued and will be added once Jira recovers."
     return "Comment added successfully." if result else "Failed to add comment."
 
 @tool
@@ -59,4 +101,10 @@ def update_ticket_dates(ticket_id: str, start_date: str = None, end_date: str =
     """
     service = JiraService.get_instance()
     result = service.update_ticket_dates(ticket_id, start_date, end_date)
+    if is_queued(result):
+        return "Jira is currently unavailable. The date update has been queued and will be applied once Jira recovers."
     return "Ticket dates updated successfully." if result else "Failed to update ticket dates."
+
+
+ALL_TOOLS = [current_date, parse_to_iso_date, fetch_comments, search_comments, find_similar_tickets, add_comment, update_status, update_ticket_dates]
+TOOLS_BY_NAME = {t.name: t for t in ALL_TOOLS}
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Callable, List, Optional, TypedDict, NotRequired
+from config import load_config
+
+_current_node: ContextVar[Optional[str]] = ContextVar("trace_current_node", default=None)
+_current_session: ContextVar[Optional[str]] = ContextVar("trace_current_session", default=None)
+
+
+class Span(TypedDict):
+    kind: str
+    session_id: Optional[str]
+    node: Optional[str]
+    operation: str
+    started_at: float
+    latency_ms: float
+    method: NotRequired[str]
+    endpoint: NotRequired[str]
+    issue_key: NotRequired[Optional[str]]
+    status_code: NotRequired[Optional[int]]
+    response_bytes: NotRequired[int]
+    attempts: NotRequired[int]
+    error: NotRequired[Optional[str]]
+    model: NotRequired[str]
+    escalated: NotRequired[bool]
+    input_tokens: NotRequired[int]
+    output_tokens: NotRequired[int]
+    cost_usd: NotRequired[float]
+    priority: NotRequired[str]
+    queue_depth: NotRequired[int]
+    cost: NotRequired[float]
+
+
+def set_session(session_id: str):
+    """
+    Set the session id that every span recorded from this context is tied to.
+    """
+    _current_session.set(session_id)
+
+
+def current_session() -> Optional[str]:
+    return _current_session.get()
+
+
+def current_node() -> Optional[str]:
+    return _current_node.get()
+
+
+def traced_node(node_name: str, node_func: Callable):
+    """
+    Wrap a graph node so that spans recorded while it runs are attributed to it, and profile it (see profiler).
+    """
+    from profiler import profiled  # The profiler imports this module
+
+    def wrapper(state):
+        token = _current_node.set(node_name)
+        try:
+            with profiled("node", node_name):
+                return node_func(state)
+        finally:
+            _current_node.reset(token)
+
+    wrapper.__name__ = node_name
+    return wrapper
+
+
+class Tracer:
+    _instance = None
+
+    def __init__(self, export_path: Optional[str] = None, max_spans: int = 10000):
+        self.export_path = export_path
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if Tracer._instance is None:
+            load_config()
+            Tracer._instance = Tracer(os.getenv("JIRA_TRACE_FILE") or None)
+        return Tracer._instance
+
+    def record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+            if self.export_path:
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(span) + "\n")
+
+    def start_span(self, kind: str, operation: str, **fields) -> Span:
+        return {
+            "kind": kind,
+            "session_id": current_session(),
+            "node": current_node(),
+            "operation": operation,
+            "started_at": time.time(),
+            "latency_ms": 0.0,
+            **fields,
+        }
+
+    def spans_for(self, kind: str = None, session_id: str = None) -> List[Span]:
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            s for s in spans
+            if (kind is None or s["kind"] == kind) and (session_id is None or s["session_id"] == session_id)
+        ]
+
+    def summary(self, kind: str = "jira", session_id: str = None) -> List[str]:
+        """
+        Summarize recorded spans per node, e.g. "basic_info made 3 Jira calls, 410 ms total".
+        """
+        calls = defaultdict(int)
+        total_ms = defaultdict(float)
+        for span in self.spans_for(kind, session_id):
+            node = span["node"] or "<no node>"
+            calls[node] += 1
+            total_ms[node] += span["latency_ms"]
+
+        label = "Jira" if kind == "jira" else kind
+        return [
+            f"{node} made {calls[node]} {label} call{'s' if calls[node] != 1 else ''}, {total_ms[node]:.0f} ms total"
+            for node in sorted(calls, key=lambda n: total_ms[n], reverse=True)
+        ]
+
+    def print_summary(self, kind: str = "jira", session_id: str = None):
+        lines = self.summary(kind, session_id)
+        if not lines:
+            return
+        print("\n📊 Trace summary:")
+        for line in lines:
+            print(f"   {line}")
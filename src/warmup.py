@@ -0,0 +1,68 @@
+"""
+Startup warm-up: connects to Jira and the LLM endpoint concurrently while the bot's modules load and the graphs
+compile, so the first greeting does not pay DNS, TLS and auth setup one call after the other.
+
+The user's ticket search starts right away as a prefetch; main_bot's fetch_user_tickets picks up its result.
+Failures are only reported: the calls that need a connection later retry and surface errors as usual.
+Set SCRUM_WARMUP=off to skip it.
+"""
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypedDict
+from config import load_config
+from jira_service import JiraService
+
+
+class WarmupResult(TypedDict):
+    task: str
+    duration_ms: float
+    error: Optional[str]
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("SCRUM_WARMUP", "on").lower() != "off"
+
+
+class Warmup:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.futures: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="warmup")
+
+    def start(self, name: str, task: Callable[[], object]):
+        self.futures[name] = self._executor.submit(self._run, name, task)
+
+    def _run(self, name: str, task: Callable[[], object]) -> WarmupResult:
+        error = None
+        try:
+            task()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"\n⚠️ Startup check {name} failed: {error}")
+        return {"task": name, "duration_ms": (time.perf_counter() - self.started_at) * 1000, "error": error}
+
+    def results(self, timeout: Optional[float] = None) -> List[WarmupResult]:
+        return [future.result(timeout) for future in self.futures.values()]
+
+    def print_report(self):
+        print("\nStartup warm-up (ms after start):")
+        for result in self.results():
+            print(f"   {result['task']:<24}{result['duration_ms']:>8.0f}  {result['error'] or 'ok'}")
+
+
+def start_warmup(user_email: str, project_key: str, llm_stage: str = "main_bot") -> Optional[Warmup]:
+    load_config()
+    if not warmup_enabled():
+        return None
+    service = JiraService.get_instance()
+    warmup = Warmup()
+    if user_email:
+        ticket_search = service.prefetch_user_tickets(user_email, project_key)
+        warmup.start("jira_ticket_search", ticket_search.result)
+    warmup.start("jira_credentials", service.validate_credentials)
+    warmup.start("jira_field_schema", service.fields.field_ids)
+    # Imported once the Jira calls are under way: loading the OpenAI client takes a good part of a second
+    from llm_config import stage_llm
+    warmup.start("llm_connection", lambda: stage_llm(llm_stage).warm_up())
+    return warmup